@@ -1,4 +1,5 @@
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 from logging.config import dictConfig
 
@@ -11,11 +12,27 @@ from papermerge.core.version import __version__
 from papermerge.core.config import get_settings
 from papermerge.core.routers.version import router as version_router
 from papermerge.core.routers.scopes import router as scopes_router
+from papermerge.core.routers.metrics import router as metrics_router
+from papermerge.core.routers.common import ORJSONResponse
 from papermerge.core.openapi import create_custom_openapi_generator
+from papermerge.core.features.outbox.relay import embedded_relay
 
 config = get_settings()
 prefix = config.api_prefix
-app = FastAPI(title="Papermerge DMS REST API", version=__version__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with embedded_relay():
+        yield
+
+
+app = FastAPI(
+    title="Papermerge DMS REST API",
+    version=__version__,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -29,10 +46,27 @@ app.add_middleware(
         "Content-Length",
         "Accept-Ranges",
         "Last-Modified",
-        "ETag"
+        "ETag",
+        "Server-Timing",
     ]
 )
 
+if config.response_gzip_min_size:
+    from papermerge.core.compression import JSONGZipMiddleware
+
+    app.add_middleware(JSONGZipMiddleware, minimum_size=config.response_gzip_min_size)
+
+if config.metrics_enabled:
+    from papermerge.core.metrics import PrometheusMiddleware
+
+    app.add_middleware(PrometheusMiddleware)
+    app.include_router(metrics_router)
+
+if config.sql_instrumentation:
+    from papermerge.core.db.instrumentation import SQLInstrumentationMiddleware
+
+    app.add_middleware(SQLInstrumentationMiddleware)
+
 # Auto-discover and register all feature routers
 features_path = Path(__file__).parent / "core"
 routers = discover_routers(features_path)
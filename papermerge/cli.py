@@ -8,73 +8,49 @@ This module automatically discovers and registers CLI commands from:
 
 Commands are discovered Django-style: any module with an 'app' attribute
 containing a typer.Typer instance will be automatically registered.
+
+Command modules are imported lazily, only the module of the invoked
+command is imported (`pm --help` imports none of them).
 """
 import logging
 from pathlib import Path
 
-import typer
-
-from papermerge.core.cli_loader import (
-    discover_cli_apps,
-    discover_core_cli_apps,
-    discover_additional_cli_apps,
-)
+from papermerge.core.cli_loader import LazyCliGroup, LazyCliApp, find_cli_modules
 
 # Set up logging
 logging.basicConfig(level=logging.WARN)
 logger = logging.getLogger(__name__)
 
-# Create main CLI app
-app = typer.Typer(
-    help="Papermerge DMS command line management tool",
-    no_args_is_help=True,
-)
+HELP = "Papermerge DMS command line management tool"
+
+ADDITIONAL_CLI_PATHS = [
+    "papermerge.search.cli",  # Search-related commands
+]
 
 
-def register_cli_commands():
+def register_cli_commands() -> list[LazyCliApp]:
     """
-    Automatically discover and register all CLI commands.
+    Automatically discover all CLI commands (without importing them).
 
-    Discovery order:
+    Discovery order (later ones win on name clash):
     1. Core CLI commands (perms, scopes, token, etc.)
     2. Feature CLI commands (users, groups, etc.)
     3. Additional CLI commands (search, index, etc.)
     """
-    # Get the base paths
-    current_file = Path(__file__)
-    core_path = current_file.parent / "core"
-    core_cli_path = core_path / "cli"
-
-    registered_count = 0
-
-    # 1. Discover and register core CLI commands (non-feature commands)
-    logger.debug("Discovering core CLI commands...")
-    core_cli_apps = discover_core_cli_apps(core_cli_path)
-    for cli_app, name in core_cli_apps:
-        app.add_typer(cli_app, name=name)
-        logger.info(f"Registered core CLI command: {name}")
-        registered_count += 1
-
-    # 2. Discover and register feature CLI commands
-    logger.debug("Discovering feature CLI commands...")
-    feature_cli_apps = discover_cli_apps(core_path)
-    for cli_app, name in feature_cli_apps:
-        app.add_typer(cli_app, name=name)
-        logger.info(f"Registered feature CLI command: {name}")
-        registered_count += 1
-
-    # 3. Discover and register additional CLI commands from other packages
-    logger.debug("Discovering additional CLI commands...")
-    additional_paths = [
-        "papermerge.search.cli",  # Search-related commands
-    ]
-    additional_cli_apps = discover_additional_cli_apps(additional_paths)
-    for cli_app, name in additional_cli_apps:
-        app.add_typer(cli_app, name=name)
-        logger.info(f"Registered additional CLI command: {name}")
-        registered_count += 1
-
-    logger.info(f"Total CLI commands registered: {registered_count}")
+    core_path = Path(__file__).parent / "core"
+    lazy_apps = find_cli_modules(core_path, ADDITIONAL_CLI_PATHS)
+    logger.info(f"Total CLI commands registered: {len(lazy_apps)}")
+
+    return lazy_apps
+
+
+def get_cli() -> LazyCliGroup:
+    return LazyCliGroup(
+        name="pm",
+        help=HELP,
+        no_args_is_help=True,
+        lazy_apps=register_cli_commands(),
+    )
 
 
 def main():
@@ -87,8 +63,7 @@ def main():
         logger.error(e)
         sys.exit(1)
 
-    register_cli_commands()
-    app()
+    get_cli()()
 
 
 if __name__ == "__main__":
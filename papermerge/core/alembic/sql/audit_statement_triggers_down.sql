@@ -0,0 +1,33 @@
+-- Drops statement level audit triggers; row level triggers are restored
+-- by running audit_trigger_upgrade.sql afterwards
+
+DROP TRIGGER IF EXISTS audit_nodes_insert_trigger ON nodes;
+DROP TRIGGER IF EXISTS audit_nodes_update_trigger ON nodes;
+DROP TRIGGER IF EXISTS audit_nodes_delete_trigger ON nodes;
+DROP TRIGGER IF EXISTS audit_document_versions_insert_trigger ON document_versions;
+DROP TRIGGER IF EXISTS audit_document_versions_update_trigger ON document_versions;
+DROP TRIGGER IF EXISTS audit_document_versions_delete_trigger ON document_versions;
+DROP TRIGGER IF EXISTS audit_custom_fields_insert_trigger ON custom_fields;
+DROP TRIGGER IF EXISTS audit_custom_fields_update_trigger ON custom_fields;
+DROP TRIGGER IF EXISTS audit_custom_fields_delete_trigger ON custom_fields;
+DROP TRIGGER IF EXISTS audit_categories_insert_trigger ON document_types;
+DROP TRIGGER IF EXISTS audit_categories_update_trigger ON document_types;
+DROP TRIGGER IF EXISTS audit_categories_delete_trigger ON document_types;
+DROP TRIGGER IF EXISTS audit_shared_nodes_insert_trigger ON shared_nodes;
+DROP TRIGGER IF EXISTS audit_shared_nodes_update_trigger ON shared_nodes;
+DROP TRIGGER IF EXISTS audit_shared_nodes_delete_trigger ON shared_nodes;
+DROP TRIGGER IF EXISTS audit_tags_insert_trigger ON tags;
+DROP TRIGGER IF EXISTS audit_tags_update_trigger ON tags;
+DROP TRIGGER IF EXISTS audit_tags_delete_trigger ON tags;
+DROP TRIGGER IF EXISTS audit_roles_insert_trigger ON roles;
+DROP TRIGGER IF EXISTS audit_roles_update_trigger ON roles;
+DROP TRIGGER IF EXISTS audit_roles_delete_trigger ON roles;
+DROP TRIGGER IF EXISTS audit_users_insert_trigger ON users;
+DROP TRIGGER IF EXISTS audit_users_update_trigger ON users;
+DROP TRIGGER IF EXISTS audit_users_delete_trigger ON users;
+DROP TRIGGER IF EXISTS audit_groups_insert_trigger ON groups;
+DROP TRIGGER IF EXISTS audit_groups_update_trigger ON groups;
+DROP TRIGGER IF EXISTS audit_groups_delete_trigger ON groups;
+
+DROP FUNCTION IF EXISTS audit_statement_trigger_function() CASCADE;
+DROP FUNCTION IF EXISTS audit_filter_columns(jsonb, text[], text[], text[]);
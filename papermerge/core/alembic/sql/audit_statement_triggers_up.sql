@@ -0,0 +1,273 @@
+-- Statement level audit triggers
+--
+-- Replaces row level `audit_trigger_function` triggers: one trigger
+-- invocation per statement writes audit rows for all affected rows with
+-- one INSERT ... SELECT from the transition tables (`old_rows`/`new_rows`).
+--
+-- Columns stored in `old_values`/`new_values` are configured per table
+-- with trigger arguments (PostgreSQL array literals):
+--   TG_ARGV[0] - columns stored as md5 hash (large text columns: a change
+--                is still visible in `changed_fields`)
+--   TG_ARGV[1] - columns left out
+--   TG_ARGV[2] - only these columns are stored (empty = all columns)
+-- UPDATEs which do not change any stored column are not audited.
+
+DROP TRIGGER IF EXISTS audit_nodes_trigger ON nodes;
+DROP TRIGGER IF EXISTS audit_document_versions_trigger ON document_versions;
+DROP TRIGGER IF EXISTS audit_custom_fields_trigger ON custom_fields;
+DROP TRIGGER IF EXISTS audit_categories_trigger ON document_types;
+DROP TRIGGER IF EXISTS audit_shared_nodes_trigger ON shared_nodes;
+DROP TRIGGER IF EXISTS audit_tags_trigger ON tags;
+DROP TRIGGER IF EXISTS audit_roles_trigger ON roles;
+DROP TRIGGER IF EXISTS audit_users_trigger ON users;
+DROP TRIGGER IF EXISTS audit_groups_trigger ON groups;
+
+DROP FUNCTION IF EXISTS audit_trigger_function() CASCADE;
+
+
+CREATE OR REPLACE FUNCTION audit_filter_columns(
+    data jsonb,
+    hash_columns text[],
+    exclude_columns text[],
+    include_columns text[]
+)
+RETURNS jsonb AS $$
+BEGIN
+    IF data IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    data = data - exclude_columns;
+
+    IF cardinality(hash_columns) = 0 AND cardinality(include_columns) = 0 THEN
+        RETURN data;
+    END IF;
+
+    RETURN COALESCE(
+        (
+            SELECT jsonb_object_agg(
+                key,
+                CASE
+                    WHEN key = ANY(hash_columns) AND jsonb_typeof(value) <> 'null'
+                    THEN to_jsonb('md5:' || md5(value #>> '{}'))
+                    ELSE value
+                END
+            )
+            FROM jsonb_each(data)
+            WHERE cardinality(include_columns) = 0 OR key = ANY(include_columns)
+        ),
+        '{}'::jsonb
+    );
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+
+CREATE OR REPLACE FUNCTION audit_statement_trigger_function()
+RETURNS TRIGGER AS $$
+DECLARE
+    hash_columns text[] = COALESCE(NULLIF(TG_ARGV[0], '')::text[], '{}');
+    exclude_columns text[] = COALESCE(NULLIF(TG_ARGV[1], '')::text[], '{}');
+    include_columns text[] = COALESCE(NULLIF(TG_ARGV[2], '')::text[], '{}');
+    v_user_id uuid;
+    v_username text = nullif(current_setting('app.username', true), '');
+    v_session_id text = nullif(current_setting('app.session_id', true), '');
+    v_reason text = nullif(current_setting('app.reason', true), '');
+BEGIN
+    -- Application context is read once per statement
+    BEGIN
+        v_user_id = nullif(current_setting('app.user_id', true), '')::uuid;
+    EXCEPTION WHEN OTHERS THEN
+        v_user_id = NULL;
+    END;
+
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO audit_log (
+            id, table_name, record_id, operation, timestamp,
+            user_id, username, session_id, reason,
+            old_values, new_values, changed_fields
+        )
+        SELECT
+            gen_random_uuid(), TG_TABLE_NAME, n.id, TG_OP, now(),
+            v_user_id, v_username, v_session_id, v_reason,
+            NULL,
+            audit_filter_columns(
+                to_jsonb(n), hash_columns, exclude_columns, include_columns
+            ),
+            NULL
+        FROM new_rows n;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO audit_log (
+            id, table_name, record_id, operation, timestamp,
+            user_id, username, session_id, reason,
+            old_values, new_values, changed_fields
+        )
+        SELECT
+            gen_random_uuid(), TG_TABLE_NAME, o.id, TG_OP, now(),
+            v_user_id, v_username, v_session_id, v_reason,
+            audit_filter_columns(
+                to_jsonb(o), hash_columns, exclude_columns, include_columns
+            ),
+            NULL,
+            NULL
+        FROM old_rows o;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO audit_log (
+            id, table_name, record_id, operation, timestamp,
+            user_id, username, session_id, reason,
+            old_values, new_values, changed_fields
+        )
+        SELECT
+            gen_random_uuid(), TG_TABLE_NAME, n.id, TG_OP, now(),
+            v_user_id, v_username, v_session_id, v_reason,
+            o.data, n.data, diff.changed_fields
+        FROM (
+            SELECT id, audit_filter_columns(
+                to_jsonb(o), hash_columns, exclude_columns, include_columns
+            ) AS data
+            FROM old_rows o
+        ) o
+        JOIN (
+            SELECT id, audit_filter_columns(
+                to_jsonb(n), hash_columns, exclude_columns, include_columns
+            ) AS data
+            FROM new_rows n
+        ) n USING (id)
+        CROSS JOIN LATERAL (
+            SELECT jsonb_agg(ov.key) AS changed_fields
+            FROM jsonb_each(o.data) ov
+            JOIN jsonb_each(n.data) nv USING (key)
+            WHERE ov.value IS DISTINCT FROM nv.value
+        ) diff
+        WHERE diff.changed_fields IS NOT NULL;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- nodes
+CREATE TRIGGER audit_nodes_insert_trigger
+    AFTER INSERT ON nodes
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+CREATE TRIGGER audit_nodes_update_trigger
+    AFTER UPDATE ON nodes
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+CREATE TRIGGER audit_nodes_delete_trigger
+    AFTER DELETE ON nodes
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+
+-- document_versions: OCR text of the whole document is stored as hash
+CREATE TRIGGER audit_document_versions_insert_trigger
+    AFTER INSERT ON document_versions
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function('{text}');
+CREATE TRIGGER audit_document_versions_update_trigger
+    AFTER UPDATE ON document_versions
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function('{text}');
+CREATE TRIGGER audit_document_versions_delete_trigger
+    AFTER DELETE ON document_versions
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function('{text}');
+
+-- custom_fields
+CREATE TRIGGER audit_custom_fields_insert_trigger
+    AFTER INSERT ON custom_fields
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+CREATE TRIGGER audit_custom_fields_update_trigger
+    AFTER UPDATE ON custom_fields
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+CREATE TRIGGER audit_custom_fields_delete_trigger
+    AFTER DELETE ON custom_fields
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+
+-- document_types/categories
+CREATE TRIGGER audit_categories_insert_trigger
+    AFTER INSERT ON document_types
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+CREATE TRIGGER audit_categories_update_trigger
+    AFTER UPDATE ON document_types
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+CREATE TRIGGER audit_categories_delete_trigger
+    AFTER DELETE ON document_types
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+
+-- shared_nodes
+CREATE TRIGGER audit_shared_nodes_insert_trigger
+    AFTER INSERT ON shared_nodes
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+CREATE TRIGGER audit_shared_nodes_update_trigger
+    AFTER UPDATE ON shared_nodes
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+CREATE TRIGGER audit_shared_nodes_delete_trigger
+    AFTER DELETE ON shared_nodes
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+
+-- tags
+CREATE TRIGGER audit_tags_insert_trigger
+    AFTER INSERT ON tags
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+CREATE TRIGGER audit_tags_update_trigger
+    AFTER UPDATE ON tags
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+CREATE TRIGGER audit_tags_delete_trigger
+    AFTER DELETE ON tags
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+
+-- roles
+CREATE TRIGGER audit_roles_insert_trigger
+    AFTER INSERT ON roles
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+CREATE TRIGGER audit_roles_update_trigger
+    AFTER UPDATE ON roles
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+CREATE TRIGGER audit_roles_delete_trigger
+    AFTER DELETE ON roles
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+
+-- users
+CREATE TRIGGER audit_users_insert_trigger
+    AFTER INSERT ON users
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+CREATE TRIGGER audit_users_update_trigger
+    AFTER UPDATE ON users
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+CREATE TRIGGER audit_users_delete_trigger
+    AFTER DELETE ON users
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+
+-- groups
+CREATE TRIGGER audit_groups_insert_trigger
+    AFTER INSERT ON groups
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+CREATE TRIGGER audit_groups_update_trigger
+    AFTER UPDATE ON groups
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
+CREATE TRIGGER audit_groups_delete_trigger
+    AFTER DELETE ON groups
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_statement_trigger_function();
@@ -0,0 +1,2 @@
+DROP TRIGGER IF EXISTS trg_documents_status_notify ON documents;
+DROP FUNCTION IF EXISTS notify_document_status();
@@ -0,0 +1,31 @@
+-- Publish document status transitions on the `document_status` channel
+-- (LISTEN/NOTIFY). Web processes stream them to subscribed clients
+-- (server-sent events) instead of clients polling document status.
+-- Notifications are delivered only when the transaction commits.
+
+CREATE OR REPLACE FUNCTION notify_document_status()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify(
+        'document_status',
+        json_build_object(
+            'id', NEW.node_id,
+            'processing_status', NEW.processing_status,
+            'preview_status', NEW.preview_status,
+            'ocr_status', NEW.ocr_status
+        )::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_documents_status_notify
+    AFTER UPDATE OF processing_status, preview_status, ocr_status
+    ON documents
+    FOR EACH ROW
+    WHEN (
+        OLD.processing_status IS DISTINCT FROM NEW.processing_status
+        OR OLD.preview_status IS DISTINCT FROM NEW.preview_status
+        OR OLD.ocr_status IS DISTINCT FROM NEW.ocr_status
+    )
+    EXECUTE FUNCTION notify_document_status();
@@ -0,0 +1,33 @@
+"""statement level tags search trigger
+
+Revision ID: 3c1d2e7a9f40
+Revises: bb19aac50bca
+Create Date: 2026-10-19 09:12:41.503218
+
+"""
+from typing import Sequence, Union
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1d2e7a9f40'
+down_revision: Union[str, None] = 'bb19aac50bca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SQL_FOLDER = Path(__file__).parent.parent.parent / "features" / "search" / "db" / "sql"
+
+
+def upgrade() -> None:
+    op.execute(
+        sa.text(open(SQL_FOLDER / 'search_index_tags_statement_triggers.sql').read())
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        sa.text(open(SQL_FOLDER / 'search_index_tags_statement_triggers_down.sql').read())
+    )
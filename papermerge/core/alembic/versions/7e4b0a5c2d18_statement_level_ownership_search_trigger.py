@@ -0,0 +1,33 @@
+"""statement level ownership search trigger
+
+Revision ID: 7e4b0a5c2d18
+Revises: 3c1d2e7a9f40
+Create Date: 2026-10-19 10:03:27.118934
+
+"""
+from typing import Sequence, Union
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e4b0a5c2d18'
+down_revision: Union[str, None] = '3c1d2e7a9f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SQL_FOLDER = Path(__file__).parent.parent.parent / "features" / "search" / "db" / "sql"
+
+
+def upgrade() -> None:
+    op.execute(
+        sa.text(open(SQL_FOLDER / 'search_index_ownership_statement_triggers.sql').read())
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        sa.text(open(SQL_FOLDER / 'search_index_ownership_statement_triggers_down.sql').read())
+    )
@@ -0,0 +1,55 @@
+"""add outbox table
+
+Revision ID: a9d3e5c71f04
+Revises: e6a4f0b3c812
+Create Date: 2026-10-19 22:31:40.118204
+
+Celery tasks are written to `outbox` in the same transaction as the
+change which requires them and published by the outbox relay.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3e5c71f04'
+down_revision: Union[str, None] = 'e6a4f0b3c812'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'outbox',
+        sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('kwargs', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('route_name', sa.String(length=50), nullable=True),
+        sa.Column('dedup_key', sa.String(length=255), nullable=True),
+        sa.Column(
+            'created_at',
+            postgresql.TIMESTAMP(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column(
+            'available_at',
+            postgresql.TIMESTAMP(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('dedup_key'),
+    )
+    op.create_index(
+        'idx_outbox_available_at', 'outbox', ['available_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_outbox_available_at', table_name='outbox')
+    op.drop_table('outbox')
@@ -0,0 +1,44 @@
+"""compress page text with lz4
+
+Revision ID: a9d3f61b7c25
+Revises: 7e4b0a5c2d18
+Create Date: 2026-10-19 11:21:54.640177
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3f61b7c25'
+down_revision: Union[str, None] = '7e4b0a5c2d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# OCR text is large and is read much less often than the other page and
+# document version columns. It is stored out-of-row (TOAST) by PostgreSQL
+# anyway; lz4 makes compression of the TOASTed values considerably
+# cheaper than the default pglz. Setting only affects newly written values.
+# lz4 support requires PostgreSQL >= 14 built with lz4; on other servers
+# the columns keep the default compression.
+COMPRESSION_SQL = """
+DO $$
+BEGIN
+    ALTER TABLE pages ALTER COLUMN text SET COMPRESSION {method};
+    ALTER TABLE document_versions ALTER COLUMN text SET COMPRESSION {method};
+EXCEPTION
+    WHEN feature_not_supported OR syntax_error OR invalid_parameter_value THEN
+        RAISE NOTICE 'Column compression {method} is not supported, skipping';
+END
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.execute(COMPRESSION_SQL.format(method="lz4"))
+
+
+def downgrade() -> None:
+    op.execute(COMPRESSION_SQL.format(method="pglz"))
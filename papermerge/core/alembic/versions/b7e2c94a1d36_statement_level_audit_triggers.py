@@ -0,0 +1,41 @@
+"""statement level audit triggers
+
+Revision ID: b7e2c94a1d36
+Revises: f3a1c7d95b20
+Create Date: 2026-10-19 18:47:30.114502
+
+Row level audit triggers are replaced by statement level triggers with
+transition tables. `document_versions.text` is stored as md5 hash in
+`audit_log` instead of the full OCR text.
+"""
+from typing import Sequence, Union
+from pathlib import Path
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c94a1d36'
+down_revision: Union[str, None] = 'f3a1c7d95b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def get_sql_file_content(filename: str) -> str:
+    """Load SQL file from the sql directory"""
+    sql_dir = Path(__file__).parent.parent / 'sql'
+    sql_file = sql_dir / filename
+
+    if not sql_file.exists():
+        raise FileNotFoundError(f"SQL file not found: {sql_file}")
+
+    return sql_file.read_text(encoding='utf-8')
+
+
+def upgrade() -> None:
+    op.execute(get_sql_file_content('audit_statement_triggers_up.sql'))
+
+
+def downgrade() -> None:
+    op.execute(get_sql_file_content('audit_statement_triggers_down.sql'))
+    # restores row level triggers (and `set_audit_context`, unchanged)
+    op.execute(get_sql_file_content('audit_trigger_upgrade.sql'))
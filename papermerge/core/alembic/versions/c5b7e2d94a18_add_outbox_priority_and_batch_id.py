@@ -0,0 +1,31 @@
+"""add outbox priority and batch_id
+
+Revision ID: c5b7e2d94a18
+Revises: a9d3e5c71f04
+Create Date: 2026-10-19 23:12:05.402781
+
+Bulk OCR tasks are written to the outbox: they keep their broker
+priority and share a batch ID by which their progress is reported.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5b7e2d94a18'
+down_revision: Union[str, None] = 'a9d3e5c71f04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('outbox', sa.Column('priority', sa.SmallInteger(), nullable=True))
+    op.add_column('outbox', sa.Column('batch_id', sa.Uuid(), nullable=True))
+    op.create_index('idx_outbox_batch_id', 'outbox', ['batch_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_outbox_batch_id', table_name='outbox')
+    op.drop_column('outbox', 'batch_id')
+    op.drop_column('outbox', 'priority')
@@ -0,0 +1,102 @@
+"""partition audit_log
+
+Revision ID: c5d18e3a7f92
+Revises: b7e2c94a1d36
+Create Date: 2026-10-19 20:05:48.270113
+
+`audit_log` becomes a table partitioned by month on `timestamp`.
+Existing rows are copied into monthly partitions (one per month present
+in the data, plus the current and next two months) and into
+`audit_log_default` which catches rows outside of all partitions.
+Primary key changes to (id, timestamp) as the partition key must be
+part of it.
+
+Copying rewrites the whole table: on large installations run it in a
+maintenance window.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d18e3a7f92'
+down_revision: Union[str, None] = 'b7e2c94a1d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('idx_audit_log_operation', ['operation']),
+    ('idx_audit_log_table_record', ['table_name', 'record_id']),
+    ('idx_audit_log_timestamp', ['timestamp']),
+    ('idx_audit_log_user_id', ['user_id']),
+]
+
+CREATE_MONTHLY_PARTITIONS = """
+DO $$
+DECLARE
+    p_month date;
+BEGIN
+    FOR p_month IN
+        SELECT DISTINCT date_trunc('month', "timestamp" AT TIME ZONE 'UTC')::date
+        FROM audit_log_legacy
+        UNION
+        SELECT (date_trunc('month', now() AT TIME ZONE 'UTC') + make_interval(months => n))::date
+        FROM generate_series(0, 2) AS n
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF audit_log FOR VALUES FROM (%L) TO (%L)',
+            'audit_log_' || to_char(p_month, 'YYYY_MM'),
+            p_month::timestamp AT TIME ZONE 'UTC',
+            (p_month + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+        );
+    END LOOP;
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE audit_log RENAME TO audit_log_legacy")
+    op.execute(
+        "ALTER TABLE audit_log_legacy "
+        "RENAME CONSTRAINT audit_log_pkey TO audit_log_legacy_pkey"
+    )
+    for name, _ in INDEXES:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_legacy")
+
+    op.execute(
+        "CREATE TABLE audit_log ("
+        "LIKE audit_log_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS, "
+        "CONSTRAINT audit_log_pkey PRIMARY KEY (id, \"timestamp\")"
+        ") PARTITION BY RANGE (\"timestamp\")"
+    )
+    op.execute("CREATE TABLE audit_log_default PARTITION OF audit_log DEFAULT")
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+    for name, columns in INDEXES:
+        op.create_index(name, 'audit_log', columns, unique=False)
+
+    op.execute("INSERT INTO audit_log SELECT * FROM audit_log_legacy")
+    op.execute("DROP TABLE audit_log_legacy")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE audit_log RENAME TO audit_log_partitioned")
+    op.execute(
+        "ALTER TABLE audit_log_partitioned "
+        "RENAME CONSTRAINT audit_log_pkey TO audit_log_partitioned_pkey"
+    )
+    for name, _ in INDEXES:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_partitioned")
+
+    op.execute(
+        "CREATE TABLE audit_log ("
+        "LIKE audit_log_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS, "
+        "CONSTRAINT audit_log_pkey PRIMARY KEY (id)"
+        ")"
+    )
+    for name, columns in INDEXES:
+        op.create_index(name, 'audit_log', columns, unique=False)
+
+    op.execute("INSERT INTO audit_log SELECT * FROM audit_log_partitioned")
+    # drops attached partitions too; detached (archived) ones are kept
+    op.execute("DROP TABLE audit_log_partitioned")
@@ -0,0 +1,38 @@
+"""notify document status changes
+
+Revision ID: d4e8b2c61f07
+Revises: a9d3f61b7c25
+Create Date: 2026-10-19 14:02:11.408519
+
+Adds trigger which publishes document processing/preview/OCR status
+transitions via pg_notify on the `document_status` channel.
+"""
+from typing import Sequence, Union
+from pathlib import Path
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e8b2c61f07'
+down_revision: Union[str, None] = 'a9d3f61b7c25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def get_sql_file_content(filename: str) -> str:
+    """Load SQL file from the sql directory"""
+    sql_dir = Path(__file__).parent.parent / 'sql'
+    sql_file = sql_dir / filename
+
+    if not sql_file.exists():
+        raise FileNotFoundError(f"SQL file not found: {sql_file}")
+
+    return sql_file.read_text(encoding='utf-8')
+
+
+def upgrade() -> None:
+    op.execute(get_sql_file_content('document_status_notify_up.sql'))
+
+
+def downgrade() -> None:
+    op.execute(get_sql_file_content('document_status_notify_down.sql'))
@@ -0,0 +1,35 @@
+"""audit log trigram search
+
+Revision ID: e6a4f0b3c812
+Revises: c5d18e3a7f92
+Create Date: 2026-10-19 21:14:02.551937
+
+Trigram (pg_trgm) GIN index on lowercase "username table operation" of
+audit_log rows for the free text search, and index on `record_id` for
+exact UUID lookups.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a4f0b3c812'
+down_revision: Union[str, None] = 'c5d18e3a7f92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # must be same expression as `audit.db.orm.search_text`
+    op.execute(
+        "CREATE INDEX idx_audit_log_search_trgm ON audit_log USING gin ("
+        "lower(coalesce(username, '') || ' ' || table_name || ' ' || operation) "
+        "gin_trgm_ops)"
+    )
+    op.create_index('idx_audit_log_record_id', 'audit_log', ['record_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_audit_log_record_id', table_name='audit_log')
+    op.drop_index('idx_audit_log_search_trgm', table_name='audit_log')
@@ -0,0 +1,40 @@
+"""add foreign key indexes
+
+Revision ID: f3a1c7d95b20
+Revises: d4e8b2c61f07
+Create Date: 2026-10-19 16:21:05.733190
+
+Indexes on foreign key columns used by hot queries (folder listing,
+tags, versions/pages of a document, group membership). `IF NOT EXISTS`
+as some installations created them manually.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a1c7d95b20'
+down_revision: Union[str, None] = 'd4e8b2c61f07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('idx_nodes_parent_id', 'nodes', ['parent_id']),
+    ('idx_nodes_tags_node_id', 'nodes_tags', ['node_id']),
+    ('idx_nodes_tags_tag_id', 'nodes_tags', ['tag_id']),
+    ('idx_documents_document_type_id', 'documents', ['document_type_id']),
+    ('idx_document_versions_document_id', 'document_versions', ['document_id']),
+    ('idx_pages_document_version_id', 'pages', ['document_version_id']),
+    ('idx_users_groups_user_id', 'users_groups', ['user_id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -1,13 +1,93 @@
 from papermerge.core import config
 from .empty import Client as EmptyClient
 from .redis_client import Client as RedisClient
+from .async_client import AsyncCache
 
 settings = config.get_settings()
 
-redis_url = str(settings.redis_url)
+redis_url = str(settings.redis_url) if settings.redis_url else None
 cache_enabled = settings.cache_enabled
 
 if redis_url and cache_enabled:
     client = RedisClient(redis_url)
 else:
     client = EmptyClient()
+
+_async_cache: AsyncCache | None = None
+_shared_async_cache: AsyncCache | None = None
+_redis = None
+
+
+def _get_redis():
+    """Process wide `redis.asyncio` client (one connection pool)"""
+    global _redis
+
+    if _redis is None:
+        from redis.asyncio import Redis, BlockingConnectionPool
+
+        pool = BlockingConnectionPool.from_url(
+            redis_url,
+            max_connections=settings.cache_redis_max_connections,
+        )
+        _redis = Redis(connection_pool=pool)
+
+    return _redis
+
+
+def _namespace(name: str) -> str:
+    return f"{settings.prefix}:{name}" if settings.prefix else name
+
+
+def get_async_cache() -> AsyncCache:
+    """Returns process wide async cache
+
+    With caching disabled (`PM_CACHE_ENABLED=false`) returned cache does
+    not store anything; without `PM_REDIS_URL` only the in-process tier
+    is used.
+    """
+    global _async_cache
+
+    if _async_cache is not None:
+        return _async_cache
+
+    redis = None
+    local_maxsize = 0
+    if cache_enabled:
+        local_maxsize = settings.cache_local_maxsize
+        if redis_url:
+            redis = _get_redis()
+
+    _async_cache = AsyncCache(
+        redis=redis,
+        namespace=_namespace("cache"),
+        serializer=settings.cache_serializer,
+        local_maxsize=local_maxsize,
+        local_ttl=settings.cache_local_ttl,
+    )
+
+    return _async_cache
+
+
+def get_shared_async_cache() -> AsyncCache:
+    """Returns process wide async cache which stores in Redis only
+
+    For state all processes must see, e.g. read your writes marks of
+    `db.replicas`: unlike `get_async_cache` it is used regardless of
+    `PM_CACHE_ENABLED` and has no in-process tier. Requires `PM_REDIS_URL`.
+    """
+    global _shared_async_cache
+
+    if _shared_async_cache is not None:
+        return _shared_async_cache
+
+    if not redis_url:
+        raise ValueError("Shared async cache requires PM_REDIS_URL")
+
+    _shared_async_cache = AsyncCache(
+        redis=_get_redis(),
+        namespace=_namespace("shared"),
+        serializer=settings.cache_serializer,
+        local_maxsize=0,
+    )
+
+    return _shared_async_cache
@@ -0,0 +1,294 @@
+"""Async two tier cache
+
+Tier 1 is a small in-process LRU (with short TTL), tier 2 is Redis
+(``redis.asyncio`` with connection pool). Either tier may be disabled:
+without Redis only the in-process tier is used; with ``local_maxsize=0``
+every lookup goes to Redis; with both disabled nothing is cached at all,
+but ``get_or_set`` still coalesces concurrent computations.
+
+Usage:
+
+    from papermerge.core.cache import get_async_cache
+
+    cache = get_async_cache()
+    prefs = await cache.get_or_set(
+        f"user-prefs:{user_id}",
+        lambda: load_preferences(db_session, user_id),
+        ex=300,
+        tags=[f"user:{user_id}"],
+    )
+    ...
+    await cache.delete_by_tag(f"user:{user_id}")
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+# Tag sets are kept at least this long (seconds); members may expire earlier
+TAG_SET_MIN_TTL = 24 * 3600
+
+
+@dataclass
+class CacheStats:
+    local_hits: int = 0
+    hits: int = 0  # redis hits
+    misses: int = 0
+    sets: int = 0
+    deletes: int = 0
+    errors: int = 0  # redis errors (treated as misses)
+
+
+class JSONSerializer:
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":"), default=str).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class MsgpackSerializer:
+    def __init__(self):
+        try:
+            import msgpack
+        except ImportError as e:
+            raise ImportError(
+                "msgpack cache serializer requires `msgpack` package"
+            ) from e
+        self._msgpack = msgpack
+
+    def dumps(self, value: Any) -> bytes:
+        return self._msgpack.packb(value, default=str, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return self._msgpack.unpackb(data, raw=False)
+
+
+SERIALIZERS = {
+    "json": JSONSerializer,
+    "msgpack": MsgpackSerializer,
+}
+
+
+class LocalLRU:
+    """In-process LRU with per entry expiration"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return _MISSING
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ex: float | None = None):
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ex is None else min(self.ttl, ex)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+
+class AsyncCache:
+    def __init__(
+        self,
+        redis=None,  # redis.asyncio.Redis instance or None
+        namespace: str = "pm",
+        serializer: str = "json",
+        local_maxsize: int = 1024,
+        local_ttl: float = 5,
+    ):
+        self.redis = redis
+        self.namespace = namespace
+        self.serializer = SERIALIZERS[serializer]()
+        self.local = LocalLRU(maxsize=local_maxsize, ttl=local_ttl)
+        self.stats = CacheStats()
+        # tag -> keys, for the in-process tier
+        self._local_tags: dict[str, set[str]] = {}
+        # key -> future of the computation in progress (single-flight)
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.redis is not None or self.local.maxsize > 0
+
+    def make_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.namespace}:tag:{tag}"
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Returns cached value - with one Redis round trip at most"""
+        full_key = self.make_key(key)
+
+        value = self.local.get(full_key)
+        if value is not _MISSING:
+            self.stats.local_hits += 1
+            return value
+
+        if self.redis is not None:
+            try:
+                data = await self.redis.get(full_key)
+            except Exception as e:
+                self.stats.errors += 1
+                logger.warning(f"Cache GET {full_key} failed: {e}")
+                data = None
+            if data is not None:
+                self.stats.hits += 1
+                value = self.serializer.loads(data)
+                self.local.set(full_key, value)
+                return value
+
+        self.stats.misses += 1
+        return default
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ex: int = 60,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """Caches value for ``ex`` seconds
+
+        ``tags`` allow invalidating groups of keys with ``delete_by_tag``.
+        """
+        full_key = self.make_key(key)
+        tags = list(tags)
+        self.stats.sets += 1
+        self.local.set(full_key, value, ex=ex)
+        if self.local.maxsize > 0:
+            if len(self._local_tags) > 4 * self.local.maxsize:
+                # keep tag bookkeeping bounded: drop the (short lived)
+                # in-process tier altogether rather than tracking evictions
+                self._local_tags.clear()
+                self.local.clear()
+            for tag in tags:
+                self._local_tags.setdefault(tag, set()).add(full_key)
+
+        if self.redis is None:
+            return
+
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.set(full_key, self.serializer.dumps(value), ex=ex)
+                for tag in tags:
+                    tag_key = self._tag_key(tag)
+                    pipe.sadd(tag_key, full_key)
+                    pipe.expire(tag_key, max(ex, TAG_SET_MIN_TTL))
+                await pipe.execute()
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Cache SET {full_key} failed: {e}")
+
+    async def delete(self, *keys: str) -> None:
+        full_keys = [self.make_key(key) for key in keys]
+        await self._delete_full_keys(full_keys)
+
+    async def delete_by_tag(self, *tags: str) -> None:
+        """Invalidates all keys which were set with any of the given tags"""
+        full_keys = set()
+        for tag in tags:
+            full_keys.update(self._local_tags.pop(tag, ()))
+
+        if self.redis is not None:
+            tag_keys = [self._tag_key(tag) for tag in tags]
+            try:
+                members = await self.redis.sunion(*tag_keys)
+                full_keys.update(
+                    m.decode() if isinstance(m, bytes) else m for m in members
+                )
+                await self.redis.delete(*tag_keys)
+            except Exception as e:
+                self.stats.errors += 1
+                logger.warning(f"Cache tag invalidation of {tags} failed: {e}")
+
+        await self._delete_full_keys(list(full_keys))
+
+    async def get_or_set(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        ex: int = 60,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """Returns cached value or computes, caches and returns it
+
+        Concurrent callers asking for the same missing key (within this
+        process) wait for a single computation instead of all calling
+        ``factory`` (cache stampede protection).
+        """
+        value = await self.get(key, default=_MISSING)
+        if value is not _MISSING:
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await factory()
+            await self.set(key, value, ex=ex, tags=tags)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # mark exception as retrieved if there were no waiters
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            del self._inflight[key]
+
+        return value
+
+    def get_stats(self) -> dict[str, int]:
+        return asdict(self.stats)
+
+    async def close(self):
+        if self.redis is not None:
+            await self.redis.aclose()
+
+    async def _delete_full_keys(self, full_keys: list[str]):
+        if not full_keys:
+            return
+
+        self.stats.deletes += len(full_keys)
+        for full_key in full_keys:
+            self.local.delete(full_key)
+
+        if self.redis is None:
+            return
+
+        try:
+            await self.redis.delete(*full_keys)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Cache DELETE {full_keys} failed: {e}")
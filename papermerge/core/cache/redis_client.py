@@ -7,10 +7,11 @@ class Client:
         self.client = redis.from_url(url)
 
     def get(self, key):
-        if self.client.exists(key):
-            return self.client.get(key).decode("utf-8")
+        value = self.client.get(key)
+        if value is None:
+            return None
 
-        return None
+        return value.decode("utf-8")
 
     def set(self, key, value, ex: int = 60):
         """ex is number of SECONDS until key expires"""
@@ -0,0 +1,60 @@
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from papermerge.core.db import query_plans
+from papermerge.core.db.engine import AsyncSessionLocal
+from papermerge.core.utils.cli import async_command
+
+app = typer.Typer(help="Database schema checks")
+console = Console()
+
+
+@app.command(name="missing-indexes")
+@async_command
+async def missing_indexes_cmd(
+    include_audit_columns: bool = typer.Option(
+        False, help="Report also created_by/updated_by/... foreign keys"
+    ),
+):
+    """List missing indexes of the installed schema
+
+    Reports foreign keys without an index on their columns (joins and
+    cascading deletes on such keys scan the whole table) and indexes
+    declared on models which do not exist in the database.
+    Exits with code 1 if anything is missing.
+    """
+    async with AsyncSessionLocal() as db_session:
+        fk_indexes = await query_plans.get_missing_indexes(
+            db_session, include_audit_columns=include_audit_columns
+        )
+        model_indexes = await query_plans.get_missing_model_indexes(db_session)
+
+    if fk_indexes:
+        table = Table(title="Foreign keys without index")
+        table.add_column("Table", style="cyan")
+        table.add_column("Columns", style="green")
+        table.add_column("Est. rows", justify="right")
+        table.add_column("Suggested index")
+        for item in fk_indexes:
+            table.add_row(
+                item.table_name,
+                ", ".join(item.columns),
+                str(item.estimated_rows),
+                item.create_statement,
+            )
+        console.print(table)
+
+    if model_indexes:
+        table = Table(title="Model indexes missing in database")
+        table.add_column("Table", style="cyan")
+        table.add_column("Index", style="green")
+        for table_name, index_name in model_indexes:
+            table.add_row(table_name, index_name)
+        console.print(table)
+
+    if not fk_indexes and not model_indexes:
+        console.print("[green]No missing indexes[/green]")
+        return
+
+    raise typer.Exit(code=1)
@@ -11,14 +11,22 @@ Usage:
     apps = discover_cli_apps(features_path)
     for cli_app, name in apps:
         main_app.add_typer(cli_app, name=name)
+
+`find_cli_modules` / `LazyCliGroup` do the same discovery without
+importing anything: CLI modules (and the models, storage and PDF
+libraries they pull in) are imported only when their command is invoked.
 """
 
+import ast
 import importlib
+import importlib.util
 import logging
 import pkgutil
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
 
+import click
 import typer
 
 logger = logging.getLogger(__name__)
@@ -223,3 +231,153 @@ def discover_core_cli_apps(core_cli_path: Path) -> List[Tuple[typer.Typer, str]]
 
     logger.info(f"Discovered {len(cli_apps)} CLI apps from core.cli")
     return cli_apps
+
+
+@dataclass(frozen=True)
+class LazyCliApp:
+    """CLI app (typer.Typer instance named `app`) not imported yet"""
+    name: str
+    module_name: str
+    help: str | None = None
+
+    def load(self) -> click.Command | None:
+        # unlike eager discovery, import errors are not swallowed: the
+        # user asked for this very command
+        module = importlib.import_module(self.module_name)
+        app = getattr(module, "app", None)
+        if not isinstance(app, typer.Typer):
+            logger.warning(f"Module {self.module_name} has no typer.Typer 'app'")
+            return None
+
+        command = typer.main.get_group(app)
+        command.name = self.name
+        return command
+
+
+def find_cli_modules(
+    base_path: Path,
+    additional_paths: Iterable[str] = (),
+) -> List[LazyCliApp]:
+    """
+    Finds CLI modules the same way as `discover_core_cli_apps`,
+    `discover_cli_apps` and `discover_additional_cli_apps` do,
+    but without importing them.
+
+    Help text of each app is read from its source
+    (``app = typer.Typer(help="...")``).
+
+    Args:
+        base_path: Path to the `core` directory
+        additional_paths: Module paths of additional CLI modules/packages
+
+    Returns:
+        List of not yet loaded CLI apps
+    """
+    found = []
+
+    for file_path in sorted((base_path / "cli").glob("*.py")):
+        if file_path.name.startswith("__"):
+            continue
+        found.append(_lazy_app(
+            file_path.stem, f"papermerge.core.cli.{file_path.stem}", file_path
+        ))
+
+    features_dir = base_path / "features"
+    for feature_module in pkgutil.iter_modules([str(features_dir)]):
+        if not feature_module.ispkg:
+            continue
+
+        name = feature_module.name
+        for rel_path, module_name in (
+            ("cli.py", f"papermerge.core.features.{name}.cli"),
+            ("cli/cli.py", f"papermerge.core.features.{name}.cli.cli"),
+        ):
+            file_path = features_dir / name / rel_path
+            if file_path.exists():
+                found.append(_lazy_app(name, module_name, file_path))
+                break
+
+    for module_path_str in additional_paths:
+        try:
+            spec = importlib.util.find_spec(module_path_str)
+        except (ImportError, ValueError) as e:
+            logger.debug(f"Could not find {module_path_str}: {e}")
+            continue
+        if spec is None:
+            continue
+
+        if spec.submodule_search_locations:
+            for submodule in pkgutil.iter_modules(spec.submodule_search_locations):
+                file_path = Path(spec.submodule_search_locations[0]) / f"{submodule.name}.py"
+                found.append(_lazy_app(
+                    submodule.name, f"{module_path_str}.{submodule.name}", file_path
+                ))
+        elif spec.origin:
+            found.append(_lazy_app(
+                module_path_str.split(".")[-1], module_path_str, Path(spec.origin)
+            ))
+
+    return found
+
+
+def _lazy_app(name: str, module_name: str, file_path: Path) -> LazyCliApp:
+    return LazyCliApp(name=name, module_name=module_name, help=_read_app_help(file_path))
+
+
+def _read_app_help(file_path: Path) -> str | None:
+    """Returns `help` of ``app = typer.Typer(help=...)`` found in the source"""
+    try:
+        tree = ast.parse(file_path.read_text(encoding="utf-8"))
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    for node in tree.body:
+        if not (
+            isinstance(node, ast.Assign)
+            and any(isinstance(t, ast.Name) and t.id == "app" for t in node.targets)
+            and isinstance(node.value, ast.Call)
+        ):
+            continue
+        for keyword in node.value.keywords:
+            if keyword.arg == "help" and isinstance(keyword.value, ast.Constant):
+                return keyword.value.value
+
+    return None
+
+
+class LazyCliGroup(click.Group):
+    """
+    Click group whose sub-commands are imported on first use.
+
+    Listing commands (e.g. ``--help``) uses help texts read from the
+    sources and does not import any CLI module.
+    """
+
+    def __init__(self, *args, lazy_apps: Iterable[LazyCliApp] = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_apps = {item.name: item for item in lazy_apps}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_apps))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        command = super().get_command(ctx, cmd_name)
+        if command is None and cmd_name in self.lazy_apps:
+            command = self.lazy_apps[cmd_name].load()
+            if command is not None:
+                self.add_command(command, cmd_name)
+
+        return command
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.commands:
+                help_text = self.commands[name].get_short_help_str(formatter.width)
+            else:
+                help_text = self.lazy_apps[name].help or ""
+            rows.append((name, help_text))
+
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
@@ -0,0 +1,102 @@
+"""Gzip compression of JSON responses
+
+Only JSON bodies are worth compressing here: document files and images
+are compressed already, and compressing a byte range (206 response,
+`Content-Range`) would break its semantics. Responses already carrying
+`Content-Encoding` are passed through as well.
+"""
+import gzip
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+
+def is_json(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type == "application/json" or media_type.endswith("+json")
+
+
+class JSONGZipMiddleware:
+    """Gzip compresses JSON responses of at least `minimum_size` bytes
+    (pure ASGI middleware)
+
+    Single body responses are compressed at once (with `Content-Length`);
+    streamed bodies are compressed chunk by chunk.
+    """
+
+    def __init__(self, app, minimum_size: int = 500, compresslevel: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        if "gzip" not in accept_encoding:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        # None: not decided yet, False: pass through, zlib object: compress
+        compressor = None
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                initial, start_message = start_message, None
+                headers = MutableHeaders(raw=initial["headers"])
+                eligible = (
+                    initial["status"] != 206
+                    and is_json(headers.get("content-type", ""))
+                    and "content-range" not in headers
+                    and "content-encoding" not in headers
+                    and (more_body or len(body) >= self.minimum_size)
+                )
+                if not eligible:
+                    compressor = False
+                    await send(initial)
+                    await send(message)
+                    return
+
+                headers["Content-Encoding"] = "gzip"
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body:
+                    body = gzip.compress(body, compresslevel=self.compresslevel)
+                    headers["Content-Length"] = str(len(body))
+                    compressor = False
+                    await send(initial)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                del headers["Content-Length"]
+                # wbits 31: gzip container
+                compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 31)
+                await send(initial)
+
+            if compressor is False:
+                await send(message)
+                return
+
+            data = compressor.compress(body)
+            if not more_body:
+                data += compressor.flush()
+            await send(
+                {"type": "http.response.body", "body": data, "more_body": more_body}
+            )
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,6 +1,7 @@
 from pathlib import Path
+from typing import Literal
 
-from pydantic import PostgresDsn, RedisDsn, Field, computed_field
+from pydantic import PostgresDsn, RedisDsn, Field, computed_field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from papermerge.core.types import DocumentLang, StorageBackend
@@ -10,6 +11,17 @@ class Settings(BaseSettings):
     db_url: PostgresDsn
     # Connect to DB via SSL
     db_ssl: bool = False
+    # Streaming replicas used by read-only endpoints (empty = primary only)
+    db_replica_urls: list[PostgresDsn] = []
+    db_replica_routing: Literal["round_robin", "least_connections"] = "round_robin"
+    # Replicas lagging behind the primary more than this many seconds are
+    # not used; lag is checked at most every `db_replica_lag_check_interval`
+    db_replica_max_lag: float = Field(gt=0, default=5.0)
+    db_replica_lag_check_interval: float = Field(gt=0, default=10.0)
+    # After a write, user's reads go to the primary for this many seconds
+    # (marks are shared by all processes through Redis: with replicas and
+    # a window, `redis_url` is required)
+    db_read_your_writes_window: float = Field(ge=0, default=5.0)
     log_config: Path | None = Path("/app/log_config.yaml")
     api_prefix: str = ''
     default_lang: DocumentLang = DocumentLang.deu
@@ -17,6 +29,13 @@ class Settings(BaseSettings):
     # Redis
     cache_enabled: bool = False
     redis_url: RedisDsn | None = None
+    # Async cache: serialization format of values stored in Redis
+    cache_serializer: Literal["json", "msgpack"] = "json"
+    # Async cache: max size of Redis connection pool (per process)
+    cache_redis_max_connections: int = Field(gt=0, default=50)
+    # Async cache: in-process tier size (0 disables it) and TTL in seconds
+    cache_local_maxsize: int = Field(ge=0, default=1024)
+    cache_local_ttl: int = Field(gt=0, default=5)
 
     # File storage
     media_root: Path = Path("media")
@@ -35,6 +54,55 @@ class Settings(BaseSettings):
     bucket_name: str | None = None
 
     preview_page_size_sm: int = Field(gt=0, default=200)
+    # Max number of documents per batched thumbnails request
+    thumbnails_batch_max_size: int = Field(gt=0, default=200)
+    # Max number of nodes per bulk tags update request
+    bulk_tags_max_size: int = Field(gt=0, default=1000)
+    # Save generated document versions as linearized ("fast web view") PDFs
+    pdf_linearize: bool = False
+
+    # Deletion of large subtrees is performed in batches of this many nodes
+    subtree_delete_batch_size: int = Field(gt=0, default=500)
+    # Subtrees with more nodes than this are deleted in background
+    subtree_delete_background_threshold: int = Field(gt=0, default=5000)
+    # Max number of IDs sent to the S3 worker in one cleanup message
+    s3_cleanup_batch_size: int = Field(gt=0, default=1000)
+
+    # Seconds between keep-alive comments sent on idle status event streams
+    status_events_keepalive: float = Field(gt=0, default=15.0)
+
+    # Celery tasks are written to the outbox table and published by the
+    # outbox relay: in each web process (embedded) or by `pm outbox relay`
+    outbox_relay_embedded: bool = True
+    # Max number of messages published per relay transaction
+    outbox_batch_size: int = Field(gt=0, default=100)
+    # Seconds between relay polls (it is also woken up on each commit)
+    outbox_poll_interval: float = Field(gt=0, default=5.0)
+    # Max seconds between attempts to publish a failing message
+    outbox_max_retry_delay: int = Field(gt=0, default=300)
+
+    # Bulk OCR scheduling: tasks published per broker connection and max
+    # documents scheduled per second (0 = no limit)
+    ocr_schedule_batch_size: int = Field(gt=0, default=500)
+    ocr_schedule_rate: float = Field(ge=0, default=0)
+
+    # Gzip compress JSON responses larger than this many bytes (0 = disabled).
+    # Meant for big JSON listings when there is no compressing reverse proxy
+    response_gzip_min_size: int = Field(ge=0, default=0)
+
+    # Audit log partitions older than this many full months are removed
+    # by `pm audit retention` (0 = keep forever)
+    audit_log_retention_months: int = Field(ge=0, default=0)
+
+    # Expose Prometheus metrics on /metrics
+    metrics_enabled: bool = False
+
+    # Per-request SQL stats: Server-Timing header, log line, N+1 warnings
+    sql_instrumentation: bool = False
+    # Warn when same statement shape runs more than this many times per request
+    sql_nplus1_threshold: int = Field(gt=0, default=10)
+    # Number of slowest statements included in the per-request log line
+    sql_slowest_count: int = Field(gt=0, default=3)
 
     # Multitenant prefix
     prefix: str = ''
@@ -51,6 +119,14 @@ class Settings(BaseSettings):
     def async_db_url(self) -> str:
         return str(self.db_url).replace("postgresql://", "postgresql+asyncpg://", 1)
 
+    @computed_field
+    @property
+    def async_db_replica_urls(self) -> list[str]:
+        return [
+            str(url).replace("postgresql://", "postgresql+asyncpg://", 1)
+            for url in self.db_replica_urls
+        ]
+
     @computed_field
     @property
     def r2_endpoint_url(self) -> str | None:
@@ -58,6 +134,18 @@ class Settings(BaseSettings):
             return f"https://{self.r2_account_id}.r2.cloudflarestorage.com"
         return None
 
+    @model_validator(mode="after")
+    def check_read_your_writes(self) -> "Settings":
+        # without Redis the marks stay in the process which saw the write:
+        # other processes would route user's reads to a lagging replica
+        if self.db_replica_urls and self.db_read_your_writes_window and not self.redis_url:
+            raise ValueError(
+                "PM_DB_REPLICA_URLS requires PM_REDIS_URL (read your writes "
+                "marks are shared through Redis) or "
+                "PM_DB_READ_YOUR_WRITES_WINDOW=0"
+            )
+        return self
+
     model_config = SettingsConfigDict(env_prefix='pm_')
 
 
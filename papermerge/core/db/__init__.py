@@ -9,13 +9,16 @@ from papermerge.core.features.custom_fields.db.api import \
 from papermerge.core.features.document.db.api import get_doc_ver_lang, \
     set_doc_ver_lang, get_last_doc_ver
 from .common import has_node_perm
-from .engine import get_db
+from .engine import get_db, get_db_readonly
 
 DBRouterAsyncSession = Annotated[AsyncSession, Depends(get_db)]
+# Read-only endpoints: session on a read replica if configured
+DBReadOnlyAsyncSession = Annotated[AsyncSession, Depends(get_db_readonly)]
 
 
 __all__ = [
     "DBRouterAsyncSession",
+    "DBReadOnlyAsyncSession",
     "AsyncSession",
     "search_documents",
     "update_document_custom_field_values",
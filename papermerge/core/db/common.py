@@ -1,7 +1,19 @@
+import functools
 from typing import List, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, exists, literal, and_, or_
+from sqlalchemy import (
+    BindParameter,
+    CTE,
+    Select,
+    select,
+    exists,
+    literal,
+    and_,
+    or_,
+    func,
+    bindparam,
+)
 from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -11,20 +23,17 @@ from papermerge.core.features.roles.db import orm as roles_orm
 from papermerge.core.types import OwnerType
 from papermerge.core.schemas.common import OwnedBy
 from papermerge.core.features.ownership.db.orm import Ownership
-from papermerge.core.features.groups.db.orm import UserGroup
+from papermerge.core.features.groups.db.orm import Group, UserGroup
 from papermerge.core.features.ownership.db import api as ownership_api
 from papermerge.core.types import ResourceType
 
+# Statements of hot lookups (ancestors, permission checks, node owner)
+# are built once, with bound parameters, and reused on every call: the
+# statement is not rebuilt, its cache key is memoized on it and its
+# compiled form is served by the engine's compiled cache.
 
-async def get_ancestors(
-    db_session: AsyncSession, node_id: UUID, include_self=True
-) -> List[Tuple[UUID, str]]:
-    """Returns all ancestors of the node
 
-    The most distant ancestor will be the first element in returned list.
-    The most recent ancestor will be the last element in returned list.
-    In other words, "home" or "inbox" folders will be first in returned list
-    """
+def _ancestors_cte(node_id: BindParameter) -> CTE:
     nodes_anchor = (
         select(
             orm.Node.id, orm.Node.title, orm.Node.parent_id, literal(0).label("level")
@@ -32,7 +41,8 @@ async def get_ancestors(
         .where(orm.Node.id == node_id)
         .cte(recursive=True, name="tree")
     )
-    tree = nodes_anchor.union_all(
+
+    return nodes_anchor.union_all(
         select(
             orm.Node.id,
             orm.Node.title,
@@ -41,6 +51,12 @@ async def get_ancestors(
         ).where(nodes_anchor.c.parent_id == orm.Node.id)
     )
 
+
+@functools.cache
+def ancestors_stmt(include_self: bool = True) -> Select:
+    """Ancestors of `:node_id` node, the most distant first"""
+    node_id = bindparam("node_id")
+    tree = _ancestors_cte(node_id)
     stmt = (
         select(tree.c.id, tree.c.title).select_from(tree).order_by(tree.c.level.desc())
     )
@@ -48,7 +64,21 @@ async def get_ancestors(
     if not include_self:
         stmt = stmt.where(tree.c.id != node_id)
 
-    result = await db_session.execute(stmt)
+    return stmt
+
+
+async def get_ancestors(
+    db_session: AsyncSession, node_id: UUID, include_self=True
+) -> List[Tuple[UUID, str]]:
+    """Returns all ancestors of the node
+
+    The most distant ancestor will be the first element in returned list.
+    The most recent ancestor will be the last element in returned list.
+    In other words, "home" or "inbox" folders will be first in returned list
+    """
+    result = await db_session.execute(
+        ancestors_stmt(bool(include_self)), {"node_id": node_id}
+    )
 
     return [(row.id, row.title) for row in result]
 
@@ -208,21 +238,79 @@ async def get_descendants(
     return [(row.id, row.title) for row in result]
 
 
-async def has_node_perm(
-    db_session: AsyncSession,
-    node_id: UUID,
-    codename: str,
-    user_id: UUID,
-) -> bool:
+async def count_descendants(
+    db_session: AsyncSession, node_ids: list[UUID], include_selfs=True
+) -> int:
+    """Returns number of descendants of all `node_ids` nodes
+
+    Same as `len(get_descendants(...))`, but counting is done on
+    the server side i.e. no IDs are transferred to Python.
     """
-    Has user `codename` permission for `node_id`?
+    if len(node_ids) < 1:
+        raise ValueError("len(node_ids) must be >= 1 ")
+
+    nodes_anchor = (
+        select(orm.Node.id)
+        .where(orm.Node.id.in_(node_ids))
+        .cte(recursive=True, name="tree")
+    )
+    tree = nodes_anchor.union_all(
+        select(orm.Node.id).where(nodes_anchor.c.id == orm.Node.parent_id)
+    )
+
+    # overlapping `node_ids` reach the same nodes more than once
+    stmt = select(func.count(tree.c.id.distinct())).select_from(tree)
+
+    if not include_selfs:
+        stmt = stmt.where(tree.c.id.not_in(node_ids))
+
+    return (await db_session.execute(stmt)).scalar_one()
+
+
+async def get_descendants_deepest_first(
+    db_session: AsyncSession, node_ids: list[UUID]
+) -> list[UUID]:
+    """Returns IDs of `node_ids` nodes and their descendants, deepest first
+
+    The subtree is walked once. Deleting returned nodes in order (in any
+    number of chunks) deletes the subtree bottom-up: after each chunk none
+    of the remaining nodes references a deleted node as its parent.
+
+    Each node is returned once, even if `node_ids` overlap (e.g. a folder
+    and one of its descendants); it is placed by its deepest occurrence.
     """
-    ancestor_ids = [item[0] for item in await get_ancestors(db_session, node_id)]
+    nodes_anchor = (
+        select(orm.Node.id, literal(0).label("depth"))
+        .where(orm.Node.id.in_(node_ids))
+        .cte(recursive=True, name="tree")
+    )
+    tree = nodes_anchor.union_all(
+        select(orm.Node.id, (nodes_anchor.c.depth + 1).label("depth")).where(
+            nodes_anchor.c.id == orm.Node.parent_id
+        )
+    )
+
+    stmt = (
+        select(tree.c.id)
+        .select_from(tree)
+        .group_by(tree.c.id)
+        .order_by(func.max(tree.c.depth).desc(), tree.c.id)
+    )
+
+    return list((await db_session.scalars(stmt)).all())
 
-    # Get groups user belongs to
-    user_groups_stmt = select(UserGroup.group_id).where(UserGroup.user_id == user_id)
-    user_group_ids_result = await db_session.execute(user_groups_stmt)
-    user_group_ids = [row[0] for row in user_group_ids_result]
+
+@functools.cache
+def node_perm_stmt() -> Select:
+    """Has user `:user_id` `:codename` permission for `:node_id`?
+
+    Ownership of the node (by the user or one of user's groups) or a
+    share of the node or one of its ancestors, in one statement.
+    """
+    node_id = bindparam("node_id")
+    user_id = bindparam("user_id")
+    user_group_ids = select(UserGroup.group_id).where(UserGroup.user_id == user_id)
+    tree = _ancestors_cte(node_id)
 
     # Check 1: Direct ownership - user owns OR user's group owns
     node_access = (
@@ -250,7 +338,7 @@ async def has_node_perm(
         )
     )
 
-    # Check 2: Shared access (unchanged)
+    # Check 2: Shared access to the node or one of its ancestors
     sn = aliased(sn_orm.SharedNode)
     n = aliased(orm.Node)
     r = aliased(roles_orm.Role)
@@ -264,17 +352,160 @@ async def has_node_perm(
         .join(r, r.id == sn.role_id)
         .join(rp, rp.c.role_id == r.id)
         .join(p, p.id == rp.c.permission_id)
+        .where(
+            (p.codename == bindparam("codename"))
+            & (sn.node_id.in_(select(tree.c.id)))
+            & ((sn.user_id == user_id) | (sn.group_id.in_(user_group_ids)))
+        )
+    )
+
+    return exists(node_access.union_all(node_shared_access)).select()
+
+
+async def has_node_perm(
+    db_session: AsyncSession,
+    node_id: UUID,
+    codename: str,
+    user_id: UUID,
+) -> bool:
+    """
+    Has user `codename` permission for `node_id`?
+    """
+    result = await db_session.execute(
+        node_perm_stmt(),
+        {"node_id": node_id, "codename": codename, "user_id": user_id},
+    )
+
+    return result.scalar_one()
+
+
+async def get_nodes_with_perm(
+    db_session: AsyncSession,
+    node_ids: list[UUID],
+    codename: str,
+    user_id: UUID,
+) -> set[UUID]:
+    """
+    Returns the subset of `node_ids` on which user has `codename` permission
+
+    Set-based counterpart of `has_node_perm`: ownership is resolved for all
+    nodes in one query, and only nodes not owned by the user (or user's
+    groups) are checked for shared access, again in one query.
+    """
+    if not node_ids:
+        return set()
+
+    user_groups_stmt = select(UserGroup.group_id).where(UserGroup.user_id == user_id)
+    user_group_ids = [row[0] for row in await db_session.execute(user_groups_stmt)]
+
+    owned_stmt = select(Ownership.resource_id).where(
+        Ownership.resource_type == ResourceType.NODE.value,
+        Ownership.resource_id.in_(node_ids),
+        or_(
+            and_(
+                Ownership.owner_type == OwnerType.USER.value,
+                Ownership.owner_id == user_id
+            ),
+            and_(
+                Ownership.owner_type == OwnerType.GROUP.value,
+                Ownership.owner_id.in_(user_group_ids)
+            )
+        )
+    )
+    allowed = set((await db_session.scalars(owned_stmt)).all())
+    remaining = set(node_ids) - allowed
+
+    if not remaining:
+        return allowed
+
+    # Walk up from every remaining node, remembering where the walk started
+    nodes_anchor = (
+        select(
+            orm.Node.id.label("origin_id"),
+            orm.Node.id,
+            orm.Node.parent_id,
+        )
+        .where(orm.Node.id.in_(remaining))
+        .cte(recursive=True, name="tree")
+    )
+    tree = nodes_anchor.union_all(
+        select(
+            nodes_anchor.c.origin_id,
+            orm.Node.id,
+            orm.Node.parent_id,
+        ).where(nodes_anchor.c.parent_id == orm.Node.id)
+    )
+
+    sn = aliased(sn_orm.SharedNode)
+    r = aliased(roles_orm.Role)
+    rp = aliased(roles_orm.roles_permissions_association)
+    p = aliased(roles_orm.Permission)
+
+    shared_stmt = (
+        select(tree.c.origin_id)
+        .distinct()
+        .select_from(tree)
+        .join(sn, sn.node_id == tree.c.id)
+        .join(r, r.id == sn.role_id)
+        .join(rp, rp.c.role_id == r.id)
+        .join(p, p.id == rp.c.permission_id)
         .where(
             (p.codename == codename)
-            & (sn.node_id.in_(ancestor_ids))
             & ((sn.user_id == user_id) | (sn.group_id.in_(user_group_ids)))
         )
     )
+    allowed.update((await db_session.scalars(shared_stmt)).all())
+
+    return allowed
+
+
+async def has_nodes_perm(
+    db_session: AsyncSession,
+    node_ids: list[UUID],
+    codename: str,
+    user_id: UUID,
+) -> bool:
+    """
+    Has user `codename` permission for every node in `node_ids`?
+    """
+    allowed = await get_nodes_with_perm(
+        db_session, node_ids=node_ids, codename=codename, user_id=user_id
+    )
 
-    stmt = exists(node_access.union_all(node_shared_access)).select()
-    has_access = (await db_session.execute(stmt)).scalar_one()
+    return allowed >= set(node_ids)
 
-    return has_access
+
+@functools.cache
+def node_owner_stmt() -> Select:
+    """Owner type, ID and name (username or group name) of `:node_id`"""
+    from papermerge.core.features.users.db.orm import User
+
+    return (
+        select(
+            Ownership.owner_type,
+            Ownership.owner_id,
+            func.coalesce(User.username, Group.name).label("name"),
+        )
+        .select_from(Ownership)
+        .outerjoin(
+            User,
+            and_(
+                Ownership.owner_type == OwnerType.USER.value,
+                User.id == Ownership.owner_id,
+            ),
+        )
+        .outerjoin(
+            Group,
+            and_(
+                Ownership.owner_type == OwnerType.GROUP.value,
+                Group.id == Ownership.owner_id,
+            ),
+        )
+        .where(
+            Ownership.resource_type == ResourceType.NODE.value,
+            Ownership.resource_id == bindparam("node_id"),
+        )
+    )
 
 
 async def get_node_owner(db_session: AsyncSession, node_id: UUID) -> OwnedBy:
@@ -283,18 +514,14 @@ async def get_node_owner(db_session: AsyncSession, node_id: UUID) -> OwnedBy:
 
     Returns OwnedBy schema with owner information.
     """
+    row = (
+        await db_session.execute(node_owner_stmt(), {"node_id": node_id})
+    ).one_or_none()
 
-    # Use the ownership API helper function
-    owner = await ownership_api.get_owner_details(
-        session=db_session,
-        resource_type=ResourceType.NODE,
-        resource_id=node_id
-    )
-
-    if owner is None:
+    if row is None or row.name is None:
         raise ValueError(f"No owner found for node {node_id}")
 
-    return owner
+    return OwnedBy(id=row.owner_id, name=row.name, type=OwnerType(row.owner_type))
 
 
 def build_access_control_condition(user_id: UUID):
@@ -1,9 +1,12 @@
 import logging
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.pool import NullPool
 
 from papermerge.core.config import settings
+from papermerge.core import metrics
+from papermerge.core.db import replicas
 
 logger = logging.getLogger(__name__)
 
@@ -12,18 +15,90 @@ connect_args = {}
 if settings.db_ssl:
     connect_args["ssl"] = "require"
 
-engine = create_async_engine(
-    settings.async_db_url,
-    poolclass=NullPool,
-    connect_args=connect_args
-)
+
+def _create_engine(url: str):
+    _engine = create_async_engine(
+        url,
+        poolclass=NullPool,
+        connect_args=connect_args
+    )
+
+    metrics.instrument_engine(_engine)
+
+    if settings.sql_instrumentation:
+        from papermerge.core.db import instrumentation
+
+        instrumentation.install(_engine)
+
+    return _engine
+
+
+engine = _create_engine(settings.async_db_url)
 
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
-async def get_db():
+replica_router: replicas.ReplicaRouter | None = None
+if settings.async_db_replica_urls:
+    from papermerge.core.cache import get_shared_async_cache
+
+    replica_engines = [_create_engine(url) for url in settings.async_db_replica_urls]
+    replica_router = replicas.ReplicaRouter(
+        [
+            replicas.Replica(
+                url=url,
+                engine=replica_engine,
+                sessionmaker=async_sessionmaker(replica_engine, expire_on_commit=False),
+            )
+            for url, replica_engine in zip(settings.async_db_replica_urls, replica_engines)
+        ],
+        routing=settings.db_replica_routing,
+        max_lag=settings.db_replica_max_lag,
+        lag_check_interval=settings.db_replica_lag_check_interval,
+        read_your_writes=replicas.ReadYourWrites(
+            window=settings.db_read_your_writes_window,
+            # marks must be seen by all processes (settings require Redis)
+            cache=get_shared_async_cache(),
+        ),
+    )
+    replicas.track_writers(replica_router.read_your_writes)
+
+
+async def get_db(request: Request):
+    """Session on the primary
+
+    Writes are marked for read your writes (see `db.replicas`) on
+    commit, on behalf of the `AsyncAuditContext` user or else of the
+    authenticated user of the request.
+    """
     async with AsyncSessionLocal() as session:
+        session.info["request_state"] = request.state
         yield session
 
 
+async def get_db_readonly(request: Request):
+    """Session for read-only endpoints
+
+    On a read replica if there are any (see `db.replicas`), otherwise on
+    the primary. Endpoints must not write using this session. The user
+    (for read your writes) is taken from `request.state.user_id`, set by
+    authentication; declare the user dependency before the session.
+    """
+    replica = None
+    if replica_router is not None:
+        replica = await replica_router.choose(getattr(request.state, "user_id", None))
+
+    if replica is None:
+        async with AsyncSessionLocal() as session:
+            yield session
+        return
+
+    replica.active += 1
+    try:
+        async with replica.sessionmaker() as session:
+            yield session
+    finally:
+        replica.active -= 1
+
+
 def get_engine():
     return engine
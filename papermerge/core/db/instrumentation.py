@@ -0,0 +1,167 @@
+"""Per-request SQL instrumentation (opt-in, `PM_SQL_INSTRUMENTATION=true`)
+
+Engine level ``before/after_cursor_execute`` listeners record every
+statement into the ``QueryStats`` of the current request (a context
+variable set by ``SQLInstrumentationMiddleware``). At the end of the
+request the middleware:
+
+- adds ``Server-Timing`` response header (``db`` and ``app`` metrics)
+- logs one structured line with query count, DB time and the slowest
+  statements
+- warns about N+1 patterns i.e. same statement shape executed more than
+  ``PM_SQL_NPLUS1_THRESHOLD`` times within the request
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+
+from papermerge.core import config
+
+settings = config.get_settings()
+logger = logging.getLogger(__name__)
+
+_current_stats: ContextVar["QueryStats | None"] = ContextVar(
+    "pm_sql_query_stats", default=None
+)
+
+_WHITESPACE = re.compile(r"\s+")
+# positional bind params ($1, %(name)s, ?) and lists of them e.g. IN (...)
+_PARAMS = re.compile(r"(\$\d+|%\(\w+\)s|\?)(\s*,\s*(\$\d+|%\(\w+\)s|\?))*")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement text with parameters and literals collapsed to `?`"""
+    shape = _PARAMS.sub("?", statement)
+    shape = _LITERALS.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class QueryStats:
+    slowest_count: int = 3
+    count: int = 0
+    total_time: float = 0  # seconds
+    shapes: Counter = field(default_factory=Counter)
+    # list of (duration, statement), longest first
+    slowest: list[tuple[float, str]] = field(default_factory=list)
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.total_time += duration
+        self.shapes[statement_shape(statement)] += 1
+
+        if (
+            len(self.slowest) < self.slowest_count
+            or duration > self.slowest[-1][0]
+        ):
+            self.slowest.append((duration, statement))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[self.slowest_count:]
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count > threshold
+        ]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("pm_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+
+    starts = conn.info.get("pm_query_start")
+    if not starts:
+        return
+
+    stats.record(statement, time.perf_counter() - starts.pop())
+
+
+def install(engine) -> None:
+    """Registers instrumentation listeners on (async or sync) engine"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class SQLInstrumentationMiddleware:
+    """Collects SQL stats of each HTTP request (pure ASGI middleware)"""
+
+    def __init__(
+        self,
+        app,
+        nplus1_threshold: int | None = None,
+        slowest_count: int | None = None,
+    ):
+        self.app = app
+        self.nplus1_threshold = nplus1_threshold or settings.sql_nplus1_threshold
+        self.slowest_count = slowest_count or settings.sql_slowest_count
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(slowest_count=self.slowest_count)
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                app_time = time.perf_counter() - started
+                header = (
+                    f'db;dur={stats.total_time * 1000:.1f};desc="{stats.count} queries", '
+                    f"app;dur={app_time * 1000:.1f}"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", header.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+            self._report(scope, stats, time.perf_counter() - started)
+
+    def _report(self, scope, stats: QueryStats, elapsed: float):
+        route = scope.get("route")
+        route_path = getattr(route, "path", scope.get("path"))
+        endpoint = f"{scope.get('method')} {route_path}"
+
+        logger.info(
+            f"{endpoint} sql_count={stats.count} "
+            f"sql_time_ms={stats.total_time * 1000:.1f} "
+            f"total_ms={elapsed * 1000:.1f}",
+            extra={
+                "endpoint": endpoint,
+                "sql_count": stats.count,
+                "sql_time_ms": round(stats.total_time * 1000, 1),
+                "total_ms": round(elapsed * 1000, 1),
+                "sql_slowest": [
+                    {"ms": round(duration * 1000, 1), "statement": statement}
+                    for duration, statement in stats.slowest
+                ],
+            },
+        )
+
+        for shape, count in stats.repeated_shapes(self.nplus1_threshold):
+            logger.warning(
+                f"Possible N+1 in {endpoint}: statement executed {count} times: "
+                f"{shape[:500]}"
+            )
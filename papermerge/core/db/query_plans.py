@@ -0,0 +1,214 @@
+"""Query plan checks
+
+Helpers to capture SQL statements issued by dbapi functions, run
+``EXPLAIN (FORMAT JSON)`` on them and detect plan regressions:
+sequential scans on large tables and plans exceeding a cost budget.
+
+Test databases are small, so the planner legitimately prefers
+sequential scans there; index usage is checked with ``enable_seqscan``
+turned off - if a sequential scan is still in the plan, there is no
+index which could serve the query.
+
+Also finds, in the installed schema, foreign keys without supporting
+index and indexes declared on models but not created by migrations
+(see ``pm db missing-indexes``).
+"""
+import json
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Tables which grow with the number of documents
+LARGE_TABLES = frozenset({
+    "nodes",
+    "documents",
+    "document_versions",
+    "pages",
+    "nodes_tags",
+    "ownerships",
+    "custom_field_values",
+    "shared_nodes",
+    "audit_log",
+    "document_search_index",
+})
+
+# Foreign keys to `users` present on almost every table; they matter only
+# when users are deleted
+AUDIT_COLUMNS = frozenset({"created_by", "updated_by", "deleted_by", "archived_by"})
+
+
+@dataclass
+class CapturedStatement:
+    statement: str
+    parameters: Any
+
+
+@dataclass
+class PlanReport:
+    statement: str
+    total_cost: float
+    seq_scans: list[str] = field(default_factory=list)
+
+
+@dataclass
+class MissingIndex:
+    table_name: str
+    constraint_name: str
+    columns: list[str]
+    estimated_rows: int
+
+    @property
+    def create_statement(self) -> str:
+        columns = "_".join(self.columns)
+        return (
+            f"CREATE INDEX CONCURRENTLY idx_{self.table_name}_{columns} "
+            f"ON {self.table_name} ({', '.join(self.columns)});"
+        )
+
+
+@asynccontextmanager
+async def capture_statements(db_session: AsyncSession):
+    """Collects SELECT statements executed on `db_session` within the block
+
+    Usage:
+
+        async with capture_statements(db_session) as captured:
+            await get_paginated_nodes(db_session, ...)
+        for item in captured:
+            plan = await explain(db_session, item)
+    """
+    captured: list[CapturedStatement] = []
+    bind = db_session.get_bind()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            return
+        captured.append(CapturedStatement(statement, parameters))
+
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+
+async def explain(
+    db_session: AsyncSession,
+    captured: CapturedStatement,
+    enable_seqscan: bool = True,
+) -> dict:
+    """Returns top plan node of ``EXPLAIN (FORMAT JSON)`` of the statement"""
+    conn = await db_session.connection()
+    if not enable_seqscan:
+        await conn.execute(text("SET LOCAL enable_seqscan = off"))
+    try:
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {captured.statement}",
+            captured.parameters,
+        )
+        value = result.scalar()
+    finally:
+        if not enable_seqscan:
+            await conn.execute(text("SET LOCAL enable_seqscan = on"))
+
+    if isinstance(value, str):
+        value = json.loads(value)
+
+    return value[0]["Plan"]
+
+
+def iter_plan_nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from iter_plan_nodes(child)
+
+
+def seq_scans(plan: dict, tables=LARGE_TABLES) -> list[str]:
+    """Names of `tables` read by sequential scan in the plan"""
+    return [
+        node["Relation Name"]
+        for node in iter_plan_nodes(plan)
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in tables
+    ]
+
+
+async def check_statements(
+    db_session: AsyncSession,
+    captured: list[CapturedStatement],
+    enable_seqscan: bool = True,
+    tables=LARGE_TABLES,
+) -> list[PlanReport]:
+    reports = []
+    for item in captured:
+        plan = await explain(db_session, item, enable_seqscan=enable_seqscan)
+        reports.append(
+            PlanReport(
+                statement=item.statement,
+                total_cost=plan["Total Cost"],
+                seq_scans=seq_scans(plan, tables),
+            )
+        )
+
+    return reports
+
+
+MISSING_INDEXES_SQL = """
+SELECT
+    c.conrelid::regclass::text AS table_name,
+    c.conname AS constraint_name,
+    array_agg(a.attname ORDER BY k.ord) AS columns,
+    max(t.reltuples)::bigint AS estimated_rows
+FROM pg_constraint c
+JOIN pg_class t ON t.oid = c.conrelid
+CROSS JOIN LATERAL unnest(c.conkey) WITH ORDINALITY AS k(attnum, ord)
+JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum
+WHERE c.contype = 'f'
+  AND t.relnamespace = current_schema()::regnamespace
+  AND NOT EXISTS (
+      -- index whose leading columns are the foreign key columns
+      SELECT 1 FROM pg_index i
+      WHERE i.indrelid = c.conrelid
+        AND (i.indkey::int2[])[0:cardinality(c.conkey) - 1] @> c.conkey
+        AND (i.indkey::int2[])[0:cardinality(c.conkey) - 1] <@ c.conkey
+  )
+GROUP BY c.conrelid, c.conname
+ORDER BY max(t.reltuples) DESC, 1, 2
+"""
+
+
+async def get_missing_indexes(
+    db_session: AsyncSession,
+    include_audit_columns: bool = False,
+) -> list[MissingIndex]:
+    """Foreign keys of the installed schema without supporting index"""
+    result = await db_session.execute(text(MISSING_INDEXES_SQL))
+
+    return [
+        MissingIndex(
+            table_name=row.table_name,
+            constraint_name=row.constraint_name,
+            columns=list(row.columns),
+            estimated_rows=max(row.estimated_rows, 0),
+        )
+        for row in result
+        if include_audit_columns or not set(row.columns) <= AUDIT_COLUMNS
+    ]
+
+
+async def get_missing_model_indexes(db_session: AsyncSession) -> list[tuple[str, str]]:
+    """(table name, index name) of model indexes absent in installed schema"""
+    from papermerge.core import orm  # noqa: F401 - registers all models
+    from papermerge.core.db.base import Base
+
+    stmt = text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")
+    installed = set((await db_session.execute(stmt)).scalars())
+
+    return sorted(
+        (table.name, index.name)
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+        if index.name not in installed
+    )
@@ -0,0 +1,229 @@
+"""Read replicas
+
+Read-only endpoints (see `engine.get_db_readonly`) run their queries on
+Postgres streaming replicas listed in `PM_DB_REPLICA_URLS`; everything
+else uses the primary.
+
+A replica is chosen round robin or by the least number of sessions this
+process has open on it (`PM_DB_REPLICA_ROUTING`). Replicas lagging
+behind the primary more than `PM_DB_REPLICA_MAX_LAG` seconds, or not
+reachable, are skipped until their next lag check; with no usable
+replica reads go to the primary.
+
+Read your writes: when a session commits changes made on behalf of a
+user, reads of that user go to the primary for
+`PM_DB_READ_YOUR_WRITES_WINDOW` seconds. The user is the one of the
+`AsyncAuditContext` the changes are made in or, failing that, the
+authenticated user of the request (`engine.get_db`). The mark is set
+in the process as part of the commit, i.e. before the response is sent,
+and also in Redis (`cache.get_shared_async_cache`; settings require
+`PM_REDIS_URL` with replicas) so that it is shared by all processes.
+"""
+import asyncio
+import itertools
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Seconds since last replayed transaction; 0 if replica has replayed
+# everything it received (idle primary) or if it is not a replica at all
+LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+            OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(
+            extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+""")
+# Max number of users with read your writes marks kept in the process
+MAX_LOCAL_MARKS = 10000
+
+
+@dataclass
+class Replica:
+    url: str
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker
+    # sessions currently open on the replica (this process only)
+    active: int = 0
+    # seconds; None if the replica could not be reached
+    lag: float | None = None
+    lag_checked_at: float = field(default=-math.inf)
+
+    def __str__(self):
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReadYourWrites:
+    def __init__(self, window: float, cache=None):
+        self.window = window
+        self.cache = cache
+        # user ID -> time.monotonic() until which user reads from primary
+        self._local: dict[UUID, float] = {}
+        # pending cache writes of `mark_soon`
+        self._tasks: set[asyncio.Task] = set()
+
+    def _key(self, user_id: UUID) -> str:
+        return f"db-primary:{user_id}"
+
+    def _mark_local(self, user_id: UUID) -> None:
+        now = time.monotonic()
+        if len(self._local) >= MAX_LOCAL_MARKS:
+            self._local = {
+                key: until for key, until in self._local.items() if until > now
+            }
+        self._local[user_id] = now + self.window
+
+    def _cached(self) -> bool:
+        return self.cache is not None and self.cache.enabled
+
+    async def mark(self, user_id: UUID) -> None:
+        if not self.window:
+            return
+
+        self._mark_local(user_id)
+        if self._cached():
+            await self.cache.set(self._key(user_id), True, ex=math.ceil(self.window))
+
+    def mark_soon(self, user_id: UUID) -> None:
+        """Like `mark`, for synchronous code (e.g. session events)
+
+        The mark is set in the process at once; the cache write runs as
+        a task of the current event loop.
+        """
+        if not self.window:
+            return
+
+        self._mark_local(user_id)
+        if not self._cached():
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(
+            self.cache.set(self._key(user_id), True, ex=math.ceil(self.window))
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def is_marked(self, user_id: UUID) -> bool:
+        until = self._local.get(user_id)
+        if until is not None and until > time.monotonic():
+            return True
+
+        if self.cache is not None and self.cache.enabled:
+            return bool(await self.cache.get(self._key(user_id), False))
+
+        return False
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        replicas: list[Replica],
+        routing: str = "round_robin",
+        max_lag: float = 5.0,
+        lag_check_interval: float = 10.0,
+        read_your_writes: ReadYourWrites | None = None,
+    ):
+        self.replicas = replicas
+        self.routing = routing
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self.read_your_writes = read_your_writes or ReadYourWrites(window=0)
+        self._counter = itertools.count()
+
+    def candidates(self) -> list[Replica]:
+        """Replicas in the order they should be tried"""
+        if self.routing == "least_connections":
+            return sorted(self.replicas, key=lambda replica: replica.active)
+
+        start = next(self._counter) % len(self.replicas)
+        return self.replicas[start:] + self.replicas[:start]
+
+    async def choose(self, user_id: UUID | None = None) -> Replica | None:
+        """Replica for next read-only session; None means use the primary"""
+        if user_id is not None and await self.read_your_writes.is_marked(user_id):
+            return None
+
+        for replica in self.candidates():
+            if time.monotonic() - replica.lag_checked_at >= self.lag_check_interval:
+                await self.check_lag(replica)
+            if replica.lag is not None and replica.lag <= self.max_lag:
+                return replica
+
+        return None
+
+    async def check_lag(self, replica: Replica) -> None:
+        # set first: concurrent requests don't check the same replica again
+        replica.lag_checked_at = time.monotonic()
+        try:
+            async with replica.engine.connect() as conn:
+                replica.lag = float(await conn.scalar(LAG_SQL))
+        except Exception as e:
+            logger.warning(f"Replica {replica} is not available: {e}")
+            replica.lag = None
+            return
+
+        if replica.lag > self.max_lag:
+            logger.warning(f"Replica {replica} lags {replica.lag:.1f}s behind primary")
+
+
+# marked by `_on_commit`; set by `track_writers`
+_read_your_writes: ReadYourWrites | None = None
+
+
+def _record_writer(session: Session) -> None:
+    audit_context = session.info.get("audit_context")
+    if audit_context is not None and audit_context.user_id:
+        session.info["writer_id"] = audit_context.user_id
+        return
+
+    # authenticated user of the request, see `engine.get_db`
+    request_state = session.info.get("request_state")
+    user_id = getattr(request_state, "user_id", None)
+    if user_id is not None:
+        session.info["writer_id"] = user_id
+
+
+def _on_flush(session: Session, flush_context) -> None:
+    _record_writer(session)
+
+
+def _on_orm_execute(orm_execute_state) -> None:
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        _record_writer(orm_execute_state.session)
+
+
+def _on_commit(session: Session) -> None:
+    writer_id = session.info.pop("writer_id", None)
+    if writer_id is not None and _read_your_writes is not None:
+        _read_your_writes.mark_soon(writer_id)
+
+
+def track_writers(read_your_writes: ReadYourWrites) -> None:
+    """Records (in `session.info`) on whose behalf sessions change data
+    and marks them in `read_your_writes` when the changes are committed
+    """
+    global _read_your_writes
+    _read_your_writes = read_your_writes
+
+    if not event.contains(Session, "after_flush", _on_flush):
+        event.listen(Session, "after_flush", _on_flush)
+        event.listen(Session, "do_orm_execute", _on_orm_execute)
+        event.listen(Session, "after_commit", _on_commit)
@@ -26,6 +26,7 @@ from .features.document.db.api import (
     update_doc_type,
     get_doc_ver_pages,
     get_docs_thumbnail_img_status,
+    get_docs_status,
     get_document_last_version,
     get_doc_versions_list,
     get_doc_version_download_url,
@@ -96,6 +97,7 @@ __all__ = [
     "get_docs_count_by_type",
     "save_upload_metadata",
     "get_docs_thumbnail_img_status",
+    "get_docs_status",
     "create_document_type",
     "get_document_types",
     "get_document_type",
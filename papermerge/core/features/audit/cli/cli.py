@@ -0,0 +1,115 @@
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from papermerge.core import config
+from papermerge.core.db.engine import AsyncSessionLocal
+from papermerge.core.features.audit.db import partitions
+from papermerge.core.utils.cli import async_command
+
+app = typer.Typer(help="Audit log partitions, retention and archival")
+console = Console()
+settings = config.get_settings()
+
+
+@app.command("partitions")
+@async_command
+async def partitions_cmd():
+    """List partitions of the audit log"""
+    async with AsyncSessionLocal() as db_session:
+        items = await partitions.list_partitions(db_session)
+
+    table = Table(title="audit_log partitions")
+    table.add_column("Partition", style="cyan")
+    table.add_column("Month")
+    table.add_column("Est. rows", justify="right")
+    table.add_column("Size MB", justify="right", style="green")
+    for item in items:
+        table.add_row(
+            item.name,
+            f"{item.month:%Y-%m}" if item.month else "-",
+            str(item.estimated_rows),
+            f"{item.size_bytes / 1024 / 1024:.1f}",
+        )
+    console.print(table)
+
+
+@app.command("ensure-partitions")
+@async_command
+async def ensure_partitions_cmd(
+    months_ahead: int = typer.Option(2, min=0, help="Create partitions this many months ahead"),
+):
+    """Create partitions for the current and next months
+
+    Run it regularly (e.g. daily from cron); rows without partition
+    end up in the default partition.
+    """
+    async with AsyncSessionLocal() as db_session:
+        created = await partitions.ensure_partitions(db_session, months_ahead)
+
+    for name in created:
+        console.print(f"Created [cyan]{name}[/cyan]")
+    if not created:
+        console.print("All partitions exist")
+
+
+@app.command("archive")
+@async_command
+async def archive_cmd(
+    name: str = typer.Argument(..., help="Partition name, e.g. audit_log_2025_01"),
+    output_dir: Path = typer.Option(Path("."), help="Directory of the archive file"),
+    drop: bool = typer.Option(False, help="Drop the partition after archiving"),
+):
+    """Export partition to gzip compressed JSON lines file"""
+    async with AsyncSessionLocal() as db_session:
+        try:
+            path = await partitions.archive_partition(db_session, name, output_dir)
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            raise typer.Exit(code=1)
+        console.print(f"Archived {name} to {path}")
+
+        if drop:
+            await partitions.drop_partition(db_session, name)
+            console.print(f"Dropped {name}")
+
+
+@app.command("retention")
+@async_command
+async def retention_cmd(
+    months: int = typer.Option(
+        settings.audit_log_retention_months,
+        min=0,
+        help="Keep this many full months (default PM_AUDIT_LOG_RETENTION_MONTHS)",
+    ),
+    archive_dir: Path | None = typer.Option(None, help="Archive partitions here first"),
+    detach: bool = typer.Option(False, help="Detach partitions instead of dropping them"),
+    dry_run: bool = typer.Option(False, help="Only list expired partitions"),
+):
+    """Remove audit log partitions older than the retention period"""
+    if months == 0:
+        console.print("Retention is not configured (0 months), nothing to do")
+        return
+
+    async with AsyncSessionLocal() as db_session:
+        expired = await partitions.expired_partitions(db_session, months)
+        for item in expired:
+            if dry_run:
+                console.print(f"Expired: [cyan]{item.name}[/cyan]")
+                continue
+
+            if archive_dir:
+                path = await partitions.archive_partition(db_session, item.name, archive_dir)
+                console.print(f"Archived {item.name} to {path}")
+
+            if detach:
+                await partitions.detach_partition(db_session, item.name)
+                console.print(f"Detached {item.name}")
+            else:
+                await partitions.drop_partition(db_session, item.name)
+                console.print(f"Dropped {item.name}")
+
+    if not expired:
+        console.print("No expired partitions")
@@ -4,13 +4,18 @@ import math
 from typing import Optional, Dict, Any
 from datetime import datetime
 
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, desc, asc, String as db_String
+from sqlalchemy import select, func, and_, or_, desc, asc
 
 from papermerge.core import schema, orm
+from papermerge.core.features.audit.db.orm import search_text
 
 logger = logging.getLogger(__name__)
 
+# Validates whole page of ORM rows in one call
+AUDIT_LOGS_ADAPTER = TypeAdapter(list[schema.AuditLog])
+
 ALLOWED_SORT_COLUMNS = {
     'timestamp', 'operation', 'table_name', 'username'
 }
@@ -25,6 +30,30 @@ ALLOWED_FILTER_COLUMNS = {
     'id'
 }
 
+def free_text_condition(value: str):
+    """Condition of the audit log search box
+
+    A UUID is looked up exactly in `id`, `record_id` and `user_id`
+    (each indexed); anything else is a case insensitive substring of
+    username, table name or operation, served by the trigram index on
+    `search_text`.
+    """
+    value = value.strip()
+    try:
+        uuid_value = uuid.UUID(value)
+    except ValueError:
+        uuid_value = None
+
+    if uuid_value is not None:
+        return or_(
+            orm.AuditLog.id == uuid_value,
+            orm.AuditLog.record_id == uuid_value,
+            orm.AuditLog.user_id == uuid_value,
+        )
+
+    return search_text.contains(value.lower(), autoescape=True)
+
+
 async def get_audit_log(
     db_session: AsyncSession,
     audit_log_id: uuid.UUID
@@ -70,16 +99,7 @@ async def get_audit_logs(
                 continue
 
             if column == "free_text":
-                filter_conditions.append(
-                    or_(
-                        func.cast(orm.AuditLog.record_id, db_String).ilike(f"%{value}%"),
-                        func.cast(orm.AuditLog.user_id, db_String).ilike(f"%{value}%"),
-                        func.cast(orm.AuditLog.id, db_String).ilike(f"%{value}%"),
-                        orm.AuditLog.username.ilike(f"%{value}%"),
-                        orm.AuditLog.table_name.ilike(f"%{value}%"),
-                        orm.AuditLog.operation.ilike(f"%{value}%")
-                    )
-                )
+                filter_conditions.append(free_text_condition(str(value)))
             elif column in ALLOWED_FILTER_COLUMNS:
                 column_attr = getattr(orm.AuditLog, column)
                 if operator == "in" and isinstance(value, list):
@@ -87,6 +107,8 @@ async def get_audit_logs(
                 elif operator == "in" and isinstance(value, str):
                     filter_conditions.append(column_attr.in_(value.split(",")))
                 elif column == "timestamp" and operator == "range" and isinstance(value, dict):
+                    # compared with the partition key as is, so that only
+                    # partitions of the range are scanned (listing and count)
                     if "from" in value and value["from"]:
                         try:
                             date_from = datetime.fromisoformat(value["from"].replace('Z', '+00:00'))
@@ -125,10 +147,7 @@ async def get_audit_logs(
 
     # Execute and return
     db_audit_logs = (await db_session.scalars(base_query)).all()
-    items = []
-    for db_audit_log in db_audit_logs:
-        item = schema.AuditLog.model_validate(db_audit_log)
-        items.append(item)
+    items = AUDIT_LOGS_ADAPTER.validate_python(db_audit_logs, from_attributes=True)
 
     total_pages = math.ceil(total_audit_logs / page_size) if total_audit_logs > 0 else 0
 
@@ -2,17 +2,34 @@ from typing import Optional
 from uuid import UUID
 import logging
 
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+# Transaction scoped (`is_local`) settings: they end with the transaction,
+# so no cleanup is needed and pooled connections never carry them over
+# to the next user
+AUDIT_CONTEXT_SQL = text("""
+    SELECT set_config('app.user_id', :user_id, true),
+           set_config('app.username', :username, true),
+           set_config('app.session_id', :session_id, true),
+           set_config('app.reason', :reason, true)
+""")
+
 
 class AsyncAuditContext:
     """
     Context manager for setting audit information that will be
     captured by PostgreSQL triggers.
+
+    Audit information is set, with one statement, at the beginning of
+    every transaction the session starts within the context (see
+    `_apply_audit_context`), so that operations which commit several
+    times are audited correctly. If the session is already in a
+    transaction when the context is entered, it is set right away.
+    Settings last until the end of the transaction.
     """
     def __init__(
         self,
@@ -27,71 +44,37 @@ class AsyncAuditContext:
         self.username = username
         self.session_id = session_id
         self.reason = reason
-        self._context_set = False
+        self._previous = None
+
+    @property
+    def params(self) -> dict[str, str]:
+        # empty string is read as NULL by the triggers
+        return {
+            'user_id': str(self.user_id) if self.user_id else '',
+            'username': self.username or '',
+            'session_id': self.session_id or '',
+            'reason': self.reason or '',
+        }
 
     async def __aenter__(self):
-        # Set PostgreSQL session variables for triggers to use
-        sql = """
-        SELECT set_audit_context(
-            :user_id,
-            :username,
-            :session_id,
-            :reason
-        )
-        """
-        try:
-            await self.session.execute(text(sql), {
-                'user_id': self.user_id,
-                'username': self.username,
-                'session_id': self.session_id,
-                'reason': self.reason
-            })
-            self._context_set = True
-        except SQLAlchemyError as e:
-            logger.warning(f"Failed to set audit context: {e}")
-            self._context_set = False
+        self._previous = self.session.info.get("audit_context")
+        self.session.info["audit_context"] = self
+        if self.session.in_transaction():
+            # transaction is already begun, `after_begin` won't fire
+            await self.session.execute(AUDIT_CONTEXT_SQL, self.params)
 
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        # Only clear context if it was successfully set and session is still usable
-        if not self._context_set:
-            return
-
-        # Check if session is in a valid state
-        if not self._is_session_usable():
-            logger.warning("Session is not usable, skipping audit context cleanup")
-            return
-
-        try:
-            # Clear the context
-            await self.session.execute(text("""
-                SELECT set_config('app.user_id', '', false),
-                       set_config('app.username', '', false),
-                       set_config('app.session_id', '', false),
-                       set_config('app.reason', '', false)
-            """))
-            logger.debug("Cleared audit context")
-        except SQLAlchemyError as e:
-            # Don't raise exceptions during cleanup, just log them
-            logger.warning(f"Failed to clear audit context: {e}")
-
-    def _is_session_usable(self) -> bool:
-        """
-        Check if the session is in a usable state.
-        Returns False if the session has been rolled back or is otherwise unusable.
-        """
-        try:
-            # Check session state - if it's not active or has been rolled back, we can't use it
-            if not self.session.is_active:
-                return False
+        if self._previous is not None:
+            self.session.info["audit_context"] = self._previous
+        else:
+            self.session.info.pop("audit_context", None)
 
-            # Check if there's a pending rollback
-            if hasattr(self.session, '_transaction') and self.session._transaction:
-                if hasattr(self.session._transaction, '_rollback_exception'):
-                    return False
 
-            return True
-        except Exception:
-            # If we can't determine the state, assume it's not usable
-            return False
+@event.listens_for(Session, "after_begin")
+def _apply_audit_context(session: Session, transaction, connection) -> None:
+    """Sets audit context of the session in each new transaction"""
+    audit_context = session.info.get("audit_context")
+    if audit_context is not None:
+        connection.execute(AUDIT_CONTEXT_SQL, audit_context.params)
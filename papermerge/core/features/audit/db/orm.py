@@ -2,7 +2,7 @@ from uuid import UUID
 from datetime import datetime
 from typing import Optional, Dict, Any
 
-from sqlalchemy import func, String, Text, Index
+from sqlalchemy import DDL, event, func, literal_column, String, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import TIMESTAMP, JSONB, UUID as PG_UUID
 
@@ -14,6 +14,10 @@ class AuditLog(Base):
     """
     Universal audit table for tracking all changes across audited tables.
     Works with both trigger-based and application-level auditing.
+
+    Partitioned by month on `timestamp` (partitions `audit_log_YYYY_MM`,
+    see `audit.db.partitions`); rows outside of all monthly partitions
+    land in `audit_log_default`.
     """
     __tablename__ = 'audit_log'
 
@@ -25,9 +29,10 @@ class AuditLog(Base):
     record_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)  # ID of the affected record
     operation: Mapped[AuditOperation] = mapped_column(String(10), nullable=False)
 
-    # When
+    # When (partition key, hence part of the primary key)
     timestamp: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
+        primary_key=True,
         server_default=func.now(),
         nullable=False
     )
@@ -57,12 +62,45 @@ class AuditLog(Base):
         Index('idx_audit_log_timestamp', 'timestamp'),
         Index('idx_audit_log_user_id', 'user_id'),
         Index('idx_audit_log_operation', 'operation'),
+        Index('idx_audit_log_record_id', 'record_id'),
+        {'postgresql_partition_by': 'RANGE ("timestamp")'},
     )
 
     def __str__(self):
         return f"AuditLog(id={self.id}, username={self.username})"
 
 
+# Username, table name and operation as one lowercase string; searched
+# by substring (free text filter) using the trigram index below. Queries
+# must use this very expression (constants inlined, not bound) for the
+# planner to pick the index.
+search_text = func.lower(
+    func.coalesce(AuditLog.username, literal_column("''"))
+    + literal_column("' '")
+    + AuditLog.table_name
+    + literal_column("' '")
+    + AuditLog.operation
+)
+
+Index(
+    'idx_audit_log_search_trgm',
+    search_text.label('search_text'),
+    postgresql_using='gin',
+    postgresql_ops={'search_text': 'gin_trgm_ops'},
+)
+
+event.listen(
+    AuditLog.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
+event.listen(
+    AuditLog.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS audit_log_default PARTITION OF audit_log DEFAULT"),
+)
+
+
 # Helper function to determine what fields changed
 def get_changed_fields(old_record: dict, new_record: dict) -> tuple[list[str], dict, dict]:
     """
@@ -0,0 +1,222 @@
+"""Monthly partitions of `audit_log`
+
+Partitions are named `audit_log_YYYY_MM` and cover one calendar month
+(UTC). Rows outside of all monthly partitions land in
+`audit_log_default`; creating a partition moves its rows out of the
+default partition.
+
+Old partitions are archived to gzip compressed JSON lines files and
+then dropped, or only detached (the table stays, but is no longer part
+of `audit_log`).
+"""
+import gzip
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARTITION = "audit_log_default"
+PARTITION_NAME_RE = re.compile(r"^audit_log_(\d{4})_(\d{2})$")
+
+
+@dataclass
+class AuditLogPartition:
+    name: str
+    # first day of the month; None for the default partition
+    month: date | None
+    estimated_rows: int
+    size_bytes: int
+
+
+def partition_name(month: date) -> str:
+    return f"audit_log_{month:%Y_%m}"
+
+
+def month_of(name: str) -> date:
+    """First day of the month covered by partition `name`
+
+    Raises ``ValueError`` if `name` is not a monthly partition name.
+    """
+    match = PARTITION_NAME_RE.match(name)
+    if match is None:
+        raise ValueError(f"{name} is not an audit_log monthly partition")
+
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_bounds(month: date) -> tuple[datetime, datetime]:
+    start = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    end_month = add_months(month, 1)
+    end = datetime(end_month.year, end_month.month, 1, tzinfo=timezone.utc)
+
+    return start, end
+
+
+def current_month(today: date | None = None) -> date:
+    today = today or datetime.now(timezone.utc).date()
+    return today.replace(day=1)
+
+
+async def list_partitions(db_session: AsyncSession) -> list[AuditLogPartition]:
+    """Partitions attached to `audit_log`, ordered by month"""
+    stmt = text(
+        "SELECT c.relname AS name, "
+        "  greatest(c.reltuples, 0)::bigint AS estimated_rows, "
+        "  pg_total_relation_size(c.oid) AS size_bytes "
+        "FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'audit_log'::regclass "
+        "ORDER BY c.relname"
+    )
+    result = []
+    for row in await db_session.execute(stmt):
+        result.append(
+            AuditLogPartition(
+                name=row.name,
+                month=None if row.name == DEFAULT_PARTITION else month_of(row.name),
+                estimated_rows=row.estimated_rows,
+                size_bytes=row.size_bytes,
+            )
+        )
+
+    return result
+
+
+async def create_partition(db_session: AsyncSession, month: date) -> str | None:
+    """Creates partition for `month`; returns its name
+
+    Returns None if the partition already exists. Rows of the month which
+    are in the default partition are moved to the new partition.
+
+    The default partition is locked (EXCLUSIVE mode, reads still work)
+    until the end of the transaction: rows of the month inserted between
+    the move and ATTACH PARTITION would make the latter fail. Concurrent
+    audit writes falling into the default partition wait meanwhile.
+    """
+    name = partition_name(month)
+    exists = await db_session.scalar(
+        text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}
+    )
+    if exists:
+        return None
+
+    start, end = month_bounds(month)
+    params = {"start": start, "end": end}
+    await db_session.execute(
+        text(f"LOCK TABLE {DEFAULT_PARTITION} IN EXCLUSIVE MODE")
+    )
+    # Created standalone and attached afterwards: creating it directly
+    # as partition fails if default partition has rows of the month
+    await db_session.execute(
+        text(f'CREATE TABLE "{name}" (LIKE audit_log INCLUDING DEFAULTS)')
+    )
+    await db_session.execute(
+        text(
+            f"WITH moved AS ("
+            f"  DELETE FROM {DEFAULT_PARTITION} "
+            f'  WHERE "timestamp" >= :start AND "timestamp" < :end '
+            f"  RETURNING *"
+            f') INSERT INTO "{name}" SELECT * FROM moved'
+        ),
+        params,
+    )
+    # DDL does not accept bind parameters
+    await db_session.execute(
+        text(
+            f'ALTER TABLE audit_log ATTACH PARTITION "{name}" '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    )
+    logger.info(f"Created audit_log partition {name}")
+
+    return name
+
+
+async def ensure_partitions(
+    db_session: AsyncSession,
+    months_ahead: int = 2,
+    today: date | None = None,
+) -> list[str]:
+    """Creates partitions for current month and `months_ahead` next months
+
+    Returns names of the created partitions.
+    """
+    month = current_month(today)
+    created = []
+    for offset in range(months_ahead + 1):
+        name = await create_partition(db_session, add_months(month, offset))
+        if name:
+            created.append(name)
+
+    await db_session.commit()
+
+    return created
+
+
+async def expired_partitions(
+    db_session: AsyncSession,
+    retention_months: int,
+    today: date | None = None,
+) -> list[AuditLogPartition]:
+    """Partitions entirely older than `retention_months` full months
+
+    With `retention_months=3` in May, partitions of January and older
+    are expired (February, March and April are kept, as is May).
+    """
+    cutoff = add_months(current_month(today), -retention_months)
+
+    return [
+        partition
+        for partition in await list_partitions(db_session)
+        if partition.month is not None and partition.month < cutoff
+    ]
+
+
+async def archive_partition(
+    db_session: AsyncSession,
+    name: str,
+    output_dir: Path,
+    chunk_size: int = 1000,
+) -> Path:
+    """Writes rows of partition `name` to `output_dir/<name>.jsonl.gz`
+
+    One JSON object per line, same keys as `audit_log` columns.
+    """
+    month_of(name)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"{name}.jsonl.gz"
+    tmp_path = path.with_suffix(".tmp")
+
+    stmt = text(f'SELECT row_to_json(p)::text FROM "{name}" p ORDER BY "timestamp"')
+    result = await db_session.stream(stmt, execution_options={"yield_per": chunk_size})
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        async for (line,) in result:
+            f.write(line)
+            f.write("\n")
+
+    tmp_path.replace(path)
+
+    return path
+
+
+async def detach_partition(db_session: AsyncSession, name: str) -> None:
+    month_of(name)
+    await db_session.execute(text(f'ALTER TABLE audit_log DETACH PARTITION "{name}"'))
+    await db_session.commit()
+
+
+async def drop_partition(db_session: AsyncSession, name: str) -> None:
+    month_of(name)
+    await db_session.execute(text(f'DROP TABLE "{name}"'))
+    await db_session.commit()
@@ -2,14 +2,15 @@ import logging
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Security
+from fastapi import APIRouter, Depends, HTTPException, Response, Security
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from papermerge.core import utils, schema, dbapi
 from papermerge.core.features.auth import get_current_user
 from papermerge.core.features.auth import scopes
-from papermerge.core.db.engine import get_db
+from papermerge.core.db.engine import get_db_readonly
+from papermerge.core.routers.common import model_response
 from .schema import AuditLogParams
 
 router = APIRouter(
@@ -25,8 +26,8 @@ logger = logging.getLogger(__name__)
 async def get_audit_logs(
     user: Annotated[schema.User, Security(get_current_user, scopes=[scopes.AUDIT_LOG_VIEW])],
     params: AuditLogParams = Depends(),
-    db_session: AsyncSession = Depends(get_db),
-) -> schema.PaginatedResponse[schema.AuditLog]:
+    db_session: AsyncSession = Depends(get_db_readonly),
+) -> Response:
     """Get paginated audit logs
 
     Required scope: `{scope}`
@@ -51,7 +52,7 @@ async def get_audit_logs(
         )
         raise HTTPException(status_code=500, detail="Internal server error")
 
-    return result
+    return model_response(result)
 
 
 @router.get("/{audit_log_id}", response_model=schema.AuditLogDetails)
@@ -59,7 +60,7 @@ async def get_audit_logs(
 async def get_audit_log(
     audit_log_id: uuid.UUID,
     user: Annotated[schema.User, Security(get_current_user, scopes=[scopes.AUDIT_LOG_VIEW])],
-    db_session: AsyncSession = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db_readonly),
 ) -> schema.AuditLogDetails:
     """Get audit log entry details
 
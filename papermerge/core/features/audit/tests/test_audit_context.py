@@ -0,0 +1,34 @@
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from papermerge.core.db.engine import engine
+from papermerge.core.features.audit.db.audit_context import AsyncAuditContext
+
+CURRENT_USER_SQL = text("SELECT current_setting('app.username', true)")
+
+
+async def test_context_applied_in_current_transaction(db_session: AsyncSession):
+    # session is already in transaction
+    await db_session.execute(text("SELECT 1"))
+
+    async with AsyncAuditContext(db_session, user_id=uuid.uuid4(), username="anna"):
+        assert await db_session.scalar(CURRENT_USER_SQL) == "anna"
+
+
+async def test_context_applied_in_every_transaction():
+    user_id = uuid.uuid4()
+    async with AsyncSession(engine) as session:
+        async with AsyncAuditContext(session, user_id=user_id, username="bert"):
+            assert await session.scalar(CURRENT_USER_SQL) == "bert"
+            await session.commit()
+            # new transaction (and possibly new connection)
+            assert await session.scalar(CURRENT_USER_SQL) == "bert"
+            assert await session.scalar(
+                text("SELECT current_setting('app.user_id', true)")
+            ) == str(user_id)
+            await session.commit()
+
+        # settings ended with the transaction
+        assert await session.scalar(CURRENT_USER_SQL) in (None, "")
@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from papermerge.core import orm
+from papermerge.core.db import query_plans
+from papermerge.core.features.audit.db import api as audit_dbapi
+
+
+async def insert_audit_rows(db_session: AsyncSession) -> list[dict]:
+    rows = [
+        dict(
+            id=uuid.uuid4(),
+            table_name=table_name,
+            record_id=uuid.uuid4(),
+            operation=operation,
+            user_id=uuid.uuid4(),
+            username=username,
+            timestamp=datetime.now(timezone.utc),
+        )
+        for table_name, operation, username in [
+            ("nodes", "INSERT", "Alice"),
+            ("tags", "UPDATE", "bob"),
+            ("users", "DELETE", "alice_100%"),
+        ]
+    ]
+    await db_session.execute(insert(orm.AuditLog), rows)
+
+    return rows
+
+
+async def search(db_session: AsyncSession, value: str):
+    result = await audit_dbapi.get_audit_logs(
+        db_session,
+        page_size=10,
+        page_number=1,
+        filters={"free_text": {"value": value}},
+    )
+    return sorted(item.username for item in result.items)
+
+
+async def test_free_text_search(db_session: AsyncSession):
+    rows = await insert_audit_rows(db_session)
+
+    assert await search(db_session, "ALIC") == ["Alice", "alice_100%"]
+    assert await search(db_session, "update") == ["bob"]
+    assert await search(db_session, "100%") == ["alice_100%"]
+    assert await search(db_session, "_1") == ["alice_100%"]
+    assert await search(db_session, str(rows[1]["record_id"])) == ["bob"]
+    assert await search(db_session, str(rows[2]["user_id"])) == ["alice_100%"]
+
+
+async def test_free_text_search_uses_indexes(db_session: AsyncSession):
+    await insert_audit_rows(db_session)
+
+    for value in ("alice", str(uuid.uuid4())):
+        async with query_plans.capture_statements(db_session) as captured:
+            await search(db_session, value)
+
+        reports = await query_plans.check_statements(
+            db_session,
+            captured,
+            enable_seqscan=False,
+            tables={"audit_log", "audit_log_default"},
+        )
+        for report in reports:
+            assert report.seq_scans == [], report.statement
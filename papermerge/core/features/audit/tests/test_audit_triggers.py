@@ -0,0 +1,85 @@
+import hashlib
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from papermerge.core import orm
+
+SQL_DIR = Path(__file__).parent.parent.parent.parent / "alembic" / "sql"
+
+
+@pytest.fixture
+async def audit_triggers(db_session: AsyncSession):
+    """Installs statement level audit triggers (rolled back with the test)"""
+    conn = await db_session.connection()
+    await conn.execute(text("SELECT 1"))
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.execute(
+        (SQL_DIR / "audit_statement_triggers_up.sql").read_text()
+    )
+
+
+async def get_audit_rows(db_session: AsyncSession, table_name: str):
+    stmt = (
+        select(orm.AuditLog)
+        .where(orm.AuditLog.table_name == table_name)
+        .order_by(orm.AuditLog.timestamp)
+    )
+    return (await db_session.scalars(stmt)).all()
+
+
+async def test_document_version_text_is_hashed(
+    db_session: AsyncSession, make_document, user, audit_triggers
+):
+    doc = await make_document(title="invoice.pdf", user=user, parent=user.home_folder)
+    doc_ver_id = doc.versions[0].id
+    ocr_text = "lorem ipsum " * 1000
+
+    await db_session.execute(
+        update(orm.DocumentVersion)
+        .where(orm.DocumentVersion.id == doc_ver_id)
+        .values(text=ocr_text)
+    )
+
+    rows = [
+        row
+        for row in await get_audit_rows(db_session, "document_versions")
+        if row.operation == "UPDATE"
+    ]
+    assert len(rows) == 1
+    assert rows[0].record_id == doc_ver_id
+    assert rows[0].changed_fields == ["text"]
+    assert rows[0].old_values["text"] is None
+    assert rows[0].new_values["text"] == (
+        "md5:" + hashlib.md5(ocr_text.encode()).hexdigest()
+    )
+
+
+async def test_one_statement_audits_all_rows(
+    db_session: AsyncSession, make_folder, user, audit_triggers
+):
+    folders = [
+        await make_folder(title=f"folder {i}", user=user, parent=user.home_folder)
+        for i in range(3)
+    ]
+    folder_ids = [folder.id for folder in folders]
+
+    await db_session.execute(
+        update(orm.Node)
+        .where(orm.Node.id.in_(folder_ids))
+        .values(title=orm.Node.title + " (renamed)")
+    )
+    # no audited column changes: not audited
+    await db_session.execute(
+        update(orm.Node).where(orm.Node.id.in_(folder_ids)).values(title=orm.Node.title)
+    )
+
+    rows = [
+        row
+        for row in await get_audit_rows(db_session, "nodes")
+        if row.operation == "UPDATE"
+    ]
+    assert sorted(row.record_id for row in rows) == sorted(folder_ids)
+    assert all(row.changed_fields == ["title"] for row in rows)
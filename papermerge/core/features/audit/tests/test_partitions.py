@@ -0,0 +1,125 @@
+import gzip
+import json
+import uuid
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from papermerge.core import orm
+from papermerge.core.db import query_plans
+from papermerge.core.features.audit.db import api as audit_dbapi
+from papermerge.core.features.audit.db import partitions
+
+
+async def insert_audit_row(db_session: AsyncSession, timestamp: datetime) -> uuid.UUID:
+    audit_id = uuid.uuid4()
+    await db_session.execute(
+        insert(orm.AuditLog).values(
+            id=audit_id,
+            table_name="nodes",
+            record_id=uuid.uuid4(),
+            operation="INSERT",
+            timestamp=timestamp,
+        )
+    )
+    return audit_id
+
+
+async def partition_of(db_session: AsyncSession, audit_id: uuid.UUID) -> str:
+    stmt = text("SELECT tableoid::regclass::text FROM audit_log WHERE id = :id")
+    return await db_session.scalar(stmt, {"id": audit_id})
+
+
+def test_month_helpers():
+    assert partitions.add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert partitions.add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+    assert partitions.month_of("audit_log_2025_02") == date(2025, 2, 1)
+    assert partitions.month_bounds(date(2025, 12, 1)) == (
+        datetime(2025, 12, 1, tzinfo=timezone.utc),
+        datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+async def test_create_partition_moves_rows_from_default(db_session: AsyncSession):
+    audit_id = await insert_audit_row(
+        db_session, datetime(2024, 3, 15, tzinfo=timezone.utc)
+    )
+    assert await partition_of(db_session, audit_id) == partitions.DEFAULT_PARTITION
+
+    name = await partitions.create_partition(db_session, date(2024, 3, 1))
+
+    assert name == "audit_log_2024_03"
+    assert await partition_of(db_session, audit_id) == name
+    # already exists
+    assert await partitions.create_partition(db_session, date(2024, 3, 1)) is None
+
+
+async def test_ensure_partitions_and_retention(db_session: AsyncSession):
+    created = await partitions.ensure_partitions(
+        db_session, months_ahead=1, today=date(2024, 5, 20)
+    )
+    assert created == ["audit_log_2024_05", "audit_log_2024_06"]
+    await partitions.create_partition(db_session, date(2024, 1, 1))
+    await partitions.create_partition(db_session, date(2024, 2, 1))
+
+    expired = await partitions.expired_partitions(
+        db_session, retention_months=3, today=date(2024, 5, 20)
+    )
+
+    assert [item.name for item in expired] == ["audit_log_2024_01"]
+
+
+async def test_archive_partition(db_session: AsyncSession, tmp_path: Path):
+    await partitions.create_partition(db_session, date(2024, 4, 1))
+    audit_id = await insert_audit_row(
+        db_session, datetime(2024, 4, 2, tzinfo=timezone.utc)
+    )
+
+    path = await partitions.archive_partition(db_session, "audit_log_2024_04", tmp_path)
+    await partitions.drop_partition(db_session, "audit_log_2024_04")
+
+    with gzip.open(path, "rt") as f:
+        rows = [json.loads(line) for line in f]
+    assert [row["id"] for row in rows] == [str(audit_id)]
+    count = await db_session.scalar(
+        select(orm.AuditLog.id).where(orm.AuditLog.id == audit_id)
+    )
+    assert count is None
+
+
+async def test_listing_with_timestamp_range_prunes_partitions(
+    db_session: AsyncSession,
+):
+    for month in (date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)):
+        await partitions.create_partition(db_session, month)
+        await insert_audit_row(
+            db_session, datetime(month.year, month.month, 10, tzinfo=timezone.utc)
+        )
+
+    async with query_plans.capture_statements(db_session) as captured:
+        result = await audit_dbapi.get_audit_logs(
+            db_session,
+            page_size=10,
+            page_number=1,
+            filters={
+                "timestamp": {
+                    "operator": "range",
+                    "value": {
+                        "from": "2024-02-01T00:00:00Z",
+                        "to": "2024-02-28T00:00:00Z",
+                    },
+                }
+            },
+        )
+
+    assert len(result.items) == 1
+    for item in captured:
+        plan = await query_plans.explain(db_session, item)
+        scanned = {
+            node["Relation Name"]
+            for node in query_plans.iter_plan_nodes(plan)
+            if "Relation Name" in node
+        }
+        assert scanned == {"audit_log_2024_02"}
@@ -331,4 +331,6 @@ async def get_current_user(
         raise exc.HTTP401Unauthorized()
 
     logger.debug(f"Authentication successful for user: {user.username}")
+    # read your writes routing of `get_db_readonly`
+    request.state.user_id = user.id
     return user
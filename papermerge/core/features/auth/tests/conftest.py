@@ -6,7 +6,7 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 from httpx import AsyncClient, ASGITransport
 
-from papermerge.core.db.engine import get_db
+from papermerge.core.db.engine import get_db, get_db_readonly
 from papermerge.core.tests import utils as test_utils
 
 
@@ -41,6 +41,7 @@ async def zitadel_login_as(db_session: AsyncSession):
     async def _make(email_address: str):
         app = test_utils.get_app_with_routes()
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_db_readonly] = override_get_db
 
         # note that `preferred_username` is missing
         payload = {
@@ -80,6 +81,7 @@ async def login_with_remote(db_session: AsyncSession):
     async def _make(headers):
         app = test_utils.get_app_with_routes()
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_db_readonly] = override_get_db
 
         transport = ASGITransport(app=app)
 
@@ -0,0 +1,159 @@
+"""Audit trigger overhead of OCR text updates
+
+Runs `update_text_field` on a new document version with many pages of a
+generated corpus document, with statement level audit triggers (current
+schema) and with the former row level triggers, and reports time and
+size of the audit rows written.
+
+Everything, including swapping the triggers, happens in a transaction
+which is rolled back - the database is left unchanged. Swapping
+triggers requires the database user to own the tables (same as for
+running migrations).
+"""
+import random
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from papermerge.core import const, orm
+from papermerge.core.features.benchmark import schema, suite
+from papermerge.core.features.benchmark.db.api import WORDS
+from papermerge.core.features.document.db import api as doc_dbapi
+
+MODES = ("statement", "row")
+
+SQL_DIR = Path(__file__).parent.parent.parent / "alembic" / "sql"
+# Same as downgrade of the statement level audit triggers migration
+ROW_LEVEL_SQL = ("audit_statement_triggers_down.sql", "audit_trigger_upgrade.sql")
+
+AUDIT_SIZE_SQL = text(
+    "SELECT count(*), COALESCE(sum(pg_column_size(a.*)), 0) "
+    "FROM audit_log a WHERE record_id = :record_id"
+)
+
+
+async def run(
+    engine: AsyncEngine,
+    prefix: str,
+    pages: int,
+    words_per_page: int,
+    iterations: int,
+) -> list[schema.AuditOverheadResult]:
+    async with AsyncSession(engine) as db_session:
+        ctx = await suite.load_context(db_session, prefix, search_term="")
+
+    rng = random.Random(0)
+    texts = [
+        " ".join(rng.choices(WORDS, k=words_per_page)) for _ in range(pages)
+    ]
+
+    results = []
+    for mode in MODES:
+        timings = []
+        audit_rows = audit_bytes = 0
+        for _ in range(iterations):
+            duration, audit_rows, audit_bytes = await measure_text_update(
+                engine, ctx.document_id, texts, mode
+            )
+            timings.append(duration)
+
+        results.append(
+            schema.AuditOverheadResult(
+                mode=mode,
+                timing=suite.summarize(mode, timings),
+                audit_rows=audit_rows,
+                audit_bytes=audit_bytes,
+            )
+        )
+
+    return results
+
+
+async def measure_text_update(
+    engine: AsyncEngine,
+    document_id: uuid.UUID,
+    texts: list[str],
+    mode: str,
+) -> tuple[float, int, int]:
+    """Returns (duration in seconds, audit rows, audit bytes)"""
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            if mode == "row":
+                for filename in ROW_LEVEL_SQL:
+                    await _execute_script(conn, (SQL_DIR / filename).read_text())
+
+            # bound to a connection in transaction: `commit` issued by
+            # `update_text_field` does not commit the outer transaction
+            db_session = AsyncSession(bind=conn, expire_on_commit=False)
+            version_id = await _insert_version(db_session, document_id, len(texts))
+
+            started = time.perf_counter()
+            await doc_dbapi.update_text_field(db_session, version_id, texts)
+            duration = time.perf_counter() - started
+
+            count, size = (
+                await db_session.execute(AUDIT_SIZE_SQL, {"record_id": version_id})
+            ).one()
+            await db_session.close()
+        finally:
+            await transaction.rollback()
+
+    return duration, count, size
+
+
+async def _execute_script(conn: AsyncConnection, sql: str) -> None:
+    """Executes multi statement SQL script in the current transaction"""
+    # make sure the driver level transaction is started, the script is
+    # sent directly to asyncpg (prepared statements allow one command only)
+    await conn.execute(text("SELECT 1"))
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.execute(sql)
+
+
+async def _insert_version(
+    db_session: AsyncSession, document_id: uuid.UUID, page_count: int
+) -> uuid.UUID:
+    version = (
+        await db_session.execute(
+            select(orm.DocumentVersion)
+            .where(orm.DocumentVersion.document_id == document_id)
+            .order_by(orm.DocumentVersion.number.desc())
+            .limit(1)
+        )
+    ).scalar_one()
+
+    version_id = uuid.uuid4()
+    await db_session.execute(
+        insert(orm.DocumentVersion).values(
+            id=version_id,
+            number=version.number + 1,
+            file_name=version.file_name,
+            size=version.size,
+            mime_type=version.mime_type,
+            document_id=document_id,
+            lang=version.lang,
+            page_count=page_count,
+            creation_reason="page_edit",
+            created_by=const.SYSTEM_USER_ID,
+            updated_by=const.SYSTEM_USER_ID,
+        )
+    )
+    await db_session.execute(
+        insert(orm.Page),
+        [
+            dict(
+                id=uuid.uuid4(),
+                number=number,
+                page_count=page_count,
+                lang=version.lang,
+                document_version_id=version_id,
+            )
+            for number in range(1, page_count + 1)
+        ],
+    )
+
+    return version_id
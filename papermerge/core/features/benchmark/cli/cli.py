@@ -0,0 +1,304 @@
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.progress import Progress, BarColumn, TaskProgressColumn, TextColumn
+from rich.table import Table
+
+from papermerge.core import const
+from papermerge.core.db.engine import AsyncSessionLocal, get_engine
+from papermerge.core.features.audit.db.audit_context import AsyncAuditContext
+from papermerge.core.features.benchmark import (
+    audit,
+    imports,
+    schema,
+    serialization,
+    statements,
+    suite,
+)
+from papermerge.core.features.benchmark.db import api as benchmark_dbapi
+from papermerge.core.utils.cli import async_command
+
+app = typer.Typer(help="Synthetic corpus and dbapi benchmarks")
+console = Console()
+
+DEFAULTS = schema.CorpusSpec()
+
+
+@app.command("generate")
+@async_command
+async def generate_cmd(
+    prefix: str = typer.Option(DEFAULTS.prefix, help="Prefix of user, group, tag... names"),
+    seed: int = typer.Option(DEFAULTS.seed),
+    users: int = typer.Option(DEFAULTS.users, min=1),
+    groups: int = typer.Option(DEFAULTS.groups, min=0),
+    folder_depth: int = typer.Option(DEFAULTS.folder_depth, min=0),
+    folder_fanout: int = typer.Option(DEFAULTS.folder_fanout, min=1),
+    documents: int = typer.Option(DEFAULTS.documents, min=0, help="Total number of documents"),
+    versions_per_document: int = typer.Option(DEFAULTS.versions_per_document, min=1),
+    pages_per_version: int = typer.Option(DEFAULTS.pages_per_version, min=1),
+    words_per_page: int = typer.Option(DEFAULTS.words_per_page, min=0),
+    tags_per_user: int = typer.Option(DEFAULTS.tags_per_user, min=0),
+    document_types_per_user: int = typer.Option(DEFAULTS.document_types_per_user, min=0),
+    custom_fields_per_type: int = typer.Option(DEFAULTS.custom_fields_per_type, min=0),
+    shared_folders_per_user: int = typer.Option(DEFAULTS.shared_folders_per_user, min=0),
+    batch_size: int = typer.Option(DEFAULTS.batch_size, min=1, help="Documents per transaction"),
+):
+    """Generate synthetic corpus with bulk inserts
+
+    Users get password `synthetic`. Only database rows are generated,
+    there are no document files in the storage.
+    """
+    spec = schema.CorpusSpec(
+        prefix=prefix,
+        seed=seed,
+        users=users,
+        groups=groups,
+        folder_depth=folder_depth,
+        folder_fanout=folder_fanout,
+        documents=documents,
+        versions_per_document=versions_per_document,
+        pages_per_version=pages_per_version,
+        words_per_page=words_per_page,
+        tags_per_user=tags_per_user,
+        document_types_per_user=document_types_per_user,
+        custom_fields_per_type=custom_fields_per_type,
+        shared_folders_per_user=shared_folders_per_user,
+        batch_size=batch_size,
+    )
+
+    with Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TaskProgressColumn(),
+        console=console,
+    ) as progress:
+        task = progress.add_task("Generating documents...", total=spec.documents)
+
+        async with AsyncSessionLocal() as db_session:
+            async with AsyncAuditContext(
+                db_session,
+                user_id=const.SYSTEM_USER_ID,
+                username=const.SYSTEM_USER_USERNAME,
+            ):
+                try:
+                    summary = await benchmark_dbapi.generate_corpus(
+                        db_session,
+                        spec,
+                        on_progress=lambda done: progress.update(task, completed=done),
+                    )
+                except ValueError as e:
+                    console.print(f"[red]{e}[/red]")
+                    raise typer.Exit(code=1)
+
+    table = Table(title=f"Corpus '{prefix}'")
+    table.add_column("Rows", style="cyan")
+    table.add_column("Count", justify="right", style="green")
+    for name, count in summary.model_dump().items():
+        table.add_row(name, str(count))
+    console.print(table)
+
+
+@app.command("run")
+@async_command
+async def run_cmd(
+    prefix: str = typer.Option(DEFAULTS.prefix, help="Prefix of generated corpus"),
+    iterations: int = typer.Option(20, min=1),
+    warmup: int = typer.Option(3, min=0),
+    case: list[str] | None = typer.Option(
+        None, help=f"Run only these cases: {', '.join(suite.CASES)}"
+    ),
+    search_term: str = typer.Option("vertrag"),
+    save_baseline: Path | None = typer.Option(None, help="Save results as baseline (JSON)"),
+    compare: Path | None = typer.Option(None, help="Compare results with baseline (JSON)"),
+    tolerance: float = typer.Option(
+        0.2, help="Allowed slowdown of median vs baseline (0.2 = 20%)"
+    ),
+):
+    """Benchmark hot dbapi calls against generated corpus
+
+    Exits with code 1 if any case regressed compared to the baseline.
+    """
+    unknown = set(case or []) - set(suite.CASES)
+    if unknown:
+        console.print(f"[red]Unknown cases: {', '.join(sorted(unknown))}[/red]")
+        raise typer.Exit(code=1)
+
+    async with AsyncSessionLocal() as db_session:
+        try:
+            ctx = await suite.load_context(db_session, prefix, search_term)
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            raise typer.Exit(code=1)
+
+        results = await suite.run_suite(
+            db_session, ctx, iterations=iterations, warmup=warmup, names=case
+        )
+
+    baseline = suite.load_baseline(compare) if compare else {}
+    comparisons = {
+        item.name: item for item in suite.compare(results, baseline, tolerance)
+    }
+
+    table = Table(title=f"Benchmarks ({iterations} iterations)")
+    table.add_column("Case", style="cyan")
+    for column in ("min ms", "median ms", "p95 ms", "max ms"):
+        table.add_column(column, justify="right")
+    if compare:
+        table.add_column("baseline ms", justify="right")
+        table.add_column("ratio", justify="right")
+
+    for result in results:
+        row = [
+            result.name,
+            f"{result.min_ms:.1f}",
+            f"{result.median_ms:.1f}",
+            f"{result.p95_ms:.1f}",
+            f"{result.max_ms:.1f}",
+        ]
+        if compare:
+            item = comparisons[result.name]
+            style = "red" if item.regression else "green"
+            row.append(f"{item.baseline_ms:.1f}" if item.baseline_ms else "-")
+            row.append(f"[{style}]{item.ratio}[/{style}]" if item.ratio else "-")
+        table.add_row(*row)
+
+    console.print(table)
+
+    if save_baseline:
+        suite.save_baseline(save_baseline, results)
+        console.print(f"Baseline saved to {save_baseline}")
+
+    if any(item.regression for item in comparisons.values()):
+        raise typer.Exit(code=1)
+
+
+@app.command("audit-overhead")
+@async_command
+async def audit_overhead_cmd(
+    prefix: str = typer.Option(DEFAULTS.prefix, help="Prefix of generated corpus"),
+    pages: int = typer.Option(1000, min=1),
+    words_per_page: int = typer.Option(300, min=1),
+    iterations: int = typer.Option(5, min=1),
+):
+    """Audit overhead of OCR text update: statement vs row level triggers
+
+    Runs `update_text_field` on a new version with `--pages` pages of a
+    corpus document. All changes are rolled back.
+    """
+    try:
+        results = await audit.run(
+            get_engine(),
+            prefix,
+            pages=pages,
+            words_per_page=words_per_page,
+            iterations=iterations,
+        )
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(code=1)
+
+    table = Table(title=f"update_text_field of {pages} pages ({iterations} iterations)")
+    table.add_column("Audit triggers", style="cyan")
+    table.add_column("median ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    table.add_column("audit rows", justify="right")
+    table.add_column("audit bytes", justify="right", style="green")
+    for result in results:
+        table.add_row(
+            result.mode,
+            f"{result.timing.median_ms:.1f}",
+            f"{result.timing.p95_ms:.1f}",
+            str(result.audit_rows),
+            str(result.audit_bytes),
+        )
+    console.print(table)
+
+
+@app.command("serialization")
+def serialization_cmd(
+    items: int = typer.Option(500, min=1, help="Items per page"),
+    iterations: int = typer.Option(20, min=1),
+):
+    """Compare JSON serialization paths of a paginated node listing
+
+    No database is needed, items are synthetic.
+    """
+    results = serialization.run(items, iterations)
+
+    table = Table(title=f"Serialization of {items} items ({iterations} iterations)")
+    table.add_column("Case", style="cyan")
+    for column in ("min ms", "median ms", "p95 ms", "max ms"):
+        table.add_column(column, justify="right")
+    for result in results:
+        table.add_row(
+            result.name,
+            f"{result.min_ms:.1f}",
+            f"{result.median_ms:.1f}",
+            f"{result.p95_ms:.1f}",
+            f"{result.max_ms:.1f}",
+        )
+    console.print(table)
+
+
+@app.command("statements")
+def statements_cmd(
+    calls: int = typer.Option(1000, min=1, help="Calls per iteration"),
+    iterations: int = typer.Option(10, min=1),
+):
+    """Compare per-call Python overhead of rebuilt and cached statements
+
+    No database is needed.
+    """
+    results = statements.run(calls, iterations)
+
+    table = Table(title=f"Statement preparation ({calls} calls x {iterations} iterations)")
+    table.add_column("Case", style="cyan")
+    for column in ("min µs/call", "median µs/call", "p95 µs/call"):
+        table.add_column(column, justify="right")
+    for result in results:
+        table.add_row(
+            result.name,
+            f"{result.min_ms * 1000 / calls:.1f}",
+            f"{result.median_ms * 1000 / calls:.1f}",
+            f"{result.p95_ms * 1000 / calls:.1f}",
+        )
+    console.print(table)
+
+
+@app.command("imports")
+def imports_cmd(
+    module: list[str] | None = typer.Option(
+        None, help=f"Modules to import (default: {', '.join(imports.DEFAULT_MODULES)})"
+    ),
+    limit: int = typer.Option(20, min=1, help="Number of modules to show"),
+    sort: str = typer.Option("cumulative", help="Sort by 'cumulative' or 'self' time"),
+):
+    """Measure startup import cost per module
+
+    Each module is imported in a fresh interpreter with `-X importtime`.
+    """
+    if sort not in ("cumulative", "self"):
+        console.print("[red]--sort must be 'cumulative' or 'self'[/red]")
+        raise typer.Exit(code=1)
+
+    for name in module or imports.DEFAULT_MODULES:
+        try:
+            times = imports.measure_import(name)
+        except RuntimeError as e:
+            console.print(f"[red]{e}[/red]")
+            raise typer.Exit(code=1)
+
+        table = Table(
+            title=f"import {name}: {imports.total_us(times) / 1000:.1f} ms total"
+        )
+        table.add_column("Module", style="cyan")
+        table.add_column("self ms", justify="right")
+        table.add_column("cumulative ms", justify="right", style="green")
+        for item in imports.top(times, limit, by=sort):
+            table.add_row(
+                item.module,
+                f"{item.self_us / 1000:.1f}",
+                f"{item.cumulative_us / 1000:.1f}",
+            )
+        console.print(table)
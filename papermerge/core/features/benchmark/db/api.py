@@ -0,0 +1,469 @@
+"""Synthetic corpus generation
+
+Users and groups are created via regular dbapi (special folders,
+memberships); everything else - folder trees, documents, versions, pages,
+tags, document types, custom field values and shares - is written with
+ORM bulk inserts (one executemany statement per table and batch) so that
+millions of rows can be generated in reasonable time. Database triggers
+(audit log, search index) fire as for regular inserts.
+
+Only database rows are generated: document versions have no files in
+the storage.
+"""
+import random
+import uuid
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Callable
+
+from passlib.hash import pbkdf2_sha256
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from papermerge.core import orm, const
+from papermerge.core.features.auth import scopes
+from papermerge.core.features.benchmark import schema
+from papermerge.core.features.custom_fields.cf_types import TypeRegistry
+from papermerge.core.features.groups.db import api as groups_dbapi
+from papermerge.core.features.roles.db import api as roles_dbapi
+from papermerge.core.features.special_folders.db import api as special_folders_api
+from papermerge.core.features.users.db import api as users_dbapi
+from papermerge.core.types import (
+    DocumentProcessingStatus,
+    FolderType,
+    OCRStatusEnum,
+    OwnerType,
+    ResourceType,
+)
+
+# OCR text vocabulary; words are drawn with Zipf-like frequencies
+# (first words are the most frequent) so that full text queries have
+# realistic selectivity
+WORDS = (
+    "und", "der", "die", "das", "rechnung", "invoice", "betrag", "total",
+    "datum", "date", "kunde", "customer", "vertrag", "contract", "seite",
+    "page", "nummer", "number", "steuer", "tax", "bank", "konto", "account",
+    "zahlung", "payment", "lieferung", "delivery", "auftrag", "order",
+    "adresse", "address", "firma", "company", "gmbh", "straße", "street",
+    "berlin", "hamburg", "münchen", "london", "paris", "januar", "februar",
+    "märz", "april", "mai", "juni", "juli", "august", "september",
+    "oktober", "november", "dezember", "versicherung", "insurance",
+    "police", "policy", "schaden", "claim", "miete", "rent", "wohnung",
+    "apartment", "strom", "electricity", "gas", "wasser", "water",
+    "telefon", "phone", "internet", "mobilfunk", "gehalt", "salary",
+    "abrechnung", "statement", "bescheid", "notice", "finanzamt",
+    "krankenkasse", "arzt", "doctor", "rezept", "prescription", "schule",
+    "school", "zeugnis", "certificate", "urlaub", "vacation", "reise",
+    "travel", "ticket", "hotel", "quittung", "receipt", "garantie",
+    "warranty", "handbuch", "manual", "kündigung", "termination",
+    "mahnung", "reminder", "angebot", "offer", "bestellung", "purchase",
+    "lieferschein", "protokoll", "minutes", "bericht", "report",
+    "projekt", "project", "budget", "planung", "planning", "anlage",
+    "attachment", "unterschrift", "signature", "stempel", "archiv",
+)
+_WORDS_CUM_WEIGHTS = list(accumulate(1 / rank for rank in range(1, len(WORDS) + 1)))
+
+TITLE_WORDS = (
+    "Invoice", "Rechnung", "Contract", "Vertrag", "Receipt", "Quittung",
+    "Statement", "Kontoauszug", "Letter", "Brief", "Report", "Bericht",
+    "Policy", "Bescheid", "Offer", "Angebot",
+)
+
+# (type handler, value factory) of generated custom fields
+CUSTOM_FIELD_TYPES = (
+    ("text", lambda rng: " ".join(_words(rng, 2)).title()),
+    ("integer", lambda rng: rng.randint(1, 100_000)),
+    ("date", lambda rng: date(2015, 1, 1) + timedelta(days=rng.randint(0, 3650))),
+)
+
+OnProgress = Callable[[int], None]
+
+
+async def generate_corpus(
+    db_session: AsyncSession,
+    spec: schema.CorpusSpec,
+    on_progress: OnProgress | None = None,
+    created_by: uuid.UUID = const.SYSTEM_USER_ID,
+) -> schema.CorpusSummary:
+    """Generates synthetic corpus described by `spec`
+
+    `on_progress` is called with the number of documents inserted
+    after each committed batch.
+    """
+    rng = random.Random(spec.seed)
+    summary = schema.CorpusSummary()
+
+    role_id = None
+    if spec.shared_folders_per_user and spec.users > 1 and spec.folder_depth > 0:
+        role, error = await roles_dbapi.create_role(
+            db_session,
+            name=f"{spec.prefix}-viewer",
+            scopes=[scopes.NODE_VIEW],
+            exists_ok=True,
+            created_by=created_by,
+        )
+        if error:
+            raise ValueError(error)
+        role_id = role.id
+
+    group_ids = []
+    for index in range(spec.groups):
+        group = await groups_dbapi.create_group(
+            db_session,
+            name=f"{spec.prefix}-group-{index}",
+            created_by=created_by,
+        )
+        group_ids.append(group.id)
+    summary.groups = len(group_ids)
+
+    password = pbkdf2_sha256.hash(spec.password)
+    user_ids = []
+    for index in range(spec.users):
+        user = await users_dbapi.create_user(
+            db_session,
+            username=f"{spec.prefix}{index}",
+            email=f"{spec.prefix}{index}@example.com",
+            password=password,
+            group_ids=[group_ids[index % len(group_ids)]] if group_ids else None,
+            is_active=True,
+            created_by=created_by,
+        )
+        user_ids.append(user.id)
+    summary.users = len(user_ids)
+
+    docs_per_user, remainder = divmod(spec.documents, len(user_ids))
+    for index, user_id in enumerate(user_ids):
+        home = await special_folders_api.get_special_folder(
+            db_session, OwnerType.USER, user_id, FolderType.HOME
+        )
+        levels = await _insert_folder_tree(
+            db_session, spec, user_id, home.folder_id, created_by
+        )
+        folder_ids = [home.folder_id] + [fid for level in levels for fid in level]
+        tag_ids = await _insert_tags(db_session, rng, spec, index, user_id, created_by)
+        doc_types = await _insert_document_types(
+            db_session, spec, index, user_id, created_by
+        )
+        await db_session.commit()
+
+        summary.folders += len(folder_ids) - 1
+        summary.tags += len(tag_ids)
+        summary.document_types += len(doc_types)
+
+        count = docs_per_user + (1 if index < remainder else 0)
+        for start in range(0, count, spec.batch_size):
+            await _insert_documents(
+                db_session,
+                rng,
+                spec,
+                summary,
+                user_id=user_id,
+                folder_ids=folder_ids,
+                tag_ids=tag_ids,
+                doc_types=doc_types,
+                count=min(spec.batch_size, count - start),
+                created_by=created_by,
+            )
+            await db_session.commit()
+            if on_progress:
+                on_progress(summary.documents)
+
+    if role_id:
+        rows = []
+        for index, user_id in enumerate(user_ids):
+            top_level = await _top_level_folders(
+                db_session, user_id, spec.shared_folders_per_user
+            )
+            for node_id in top_level:
+                rows.append(
+                    dict(
+                        id=uuid.uuid4(),
+                        node_id=node_id,
+                        user_id=user_ids[(index + 1) % len(user_ids)],
+                        role_id=role_id,
+                        owner_id=user_id,
+                        created_by=created_by,
+                        updated_by=created_by,
+                    )
+                )
+        if rows:
+            await db_session.execute(insert(orm.SharedNode), rows)
+            await db_session.commit()
+        summary.shared_nodes = len(rows)
+
+    return summary
+
+
+def _words(rng: random.Random, count: int) -> list[str]:
+    return rng.choices(WORDS, cum_weights=_WORDS_CUM_WEIGHTS, k=count)
+
+
+async def _insert_owned(
+    db_session: AsyncSession,
+    entity,
+    rows: list[dict],
+    resource_type: ResourceType,
+    user_id: uuid.UUID,
+) -> None:
+    if not rows:
+        return
+
+    await db_session.execute(insert(entity), rows)
+    await db_session.execute(
+        insert(orm.Ownership),
+        [
+            dict(
+                owner_type=OwnerType.USER.value,
+                owner_id=user_id,
+                resource_type=resource_type.value,
+                resource_id=row["id"],
+            )
+            for row in rows
+        ],
+    )
+
+
+async def _insert_folder_tree(
+    db_session: AsyncSession,
+    spec: schema.CorpusSpec,
+    user_id: uuid.UUID,
+    home_id: uuid.UUID,
+    created_by: uuid.UUID,
+) -> list[list[uuid.UUID]]:
+    """Inserts folder tree level by level; returns folder IDs per level"""
+    levels = []
+    parents = [home_id]
+    for depth in range(1, spec.folder_depth + 1):
+        rows = [
+            dict(
+                id=uuid.uuid4(),
+                title=f"Folder {depth}.{position}",
+                ctype="folder",
+                lang=spec.lang,
+                parent_id=parent_id,
+                created_by=created_by,
+                updated_by=created_by,
+            )
+            for parent_id in parents
+            for position in range(spec.folder_fanout)
+        ]
+        await _insert_owned(db_session, orm.Folder, rows, ResourceType.NODE, user_id)
+        parents = [row["id"] for row in rows]
+        levels.append(parents)
+
+    return levels
+
+
+async def _insert_tags(
+    db_session: AsyncSession,
+    rng: random.Random,
+    spec: schema.CorpusSpec,
+    user_index: int,
+    user_id: uuid.UUID,
+    created_by: uuid.UUID,
+) -> list[uuid.UUID]:
+    rows = [
+        dict(
+            id=uuid.uuid4(),
+            name=f"{spec.prefix}-tag-{user_index}-{position}",
+            bg_color=f"#{rng.randrange(0x1000000):06x}",
+            fg_color="#ffffff",
+            created_by=created_by,
+            updated_by=created_by,
+        )
+        for position in range(spec.tags_per_user)
+    ]
+    await _insert_owned(db_session, orm.Tag, rows, ResourceType.TAG, user_id)
+
+    return [row["id"] for row in rows]
+
+
+async def _insert_document_types(
+    db_session: AsyncSession,
+    spec: schema.CorpusSpec,
+    user_index: int,
+    user_id: uuid.UUID,
+    created_by: uuid.UUID,
+) -> list[tuple[uuid.UUID, list[tuple[uuid.UUID, str]]]]:
+    """Returns list of (document type ID, [(custom field ID, type handler)])"""
+    doc_type_rows, field_rows, association_rows = [], [], []
+    doc_types = []
+    for type_position in range(spec.document_types_per_user):
+        doc_type_id = uuid.uuid4()
+        doc_type_rows.append(
+            dict(
+                id=doc_type_id,
+                name=f"{spec.prefix}-type-{user_index}-{type_position}",
+                created_by=created_by,
+                updated_by=created_by,
+            )
+        )
+        fields = []
+        for position in range(spec.custom_fields_per_type):
+            type_handler = CUSTOM_FIELD_TYPES[position % len(CUSTOM_FIELD_TYPES)][0]
+            field_id = uuid.uuid4()
+            field_rows.append(
+                dict(
+                    id=field_id,
+                    name=f"{spec.prefix}-cf-{user_index}-{type_position}-{position}",
+                    type_handler=type_handler,
+                    config={},
+                    created_by=created_by,
+                    updated_by=created_by,
+                )
+            )
+            association_rows.append(
+                dict(
+                    document_type_id=doc_type_id,
+                    custom_field_id=field_id,
+                    position=position,
+                )
+            )
+            fields.append((field_id, type_handler))
+        doc_types.append((doc_type_id, fields))
+
+    await _insert_owned(
+        db_session, orm.CustomField, field_rows, ResourceType.CUSTOM_FIELD, user_id
+    )
+    await _insert_owned(
+        db_session, orm.DocumentType, doc_type_rows, ResourceType.DOCUMENT_TYPE, user_id
+    )
+    if association_rows:
+        await db_session.execute(insert(orm.DocumentTypeCustomField), association_rows)
+
+    return doc_types
+
+
+async def _insert_documents(
+    db_session: AsyncSession,
+    rng: random.Random,
+    spec: schema.CorpusSpec,
+    summary: schema.CorpusSummary,
+    *,
+    user_id: uuid.UUID,
+    folder_ids: list[uuid.UUID],
+    tag_ids: list[uuid.UUID],
+    doc_types: list[tuple[uuid.UUID, list[tuple[uuid.UUID, str]]]],
+    count: int,
+    created_by: uuid.UUID,
+) -> None:
+    doc_rows, version_rows, page_rows, tag_rows, cfv_rows = [], [], [], [], []
+
+    for _ in range(count):
+        doc_id = uuid.uuid4()
+        title = (
+            f"{rng.choice(TITLE_WORDS)} {rng.randint(2000, 2025)}"
+            f"-{summary.documents + len(doc_rows):07d}.pdf"
+        )
+        doc_type = None
+        if doc_types and rng.random() < spec.typed_ratio:
+            doc_type = rng.choice(doc_types)
+
+        doc_rows.append(
+            dict(
+                id=doc_id,
+                title=title,
+                ctype="document",
+                lang=spec.lang,
+                parent_id=rng.choice(folder_ids),
+                ocr=True,
+                ocr_status=OCRStatusEnum.success,
+                processing_status=DocumentProcessingStatus.ready,
+                document_type_id=doc_type[0] if doc_type else None,
+                created_by=created_by,
+                updated_by=created_by,
+            )
+        )
+
+        for number in range(1, spec.versions_per_document + 1):
+            version_id = uuid.uuid4()
+            texts = [
+                " ".join(_words(rng, spec.words_per_page))
+                for _ in range(spec.pages_per_version)
+            ]
+            version_rows.append(
+                dict(
+                    id=version_id,
+                    number=number,
+                    file_name=title,
+                    size=rng.randint(20_000, 2_000_000),
+                    mime_type="application/pdf",
+                    document_id=doc_id,
+                    lang=spec.lang,
+                    text=" ".join(texts),
+                    page_count=spec.pages_per_version,
+                    is_original=number == 1,
+                    creation_reason="upload" if number == 1 else "page_edit",
+                    created_by=created_by,
+                    updated_by=created_by,
+                )
+            )
+            page_rows.extend(
+                dict(
+                    id=uuid.uuid4(),
+                    number=page_number,
+                    page_count=spec.pages_per_version,
+                    lang=spec.lang,
+                    text=text,
+                    document_version_id=version_id,
+                )
+                for page_number, text in enumerate(texts, start=1)
+            )
+
+        if tag_ids and spec.max_tags_per_document and rng.random() < spec.tagged_ratio:
+            k = rng.randint(1, min(spec.max_tags_per_document, len(tag_ids)))
+            tag_rows.extend(
+                dict(node_id=doc_id, tag_id=tag_id)
+                for tag_id in rng.sample(tag_ids, k)
+            )
+
+        if doc_type:
+            for field_id, type_handler in doc_type[1]:
+                cfv_rows.append(
+                    dict(
+                        id=uuid.uuid4(),
+                        document_id=doc_id,
+                        field_id=field_id,
+                        value=_custom_field_value(rng, type_handler),
+                    )
+                )
+
+    await _insert_owned(db_session, orm.Document, doc_rows, ResourceType.NODE, user_id)
+    await db_session.execute(insert(orm.DocumentVersion), version_rows)
+    if page_rows:
+        await db_session.execute(insert(orm.Page), page_rows)
+    if tag_rows:
+        await db_session.execute(insert(orm.NodeTagsAssociation), tag_rows)
+    if cfv_rows:
+        await db_session.execute(insert(orm.CustomFieldValue), cfv_rows)
+
+    summary.documents += len(doc_rows)
+    summary.document_versions += len(version_rows)
+    summary.pages += len(page_rows)
+    summary.custom_field_values += len(cfv_rows)
+
+
+def _custom_field_value(rng: random.Random, type_handler: str) -> dict:
+    factory = dict(CUSTOM_FIELD_TYPES)[type_handler]
+    handler = TypeRegistry.get_handler(type_handler)
+    config = handler.parse_config({})
+
+    return handler.to_storage(factory(rng), config).model_dump(mode="json")
+
+
+async def _top_level_folders(
+    db_session: AsyncSession,
+    user_id: uuid.UUID,
+    limit: int,
+) -> list[uuid.UUID]:
+    home = await special_folders_api.get_special_folder(
+        db_session, OwnerType.USER, user_id, FolderType.HOME
+    )
+    stmt = (
+        select(orm.Folder.id)
+        .where(orm.Folder.parent_id == home.folder_id)
+        .order_by(orm.Folder.title)
+        .limit(limit)
+    )
+
+    return list((await db_session.scalars(stmt)).all())
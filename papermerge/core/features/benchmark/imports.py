@@ -0,0 +1,74 @@
+"""Startup import cost
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter
+and parses its report, to see which modules make ``pm`` and the web
+app slow to start.
+"""
+import subprocess
+import sys
+from dataclasses import dataclass
+
+# Entry points whose startup time matters
+DEFAULT_MODULES = ["papermerge.cli", "papermerge.app"]
+
+
+@dataclass
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> list[ImportTime]:
+    """Parses stderr of ``python -X importtime``
+
+    Lines look like:
+
+        import time: self [us] | cumulative | imported package
+        import time:       143 |        143 |   _io
+    """
+    result = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, module = parts
+        if not self_us.strip().isdigit():
+            # header line
+            continue
+        result.append(
+            ImportTime(
+                module=module.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+            )
+        )
+
+    return result
+
+
+def measure_import(module: str) -> list[ImportTime]:
+    """Import times of all modules loaded by importing `module`
+
+    Raises ``RuntimeError`` if `module` fails to import.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Failed to import {module}:\n{proc.stderr[-2000:]}")
+
+    return parse_importtime(proc.stderr)
+
+
+def total_us(times: list[ImportTime]) -> int:
+    return sum(item.self_us for item in times)
+
+
+def top(times: list[ImportTime], limit: int, by: str = "cumulative") -> list[ImportTime]:
+    key = "cumulative_us" if by == "cumulative" else "self_us"
+    return sorted(times, key=lambda item: getattr(item, key), reverse=True)[:limit]
@@ -0,0 +1,76 @@
+from pydantic import BaseModel, Field
+
+
+class CorpusSpec(BaseModel):
+    """Shape of the synthetic corpus
+
+    Same `seed` produces same shape (folder tree, text, tag and custom
+    field distribution); IDs are always new, so that several corpora
+    (with different `prefix`) can live in the same database.
+    """
+    prefix: str = "synth"
+    seed: int = 0
+    users: int = Field(default=10, ge=1)
+    groups: int = Field(default=3, ge=0)
+    # folder tree of each user: `folder_fanout` sub-folders per folder,
+    # `folder_depth` levels below user's home folder
+    folder_depth: int = Field(default=4, ge=0)
+    folder_fanout: int = Field(default=3, ge=1)
+    # total number of documents, spread evenly among users
+    documents: int = Field(default=10_000, ge=0)
+    versions_per_document: int = Field(default=1, ge=1)
+    pages_per_version: int = Field(default=3, ge=1)
+    words_per_page: int = Field(default=200, ge=0)
+    tags_per_user: int = Field(default=20, ge=0)
+    max_tags_per_document: int = Field(default=3, ge=0)
+    # fraction of documents which have at least one tag
+    tagged_ratio: float = Field(default=0.5, ge=0, le=1)
+    document_types_per_user: int = Field(default=3, ge=0)
+    custom_fields_per_type: int = Field(default=3, ge=0)
+    # fraction of documents which have document type (and custom field values)
+    typed_ratio: float = Field(default=0.5, ge=0, le=1)
+    # top level folders each user shares with the next user
+    shared_folders_per_user: int = Field(default=1, ge=0)
+    lang: str = "deu"
+    password: str = "synthetic"
+    # documents inserted per transaction
+    batch_size: int = Field(default=1000, ge=1)
+
+
+class CorpusSummary(BaseModel):
+    users: int = 0
+    groups: int = 0
+    folders: int = 0
+    documents: int = 0
+    document_versions: int = 0
+    pages: int = 0
+    tags: int = 0
+    document_types: int = 0
+    custom_field_values: int = 0
+    shared_nodes: int = 0
+
+
+class BenchmarkResult(BaseModel):
+    name: str
+    iterations: int
+    min_ms: float
+    median_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+class BenchmarkComparison(BaseModel):
+    name: str
+    baseline_ms: float | None
+    current_ms: float
+    # current / baseline median; None if there is no baseline
+    ratio: float | None
+    regression: bool
+
+
+class AuditOverheadResult(BaseModel):
+    """Timing of `update_text_field` and audit rows it produced"""
+    mode: str
+    timing: BenchmarkResult
+    audit_rows: int
+    audit_bytes: int
@@ -0,0 +1,138 @@
+"""Serialization micro-benchmark of paginated node listings
+
+Compares the ways a page of `FolderEx`/`DocumentEx` items can be turned
+into the JSON response body:
+
+- ``validate+json``: models validated when built, then FastAPI's
+  default path (dump, validate against `response_model` again,
+  serialize, stdlib ``json.dumps``)
+- ``validate+orjson``: same, with `ORJSONResponse` doing the final dump
+- ``construct+dump_json``: models built with ``model_construct`` and
+  dumped by pydantic directly (`model_response`)
+"""
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Union
+
+from pydantic import TypeAdapter
+
+from papermerge.core import schema
+from papermerge.core.features.benchmark import suite
+from papermerge.core.features.benchmark.schema import BenchmarkResult
+from papermerge.core.features.document.schema import document_thumbnail_url
+from papermerge.core.routers.common import ORJSONResponse, model_response
+from papermerge.core.schemas.common import Tag
+from papermerge.core.types import OCRStatusEnum, OwnerType, PaginatedResponse
+
+ResponseType = PaginatedResponse[Union[schema.DocumentEx, schema.FolderEx]]
+
+
+def make_rows(count: int, tags_per_item: int = 3) -> list[dict]:
+    """Plain attributes of `count` nodes, every other one a document"""
+    now = datetime.now(timezone.utc)
+    user_id = uuid.uuid4()
+    parent_id = uuid.uuid4()
+    tags = [
+        dict(id=uuid.uuid4(), name=f"tag-{i}", bg_color="#c41fff", fg_color="#ffffff")
+        for i in range(tags_per_item)
+    ]
+    rows = []
+    for i in range(count):
+        row = dict(
+            id=uuid.uuid4(),
+            title=f"node {i}",
+            ctype="document" if i % 2 else "folder",
+            tags=tags,
+            parent_id=parent_id,
+            is_shared=False,
+            owned_by=dict(id=user_id, name="admin", type=OwnerType.USER),
+            created_at=now,
+            updated_at=now,
+            created_by=dict(id=user_id, username="admin"),
+            updated_by=dict(id=user_id, username="admin"),
+        )
+        if row["ctype"] == "document":
+            row.update(preview_status=None, ocr=False, ocr_status=OCRStatusEnum.unknown)
+        rows.append(row)
+
+    return rows
+
+
+def build_validated(rows: list[dict]) -> ResponseType:
+    items = [
+        schema.DocumentEx(**row) if row["ctype"] == "document" else schema.FolderEx(**row)
+        for row in rows
+    ]
+    return ResponseType(page_size=len(rows), page_number=1, num_pages=1, items=items)
+
+
+def build_constructed(rows: list[dict]) -> ResponseType:
+    items = []
+    for row in rows:
+        attrs = dict(
+            row,
+            owned_by=schema.OwnedBy.model_construct(**row["owned_by"]),
+            created_by=schema.ByUser.model_construct(**row["created_by"]),
+            updated_by=schema.ByUser.model_construct(**row["updated_by"]),
+            tags=[Tag.model_construct(**tag) for tag in row["tags"]],
+        )
+        if row["ctype"] == "document":
+            items.append(schema.DocumentEx.model_construct(
+                thumbnail_url=document_thumbnail_url(row["id"], row["preview_status"]),
+                **attrs,
+            ))
+        else:
+            items.append(schema.FolderEx.model_construct(**attrs))
+
+    return ResponseType(page_size=len(rows), page_number=1, num_pages=1, items=items)
+
+
+_adapter = TypeAdapter(ResponseType)
+
+
+def _fastapi_content(model: ResponseType):
+    """What FastAPI does with a model returned from a route"""
+    value = _adapter.validate_python(model.model_dump(by_alias=True))
+    return _adapter.dump_python(value, mode="json", by_alias=True)
+
+
+def validate_json(rows: list[dict]) -> bytes:
+    content = _fastapi_content(build_validated(rows))
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def validate_orjson(rows: list[dict]) -> bytes:
+    return ORJSONResponse(_fastapi_content(build_validated(rows))).body
+
+
+def construct_dump_json(rows: list[dict]) -> bytes:
+    return model_response(build_constructed(rows)).body
+
+
+CASES: dict[str, Callable[[list[dict]], bytes]] = {
+    "validate+json": validate_json,
+    "validate+orjson": validate_orjson,
+    "construct+dump_json": construct_dump_json,
+}
+
+
+def run(items: int, iterations: int, warmup: int = 2) -> list[BenchmarkResult]:
+    rows = make_rows(items)
+    results = []
+    for name, case in CASES.items():
+        for _ in range(warmup):
+            case(rows)
+
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            case(rows)
+            timings.append(time.perf_counter() - started)
+
+        results.append(suite.summarize(name, timings))
+
+    return results
@@ -0,0 +1,89 @@
+"""Per-call Python overhead of hot lookup statements
+
+Ancestors, node permission, node owner, last document version and first
+page statements are built once, with bound parameters (see
+`db.common.ancestors_stmt` and friends). For each of them compares:
+
+- ``rebuilt``: statement built from scratch on every call
+- ``cached``: the statement built once and reused
+
+Measured is the Python work done before a statement is sent to the
+database: building it, generating its cache key, getting its compiled
+form from the compiled cache and constructing its parameters. No
+database is needed.
+"""
+import time
+import uuid
+from typing import Any, Callable
+
+from sqlalchemy import Select
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from papermerge.core.db import common
+from papermerge.core.features.benchmark import suite
+from papermerge.core.features.benchmark.schema import BenchmarkResult
+from papermerge.core.features.document.db import api as doc_dbapi
+
+StatementFactory = Callable[[], Select]
+
+
+def _params() -> dict[str, Any]:
+    return {
+        "node_id": uuid.uuid4(),
+        "user_id": uuid.uuid4(),
+        "codename": "node.view",
+        "doc_id": uuid.uuid4(),
+        "doc_ver_id": uuid.uuid4(),
+    }
+
+
+# name -> (cached statement factory, names of its parameters)
+STATEMENTS: dict[str, tuple[StatementFactory, tuple[str, ...]]] = {
+    "ancestors": (common.ancestors_stmt, ("node_id",)),
+    "node_perm": (common.node_perm_stmt, ("node_id", "user_id", "codename")),
+    "node_owner": (common.node_owner_stmt, ("node_id",)),
+    "last_doc_ver": (doc_dbapi.last_doc_ver_stmt, ("doc_id",)),
+    "first_page": (doc_dbapi.first_page_stmt, ("doc_ver_id",)),
+}
+
+
+def prepare(stmt: Select, params: dict[str, Any], dialect, compiled_cache: dict):
+    """What the engine does in Python before executing `stmt`"""
+    cache_key = stmt._generate_cache_key()
+    compiled = compiled_cache.get(cache_key.key)
+    if compiled is None:
+        compiled = stmt.compile(dialect=dialect)
+        compiled_cache[cache_key.key] = compiled
+
+    return compiled.construct_params(
+        params, extracted_parameters=cache_key.bindparams
+    )
+
+
+def run(calls: int, iterations: int, warmup: int = 2) -> list[BenchmarkResult]:
+    """Timings of `calls` preparations of each statement, rebuilt and cached"""
+    dialect = asyncpg.dialect()
+    all_params = _params()
+    results = []
+    for name, (factory, param_names) in STATEMENTS.items():
+        params = {key: all_params[key] for key in param_names}
+        cases = {
+            # functools.cache keeps the undecorated builder
+            f"{name} rebuilt": factory.__wrapped__,
+            f"{name} cached": factory,
+        }
+        for case_name, build in cases.items():
+            compiled_cache = {}
+            for _ in range(warmup):
+                prepare(build(), params, dialect, compiled_cache)
+
+            timings = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                for _ in range(calls):
+                    prepare(build(), params, dialect, compiled_cache)
+                timings.append(time.perf_counter() - started)
+
+            results.append(suite.summarize(case_name, timings))
+
+    return results
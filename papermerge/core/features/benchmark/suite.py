@@ -0,0 +1,246 @@
+"""Benchmarks of hot dbapi calls
+
+Each case is run against the corpus generated by `pm benchmark generate`
+(identified by its prefix) from the point of view of the
+corpus' first user. Results (min/median/p95/max in milliseconds) can be
+saved as baseline and later runs compared against it: a case regressed
+if its median is more than `tolerance` slower than the baseline median.
+"""
+import json
+import math
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from papermerge.core import orm
+from papermerge.core.db import common as dbapi_common
+from papermerge.core.features.audit.db import api as audit_dbapi
+from papermerge.core.features.auth import scopes
+from papermerge.core.features.benchmark import schema
+from papermerge.core.features.custom_fields.db import api as cf_dbapi
+from papermerge.core.features.document.db import api as doc_dbapi
+from papermerge.core.features.nodes.db import api as nodes_dbapi
+from papermerge.core.features.search import schema as search_schema
+from papermerge.core.features.search.db import api as search_dbapi
+from papermerge.core.features.special_folders.db import api as special_folders_api
+from papermerge.core.types import FolderType, OwnerType, ResourceType
+
+PAGE_SIZE = 50
+
+
+@dataclass
+class BenchmarkContext:
+    user_id: uuid.UUID
+    # folder with most children
+    folder_id: uuid.UUID
+    # document with most ancestors
+    document_id: uuid.UUID
+    # document type with most documents
+    document_type_id: uuid.UUID | None
+    search_term: str
+
+
+Case = Callable[[AsyncSession, BenchmarkContext], Awaitable[Any]]
+
+CASES: dict[str, Case] = {
+    "get_paginated_nodes": lambda db_session, ctx: nodes_dbapi.get_paginated_nodes(
+        db_session,
+        parent_id=ctx.folder_id,
+        page_size=PAGE_SIZE,
+        page_number=1,
+    ),
+    "search_documents": lambda db_session, ctx: search_dbapi.search_documents(
+        db_session,
+        user_id=ctx.user_id,
+        params=search_schema.SearchQueryParams(
+            filters=search_schema.SearchFilters(
+                fts=search_schema.FullTextSearchFilter(terms=[ctx.search_term])
+            ),
+            page_size=PAGE_SIZE,
+        ),
+    ),
+    "get_documents": lambda db_session, ctx: doc_dbapi.get_documents(
+        db_session,
+        user_id=ctx.user_id,
+        page_size=PAGE_SIZE,
+        page_number=1,
+    ),
+    "has_node_perm": lambda db_session, ctx: dbapi_common.has_node_perm(
+        db_session,
+        node_id=ctx.document_id,
+        codename=scopes.NODE_VIEW,
+        user_id=ctx.user_id,
+    ),
+    "get_document_table_data": lambda db_session, ctx: cf_dbapi.get_document_table_data(
+        db_session,
+        document_type_id=ctx.document_type_id,
+        user_id=ctx.user_id,
+        limit=PAGE_SIZE,
+        offset=0,
+    ),
+    "get_audit_logs": lambda db_session, ctx: audit_dbapi.get_audit_logs(
+        db_session,
+        page_size=PAGE_SIZE,
+        page_number=1,
+    ),
+}
+
+
+async def load_context(
+    db_session: AsyncSession,
+    prefix: str,
+    search_term: str,
+) -> BenchmarkContext:
+    stmt = select(orm.User.id).where(orm.User.username == f"{prefix}0")
+    user_id = (await db_session.execute(stmt)).scalar_one_or_none()
+    if user_id is None:
+        raise ValueError(
+            f"User {prefix}0 not found; run `benchmark generate --prefix {prefix}` first"
+        )
+
+    home = await special_folders_api.get_special_folder(
+        db_session, OwnerType.USER, user_id, FolderType.HOME
+    )
+    owned_nodes = select(orm.Ownership.resource_id).where(
+        orm.Ownership.resource_type == ResourceType.NODE.value,
+        orm.Ownership.owner_type == OwnerType.USER.value,
+        orm.Ownership.owner_id == user_id,
+    )
+    stmt = (
+        select(orm.Node.parent_id)
+        .where(orm.Node.id.in_(owned_nodes), orm.Node.parent_id.is_not(None))
+        .group_by(orm.Node.parent_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    folder_id = (await db_session.execute(stmt)).scalar() or home.folder_id
+
+    stmt = text("""
+        WITH RECURSIVE tree(id, depth) AS (
+            SELECT CAST(:home_id AS uuid), 0
+            UNION ALL
+            SELECT nodes.id, tree.depth + 1
+            FROM nodes JOIN tree ON nodes.parent_id = tree.id
+        )
+        SELECT nodes.id FROM tree JOIN nodes ON nodes.id = tree.id
+        WHERE nodes.ctype = 'document'
+        ORDER BY tree.depth DESC
+        LIMIT 1
+    """)
+    document_id = (
+        await db_session.execute(stmt, {"home_id": home.folder_id})
+    ).scalar() or home.folder_id
+
+    stmt = (
+        select(orm.Document.document_type_id)
+        .where(
+            orm.Document.id.in_(owned_nodes),
+            orm.Document.document_type_id.is_not(None),
+        )
+        .group_by(orm.Document.document_type_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    document_type_id = (await db_session.execute(stmt)).scalar()
+
+    return BenchmarkContext(
+        user_id=user_id,
+        folder_id=folder_id,
+        document_id=document_id,
+        document_type_id=document_type_id,
+        search_term=search_term,
+    )
+
+
+async def run_suite(
+    db_session: AsyncSession,
+    ctx: BenchmarkContext,
+    iterations: int = 20,
+    warmup: int = 3,
+    names: list[str] | None = None,
+) -> list[schema.BenchmarkResult]:
+    """Runs benchmark cases sequentially, one after another
+
+    Identity map is cleared before each call so that every iteration
+    loads its data from the database.
+    """
+    results = []
+    for name in names or list(CASES):
+        if name == "get_document_table_data" and ctx.document_type_id is None:
+            continue
+
+        case = CASES[name]
+        timings = []
+        for iteration in range(warmup + iterations):
+            db_session.expunge_all()
+            started = time.perf_counter()
+            await case(db_session, ctx)
+            if iteration >= warmup:
+                timings.append(time.perf_counter() - started)
+
+        results.append(summarize(name, timings))
+
+    return results
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    index = max(math.ceil(p * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+def summarize(name: str, timings: list[float]) -> schema.BenchmarkResult:
+    values = sorted(t * 1000 for t in timings)
+
+    return schema.BenchmarkResult(
+        name=name,
+        iterations=len(values),
+        min_ms=round(values[0], 3),
+        median_ms=round(percentile(values, 0.5), 3),
+        p95_ms=round(percentile(values, 0.95), 3),
+        max_ms=round(values[-1], 3),
+    )
+
+
+def compare(
+    results: list[schema.BenchmarkResult],
+    baseline: dict[str, schema.BenchmarkResult],
+    tolerance: float = 0.2,
+) -> list[schema.BenchmarkComparison]:
+    comparisons = []
+    for result in results:
+        base = baseline.get(result.name)
+        ratio = None
+        if base is not None and base.median_ms > 0:
+            ratio = round(result.median_ms / base.median_ms, 3)
+
+        comparisons.append(
+            schema.BenchmarkComparison(
+                name=result.name,
+                baseline_ms=base.median_ms if base else None,
+                current_ms=result.median_ms,
+                ratio=ratio,
+                regression=ratio is not None and ratio > 1 + tolerance,
+            )
+        )
+
+    return comparisons
+
+
+def save_baseline(path: Path, results: list[schema.BenchmarkResult]) -> None:
+    data = {result.name: result.model_dump() for result in results}
+    path.write_text(json.dumps(data, indent=2))
+
+
+def load_baseline(path: Path) -> dict[str, schema.BenchmarkResult]:
+    data = json.loads(path.read_text())
+
+    return {
+        name: schema.BenchmarkResult.model_validate(item)
+        for name, item in data.items()
+    }
@@ -0,0 +1,81 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from papermerge.core import orm
+from papermerge.core.features.benchmark import schema, suite
+from papermerge.core.features.benchmark.db import api as benchmark_dbapi
+
+
+async def test_generate_corpus(db_session: AsyncSession, system_user):
+    spec = schema.CorpusSpec(
+        prefix="bench",
+        users=2,
+        groups=1,
+        folder_depth=2,
+        folder_fanout=2,
+        documents=5,
+        pages_per_version=2,
+        words_per_page=10,
+        tags_per_user=3,
+        document_types_per_user=1,
+        custom_fields_per_type=3,
+        typed_ratio=1,
+        shared_folders_per_user=0,
+        batch_size=2,
+    )
+    progress = []
+
+    summary = await benchmark_dbapi.generate_corpus(
+        db_session, spec, on_progress=progress.append, created_by=system_user.id
+    )
+
+    assert summary.users == 2
+    assert summary.groups == 1
+    # (2 + 2 * 2) folders per user
+    assert summary.folders == 12
+    assert summary.documents == 5
+    assert summary.pages == 10
+    assert summary.custom_field_values == 15
+    assert progress == [2, 3, 5]
+
+    stmt = select(func.count(orm.Page.id)).join(orm.DocumentVersion).join(
+        orm.Document, orm.Document.id == orm.DocumentVersion.document_id
+    ).where(orm.Document.title.like("%.pdf"))
+    assert (await db_session.execute(stmt)).scalar() == 10
+
+    stmt = select(func.count(orm.Document.id)).where(
+        orm.Document.document_type_id.is_not(None)
+    )
+    assert (await db_session.execute(stmt)).scalar() == 5
+
+
+def test_compare_flags_regressions():
+    baseline = {
+        "fast": suite.summarize("fast", [0.010] * 5),
+        "slow": suite.summarize("slow", [0.010] * 5),
+    }
+    results = [
+        suite.summarize("fast", [0.011] * 5),
+        suite.summarize("slow", [0.013] * 5),
+        suite.summarize("new", [0.013] * 5),
+    ]
+
+    comparisons = {
+        item.name: item for item in suite.compare(results, baseline, tolerance=0.2)
+    }
+
+    assert not comparisons["fast"].regression
+    assert comparisons["slow"].regression
+    assert comparisons["slow"].ratio == 1.3
+    assert comparisons["new"].baseline_ms is None
+    assert not comparisons["new"].regression
+
+
+def test_summarize_percentiles():
+    result = suite.summarize("case", [i / 1000 for i in range(1, 21)])
+
+    assert result.iterations == 20
+    assert result.min_ms == 1
+    assert result.median_ms == 10
+    assert result.p95_ms == 19
+    assert result.max_ms == 20
@@ -0,0 +1,33 @@
+from papermerge.core.features.benchmark import imports
+
+OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       143 |        143 |   _io
+import time:        60 |        203 | io
+import time:      2500 |       2500 |     pikepdf._core
+import time:       700 |       3200 |   pikepdf
+import time:       100 |       3303 | papermerge.core.utils
+some unrelated warning
+"""
+
+
+def test_parse_importtime():
+    times = imports.parse_importtime(OUTPUT)
+
+    assert [item.module for item in times] == [
+        "_io", "io", "pikepdf._core", "pikepdf", "papermerge.core.utils"
+    ]
+    assert times[3].self_us == 700
+    assert times[3].cumulative_us == 3200
+    assert imports.total_us(times) == 3503
+
+
+def test_top_by_self_and_cumulative():
+    times = imports.parse_importtime(OUTPUT)
+
+    assert [item.module for item in imports.top(times, 2)] == [
+        "papermerge.core.utils", "pikepdf"
+    ]
+    assert [item.module for item in imports.top(times, 1, by="self")] == [
+        "pikepdf._core"
+    ]
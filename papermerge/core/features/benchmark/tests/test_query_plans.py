@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from papermerge.core.db import query_plans
+from papermerge.core.features.benchmark import schema, suite
+from papermerge.core.features.benchmark.db import api as benchmark_dbapi
+
+# Cases whose statements must be served by indexes (no sequential scans
+# on large tables even when the planner is forced to avoid them)
+INDEXED_CASES = ["get_paginated_nodes", "has_node_perm", "get_document_table_data"]
+# Max plan cost of any statement against the small test corpus
+COST_BUDGET = 10_000
+
+
+@pytest.fixture
+async def corpus_ctx(db_session: AsyncSession, system_user) -> suite.BenchmarkContext:
+    spec = schema.CorpusSpec(
+        prefix="plan",
+        users=2,
+        groups=1,
+        folder_depth=2,
+        folder_fanout=2,
+        documents=8,
+        words_per_page=5,
+        tags_per_user=3,
+        document_types_per_user=1,
+        custom_fields_per_type=3,
+        typed_ratio=1,
+        tagged_ratio=1,
+        shared_folders_per_user=0,
+    )
+    await benchmark_dbapi.generate_corpus(db_session, spec, created_by=system_user.id)
+
+    return await suite.load_context(db_session, "plan", search_term="vertrag")
+
+
+async def capture(db_session: AsyncSession, ctx, name: str):
+    db_session.expunge_all()
+    async with query_plans.capture_statements(db_session) as captured:
+        await suite.CASES[name](db_session, ctx)
+
+    assert captured, f"{name} issued no SELECT statements"
+    return captured
+
+
+@pytest.mark.parametrize("name", INDEXED_CASES)
+async def test_hot_queries_use_indexes(db_session: AsyncSession, corpus_ctx, name):
+    captured = await capture(db_session, corpus_ctx, name)
+
+    reports = await query_plans.check_statements(
+        db_session, captured, enable_seqscan=False
+    )
+
+    for report in reports:
+        assert report.seq_scans == [], (
+            f"Sequential scan of {report.seq_scans} in:\n{report.statement}"
+        )
+
+
+@pytest.mark.parametrize("name", list(suite.CASES))
+async def test_hot_queries_cost_budget(db_session: AsyncSession, corpus_ctx, name):
+    captured = await capture(db_session, corpus_ctx, name)
+
+    reports = await query_plans.check_statements(db_session, captured)
+
+    for report in reports:
+        assert report.total_cost <= COST_BUDGET, (
+            f"Plan cost {report.total_cost} exceeds {COST_BUDGET}:\n{report.statement}"
+        )
+
+
+def test_seq_scans_of_nested_plan():
+    plan = {
+        "Node Type": "Hash Join",
+        "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "nodes"},
+            {
+                "Node Type": "Hash",
+                "Plans": [{"Node Type": "Seq Scan", "Relation Name": "users"}],
+            },
+            {"Node Type": "Index Scan", "Relation Name": "pages"},
+        ],
+    }
+
+    assert query_plans.seq_scans(plan) == ["nodes"]
@@ -0,0 +1,19 @@
+import orjson
+
+from papermerge.core.features.benchmark import serialization
+
+
+def test_serialization_cases_produce_same_json():
+    rows = serialization.make_rows(6)
+
+    bodies = {
+        name: orjson.loads(case(rows)) for name, case in serialization.CASES.items()
+    }
+
+    expected = bodies["validate+json"]
+    assert len(expected["items"]) == 6
+    assert expected["items"][1]["thumbnail_url"] == (
+        f"/api/thumbnails/{rows[1]['id']}"
+    )
+    for name, body in bodies.items():
+        assert body == expected, name
@@ -0,0 +1,36 @@
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from papermerge.core.features.benchmark import statements
+
+
+def test_cached_statements_compile_to_same_sql_as_rebuilt():
+    dialect = asyncpg.dialect()
+    for name, (factory, _) in statements.STATEMENTS.items():
+        assert factory() is factory(), name
+        assert str(factory().compile(dialect=dialect)) == str(
+            factory.__wrapped__().compile(dialect=dialect)
+        ), name
+
+
+def test_prepare_reuses_compiled_statement():
+    dialect = asyncpg.dialect()
+    compiled_cache = {}
+    factory, param_names = statements.STATEMENTS["node_perm"]
+    params = {key: value for key, value in statements._params().items() if key in param_names}
+
+    first = statements.prepare(factory(), params, dialect, compiled_cache)
+    second = statements.prepare(factory.__wrapped__(), params, dialect, compiled_cache)
+
+    assert len(compiled_cache) == 1
+    assert first == second
+    assert params["node_id"] in first.values()
+
+
+def test_run_reports_rebuilt_and_cached_cases():
+    results = statements.run(calls=2, iterations=1, warmup=0)
+
+    assert [result.name for result in results] == [
+        f"{name} {case}"
+        for name in statements.STATEMENTS
+        for case in ("rebuilt", "cached")
+    ]
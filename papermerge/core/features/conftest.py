@@ -23,7 +23,7 @@ from papermerge.core.tests.resource_file import ResourceFile
 from papermerge.core.types import OCRStatusEnum
 from papermerge.core.features.auth.scopes import SCOPES
 from papermerge.core.db.base import Base
-from papermerge.core.db.engine import engine, get_db
+from papermerge.core.db.engine import engine, get_db, get_db_readonly
 from papermerge.core.features.document.db import api as doc_dbapi
 from papermerge.core.features.document import schema as doc_schema
 from papermerge.core.features.custom_fields.schema import CustomFieldType
@@ -403,6 +403,7 @@ async def api_client(db_session):
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_db_readonly] = override_get_db
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as c:
@@ -430,6 +431,7 @@ async def auth_api_client(db_session, user: orm.User):
     token = f"abc.{middle_part}.xyz"
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_db_readonly] = override_get_db
     transport = ASGITransport(app=app)
 
     async with AsyncClient(
@@ -464,6 +466,7 @@ async def make_api_client(make_user, db_session):
         )
         token = f"abc.{middle_part}.xyz"
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_db_readonly] = override_get_db
         transport = ASGITransport(app=app)
         async_client = AsyncClient(
             transport=transport,
@@ -483,6 +486,7 @@ async def login_as(db_session):
     async def _make(user):
         app = test_utils.get_app_with_routes()
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_db_readonly] = override_get_db
 
         middle_part = utils.base64.encode(
             {
@@ -34,7 +34,7 @@ logger = logging.getLogger(__name__)
 )
 async def get_custom_fields_without_pagination(
     user: scopes.ViewCustomFields,
-    db_session: db.DBRouterAsyncSession,
+    db_session: db.DBReadOnlyAsyncSession,
     group_id: uuid.UUID | None = None,
     document_type_id: uuid.UUID | None = None,
 ) -> list[cf_schema.CustomField]:
@@ -72,7 +72,7 @@ async def get_custom_fields_without_pagination(
 @router.get("/")
 async def get_custom_fields(
     user: scopes.ViewCustomFields,
-    db_session: db.DBRouterAsyncSession,
+    db_session: db.DBReadOnlyAsyncSession,
     # Without = Depends(), FastAPI interprets
     # params: CustomFieldParams as a request body (JSON), not query parameters.
     params: CustomFieldParams = Depends(),
@@ -105,7 +105,7 @@ async def get_custom_fields(
 @router.get("/{custom_field_id}")
 async def get_custom_field(
     custom_field_id: uuid.UUID,
-    db_session: db.DBRouterAsyncSession,
+    db_session: db.DBReadOnlyAsyncSession,
     user: scopes.ViewCustomFields,
 ) -> cf_schema.CustomFieldDetails:
     """Get custom field"""
@@ -279,7 +279,7 @@ async def update_custom_field(
 @router.get("/{custom_field_id}/usage-counts")
 async def get_option_usage_counts(
     custom_field_id: uuid.UUID,
-    db_session: db.DBRouterAsyncSession,
+    db_session: db.DBReadOnlyAsyncSession,
     user: scopes.ViewCustomFields,
     # Query(...) means "required, no default value"
     option_values: list[str] = Query(..., min_length=1),
@@ -1,32 +1,205 @@
+import asyncio
+import hashlib
+import os
 import uuid
-import typer
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
-from papermerge.core.tasks import send_task
-from papermerge.core.db.engine import Session
+import typer
+from rich.console import Console
+from rich.progress import Progress, BarColumn, TaskProgressColumn, TextColumn
+from sqlalchemy import select, update
 
-from papermerge.core import dbapi, constants, types
+from papermerge.core.db.engine import AsyncSessionLocal
+from papermerge.core.pathlib import abs_docver_path
+from papermerge.core.utils.cli import async_command
+from papermerge.core.utils.pdf import relinearize
+from papermerge.core.types import MimeType, StorageBackend
+from papermerge.core.utils.tz import utc_now
+from papermerge.core.features.tasks import ocr
+from papermerge.core import config, orm
 
 
-app = typer.Typer(help="OCR tasks")
+app = typer.Typer(help="Document tasks (OCR, PDF maintenance)")
+console = Console()
+settings = config.get_settings()
 
 
 @app.command()
-def schedule_ocr(node_id: uuid.UUID, force: bool = False, lang: str | None = None):
-    """Schedules OCR for given node ID"""
-    with Session() as db_session:
-        node_type: types.CType = dbapi.get_node_type(db_session, node_id)
-
-        if node_type == "document":
-            if lang is None:
-                lang = dbapi.get_document_lang(db_session, node_id)
-            send_task(
-                constants.WORKER_OCR_DOCUMENT,
-                kwargs={
-                    "document_id": str(node_id),
-                    "lang": lang,
-                },
-                route_name="ocr",
-            )
-        else:
-            # get all descendants of node_id
-            pass
+@async_command
+async def schedule_ocr(
+    node_ids: list[uuid.UUID] = typer.Argument(..., help="Folder and/or document IDs"),
+    force: bool = typer.Option(False, help="OCR also documents which already have text"),
+    lang: str | None = typer.Option(None, help="Override language of the documents"),
+    priority: int | None = typer.Option(None, min=0, max=9, help="Broker message priority"),
+    batch_size: int = typer.Option(
+        settings.ocr_schedule_batch_size, min=1, help="Tasks published per broker connection"
+    ),
+    rate: float = typer.Option(
+        settings.ocr_schedule_rate, min=0, help="Max documents per second (0 = no limit)"
+    ),
+    dry_run: bool = typer.Option(False, help="Only count the documents"),
+):
+    """Schedules OCR for given documents and all documents of given folders"""
+    async with AsyncSessionLocal() as db_session:
+        missing = [
+            node_id for node_id in node_ids
+            if await db_session.get(orm.Node, node_id) is None
+        ]
+        if missing:
+            console.print(f"[red]Nodes {', '.join(map(str, missing))} not found[/red]")
+            raise typer.Exit(code=1)
+
+        schedule = await ocr.plan(db_session, node_ids, force=force, lang=lang)
+
+    console.print(
+        f"{len(schedule.documents)} documents to OCR, "
+        f"{schedule.skipped} skipped (already have text)"
+    )
+    if dry_run or not schedule.documents:
+        return
+
+    with Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TaskProgressColumn(),
+        console=console,
+    ) as progress:
+        task = progress.add_task("Scheduling OCR...", total=len(schedule.documents))
+        published = await ocr.publish_ocr_tasks(
+            schedule.documents,
+            priority=priority,
+            batch_size=batch_size,
+            rate=rate,
+            on_progress=lambda done, total: progress.update(task, completed=done),
+        )
+
+    console.print(f"Scheduled OCR of {published} documents")
+
+
+def relinearize_version(
+    path: Path, checksum_algorithm: str | None
+) -> tuple[int, str | None] | None:
+    """Linearizes version file; returns its new size and checksum
+
+    Returns None if the file was already linearized. Checksum is computed
+    only if the version has one (with its algorithm).
+    """
+    if not relinearize(path):
+        return None
+
+    checksum = None
+    if checksum_algorithm:
+        try:
+            digest = hashlib.new(checksum_algorithm.lower())
+        except ValueError:
+            digest = None
+        if digest is not None:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            checksum = digest.hexdigest()
+
+    return path.stat().st_size, checksum
+
+
+@app.command("relinearize")
+@async_command
+async def relinearize_versions(
+    workers: int = typer.Option(
+        os.cpu_count() or 1,
+        min=1,
+        help="Number of worker processes rewriting PDF files",
+    ),
+    document_id: list[uuid.UUID] | None = typer.Option(
+        None,
+        help="Limit to (all versions of) these documents",
+    ),
+):
+    """Re-save existing PDF document versions as linearized PDFs
+
+    Linearized ("fast web view") PDFs can be rendered by browser
+    viewers after downloading only the first part of the file.
+    Files which are already linearized are left untouched. Size,
+    checksum and modification time of rewritten versions are updated
+    (download ETags change accordingly). Only local storage is supported.
+    """
+    if settings.storage_backend != StorageBackend.LOCAL.value:
+        console.print(
+            "[red]Only local storage is supported: files in S3/R2 "
+            "would not be updated[/red]"
+        )
+        raise typer.Exit(code=1)
+
+    stmt = select(
+        orm.DocumentVersion.id,
+        orm.DocumentVersion.file_name,
+        orm.DocumentVersion.checksum,
+        orm.DocumentVersion.checksum_algorithm,
+    ).where(
+        orm.DocumentVersion.mime_type == MimeType.application_pdf,
+        orm.DocumentVersion.size > 0,
+    )
+    if document_id:
+        stmt = stmt.where(orm.DocumentVersion.document_id.in_(document_id))
+
+    async with AsyncSessionLocal() as db_session:
+        rows = (await db_session.execute(stmt)).all()
+
+    total = len(rows)
+    versions = []
+    for row in rows:
+        path = abs_docver_path(row.id, row.file_name)
+        if path.exists():
+            algorithm = row.checksum_algorithm if row.checksum else None
+            versions.append((row.id, path, algorithm))
+
+    changed = skipped = failed = 0
+    loop = asyncio.get_running_loop()
+
+    async def relinearize_one(executor, doc_ver_id, path, algorithm):
+        result = await loop.run_in_executor(
+            executor, relinearize_version, path, algorithm
+        )
+        return doc_ver_id, result
+
+    with Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TaskProgressColumn(),
+        console=console,
+    ) as progress:
+        task = progress.add_task("Linearizing PDF files...", total=len(versions))
+        async with AsyncSessionLocal() as db_session:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    relinearize_one(executor, *version) for version in versions
+                ]
+                for future in asyncio.as_completed(futures):
+                    try:
+                        doc_ver_id, result = await future
+                        if result is None:
+                            skipped += 1
+                        else:
+                            size, checksum = result
+                            values = {"size": size, "updated_at": utc_now()}
+                            if checksum is not None:
+                                values["checksum"] = checksum
+                            await db_session.execute(
+                                update(orm.DocumentVersion)
+                                .where(orm.DocumentVersion.id == doc_ver_id)
+                                .values(**values)
+                            )
+                            await db_session.commit()
+                            changed += 1
+                    except Exception as e:
+                        await db_session.rollback()
+                        failed += 1
+                        console.print(f"[red]✗[/red] {e}")
+                    progress.advance(task)
+
+    console.print(
+        f"{total} PDF versions: {changed} linearized, "
+        f"{skipped} already linearized, {total - len(versions)} missing files, "
+        f"{failed} failed"
+    )
@@ -1,12 +1,12 @@
+import functools
 import math
 import io
 import logging
 import os
 from os.path import getsize
 import uuid
-from typing import Tuple, Sequence, Any, Optional, Dict
+from typing import Tuple, Sequence, Any, Optional, Dict, Iterable
 
-from pikepdf import Pdf
 from sqlalchemy import (
     delete,
     func,
@@ -16,13 +16,23 @@ from sqlalchemy import (
     Select,
     and_,
     or_,
-    case
+    case,
+    bindparam,
+    cast,
+    insert,
+    literal,
+    Integer,
+    Text,
+    Uuid,
 )
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
 from sqlalchemy.exc import NoResultFound
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import joinedload, selectinload, aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from papermerge.core.utils.tz import utc_now
+from papermerge.core.utils.pdf import save_pdf
 from papermerge.core.db.common import (
     get_shared_root_for_user,
     truncate_breadcrumb_at_shared_root,
@@ -46,14 +56,60 @@ settings = config.get_settings()
 logger = logging.getLogger(__name__)
 
 
-async def load_doc(db_session: AsyncSession, doc_id: uuid.UUID) -> orm.Document:
-    stmt = select(orm.Document).options(
-        selectinload(orm.Document.tags),
-        selectinload(orm.Document.versions).selectinload(orm.DocumentVersion.pages)
-    ).where(orm.Document.id == doc_id)
+async def load_doc(
+    db_session: AsyncSession,
+    doc_id: uuid.UUID,
+    all_versions: bool = False,
+) -> schema.Document:
+    """Document with its tags and versions (with their pages)
+
+    By default `versions` holds only the last version of the document:
+    documents may have many versions with many pages each, and responses
+    built from the loaded document need only the last one (the full list
+    of versions is available via `get_doc_versions_list`). With
+    `all_versions=True` every version, with all its pages, is loaded.
+
+    The last version is queried separately: the mapped `Document.versions`
+    collection is never narrowed down to it, as the session (with
+    `expire_on_commit=False`) would keep the truncated collection.
+    """
+    stmt = (
+        select(orm.Document)
+        .options(selectinload(orm.Document.tags))
+        .where(orm.Document.id == doc_id)
+    )
+    if all_versions:
+        stmt = stmt.options(
+            selectinload(orm.Document.versions).selectinload(
+                orm.DocumentVersion.pages
+            )
+        ).execution_options(populate_existing=True)
 
-    result = await db_session.execute(stmt)
-    return result.scalar_one()
+    doc = (await db_session.execute(stmt)).scalar_one()
+    if all_versions:
+        return schema.Document.model_validate(doc)
+
+    last_ver = (
+        await db_session.scalars(
+            # pages of the version may have been inserted in bulk
+            last_doc_ver_stmt().execution_options(populate_existing=True),
+            {"doc_id": doc_id},
+        )
+    ).one()
+    node = schema.DocumentNode.model_validate(doc)
+
+    return schema.Document(
+        **dict(node), versions=[schema.DocumentVersion.model_validate(last_ver)]
+    )
+
+
+async def next_version_number(db_session: AsyncSession, doc_id: uuid.UUID) -> int:
+    """Number of the next version of `doc_id` document"""
+    stmt = select(
+        func.coalesce(func.max(orm.DocumentVersion.number), 0) + 1
+    ).where(orm.DocumentVersion.document_id == doc_id)
+
+    return (await db_session.execute(stmt)).scalar_one()
 
 
 async def count_docs(session: AsyncSession) -> int:
@@ -558,12 +614,20 @@ async def version_bump(
     user_id: uuid.UUID,
     page_count: int | None = None,
     short_description: str | None = None,
+    src_version_id: uuid.UUID | None = None,
+    src_page_numbers: list[int] | None = None,
 ) -> orm.DocumentVersion:
-    """Increment document version"""
+    """Increment document version
+
+    If ``src_version_id`` and ``src_page_numbers`` are provided, the
+    text of the i-th page of the new version is copied (server side)
+    from page number ``src_page_numbers[i]`` of the source version.
+    """
 
     last_ver = await get_last_doc_ver(db_session, doc_id=doc_id)
     new_page_count = page_count or last_ver.page_count
     db_new_doc_ver = orm.DocumentVersion(
+        id=uuid.uuid4(),
         document_id=doc_id,
         number=last_ver.number + 1,
         file_name=last_ver.file_name,
@@ -577,17 +641,19 @@ async def version_bump(
     )
 
     db_session.add(db_new_doc_ver)
+    await db_session.flush()
 
-    for page_number in range(1, new_page_count + 1):
-        db_page = orm.Page(
-            document_version=db_new_doc_ver,
-            number=page_number,
-            page_count=new_page_count,
-            lang=last_ver.lang,
-        )
-        db_session.add(db_page)
+    await insert_pages(
+        db_session,
+        document_version_id=db_new_doc_ver.id,
+        page_count=new_page_count,
+        lang=last_ver.lang,
+        src_version_id=src_version_id,
+        src_page_numbers=src_page_numbers,
+    )
 
     await db_session.commit()
+    await db_session.refresh(db_new_doc_ver, ["pages", "text"])
 
     return db_new_doc_ver
 
@@ -601,8 +667,10 @@ async def version_bump_from_pages(
     Creates new version for the document `dst-document-id`
 
     PDF pages in the newly create document version is copied
-    from ``pages``.
+    from ``pages``. Text of the pages is copied as well.
     """
+    from pikepdf import Pdf
+
     first_page = pages[0]
     page_count = len(pages)
     error = None
@@ -619,10 +687,12 @@ async def version_bump_from_pages(
 
     if not dst_document_version:
         dst_document_version = orm.DocumentVersion(
+            id=uuid.uuid4(),
             document_id=dst_document_id,
-            number=len(dst_doc.versions) + 1,
+            number=await next_version_number(db_session, dst_document_id),
             lang=dst_doc.lang,
         )
+        db_session.add(dst_document_version)
 
     source_pdf = Pdf.open(first_page.document_version.file_path)
     dst_pdf = Pdf.new()
@@ -637,19 +707,20 @@ async def version_bump_from_pages(
     dirname = os.path.dirname(dst_document_version.file_path)
     os.makedirs(dirname, exist_ok=True)
 
-    dst_pdf.save(dst_document_version.file_path)
+    save_pdf(dst_pdf, dst_document_version.file_path)
 
     dst_document_version.size = getsize(dst_document_version.file_path)
 
-    for page_number in range(1, page_count + 1):
-        db_page = orm.Page(
+    try:
+        await db_session.flush()
+        await insert_pages(
+            db_session,
             document_version_id=dst_document_version.id,
-            number=page_number,
             page_count=page_count,
             lang=dst_doc.lang,
+            src_version_id=first_page.document_version_id,
+            src_page_numbers=[page.number for page in pages],
         )
-        db_session.add(db_page)
-    try:
         await db_session.commit()
     except Exception as e:
         error = schema.Error(messages=[str(e)])
@@ -663,33 +734,151 @@ async def version_bump_from_pages(
     return dst_doc, None
 
 
-async def update_text_field(db_session: AsyncSession, document_version_id: uuid.UUID, streams):
+async def insert_pages(
+    db_session: AsyncSession,
+    document_version_id: uuid.UUID,
+    page_count: int,
+    lang: str,
+    src_version_id: uuid.UUID | None = None,
+    src_page_numbers: list[int] | None = None,
+) -> None:
+    """Insert all page rows of (newly created) document version
+
+    Page rows are inserted with one bulk INSERT. When ``src_version_id``
+    and ``src_page_numbers`` are given, page rows are created with
+    ``INSERT ... SELECT`` which copies page text from the source version
+    inside the database (page number i + 1 gets the text of source page
+    number ``src_page_numbers[i]``); the document version's text is then
+    re-computed from its pages.
+    """
+    if page_count <= 0:
+        return
+
+    page_ids = [uuid.uuid4() for _ in range(page_count)]
+
+    if src_version_id is None or src_page_numbers is None:
+        await db_session.execute(
+            insert(orm.Page),
+            [
+                {
+                    "id": page_id,
+                    "number": number,
+                    "page_count": page_count,
+                    "lang": lang,
+                    "document_version_id": document_version_id,
+                }
+                for number, page_id in enumerate(page_ids, start=1)
+            ],
+        )
+        return
+
+    src = func.unnest(
+        bindparam("page_ids", page_ids, type_=ARRAY(Uuid)),
+        bindparam("src_numbers", src_page_numbers, type_=ARRAY(Integer)),
+    ).table_valued(
+        "id", "src_number", with_ordinality="number"
+    ).render_derived(name="src")
+    src_page = aliased(orm.Page)
+
+    rows = (
+        select(
+            src.c.id,
+            cast(src.c.number, Integer),
+            literal(page_count, Integer),
+            literal(lang, Text),
+            src_page.text,
+            literal(document_version_id, Uuid),
+        )
+        .select_from(src)
+        .outerjoin(
+            src_page,
+            and_(
+                src_page.document_version_id == src_version_id,
+                src_page.number == src.c.src_number,
+            ),
+        )
+    )
+    await db_session.execute(
+        insert(orm.Page).from_select(
+            ["id", "number", "page_count", "lang", "text", "document_version_id"],
+            rows,
+        )
+    )
+    await update_version_text(db_session, document_version_id)
+
+
+async def update_version_text(
+    db_session: AsyncSession, document_version_id: uuid.UUID
+) -> None:
+    """Set document version's text to concatenated text of its pages
+
+    Concatenation is done by the database, page text is not loaded
+    into Python.
+    """
+    pages_text = (
+        select(
+            func.string_agg(
+                func.nullif(func.btrim(orm.Page.text), ""),
+                aggregate_order_by(literal(" ", Text), orm.Page.number),
+            )
+        )
+        .where(orm.Page.document_version_id == document_version_id)
+        .scalar_subquery()
+    )
+    await db_session.execute(
+        update(orm.DocumentVersion)
+        .where(orm.DocumentVersion.id == document_version_id)
+        .values(text=pages_text)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def update_text_field(
+    db_session: AsyncSession,
+    document_version_id: uuid.UUID,
+    streams: Iterable[io.StringIO | str],
+):
     """Update document versions's text field from IO streams.
 
     Arguments:
-        ``streams`` - a list of IO text streams
+        ``streams`` - an iterable of IO text streams (or plain strings),
+            i-th item being the text of page number i + 1
 
     It will update text field of all associated pages first
     and then concatinate all text field into doc.text field.
+    Only pages without text are updated.
+
+    Regardless of the number of pages, texts are written with two
+    statements: one ``UPDATE pages ... FROM unnest(...)`` for all pages
+    and one UPDATE for the document version.
     """
-    text = []
+    numbers = []
+    texts = []
+    for number, stream in enumerate(streams, start=1):
+        numbers.append(number)
+        texts.append(stream if isinstance(stream, str) else stream.read())
 
-    stmt = (
-        select(orm.Page.id, orm.Page.text, orm.Page.number)
-        .where(orm.Page.document_version_id == document_version_id)
-        .order_by(orm.Page.number)
-    )
+    if not numbers:
+        return
 
-    pages = [(row.id, row.text, row.number) for row in await db_session.execute(stmt)]
+    page_texts = func.unnest(
+        bindparam("numbers", numbers, type_=ARRAY(Integer)),
+        bindparam("texts", texts, type_=ARRAY(Text)),
+    ).table_valued("number", "text").render_derived(name="page_texts")
 
-    for page, stream in zip(pages, streams):
-        if page[1] is None:  # page.text
-            txt = stream.read()
-            sql = update(orm.Page).where(orm.Page.id == page[0]).values(text=txt)
-            await db_session.execute(sql)
-            text.append(txt.strip())
+    stmt = (
+        update(orm.Page)
+        .where(
+            orm.Page.document_version_id == document_version_id,
+            orm.Page.number == page_texts.c.number,
+            orm.Page.text.is_(None),
+        )
+        .values(text=page_texts.c.text)
+        .returning(orm.Page.number, orm.Page.text)
+    )
+    updated = sorted((await db_session.execute(stmt)).all())
 
-    stripped_text = " ".join(text)
+    stripped_text = " ".join((row.text or "").strip() for row in updated)
     stripped_text = stripped_text.strip()
     if stripped_text:
         sql = (
@@ -730,6 +919,8 @@ def file_type(content_type: str) -> str:
 
 
 def get_pdf_page_count(content: io.BytesIO | bytes) -> int:
+    from pikepdf import Pdf
+
     if isinstance(content, bytes):
         pdf = Pdf.open(io.BytesIO(content))
     else:
@@ -764,7 +955,7 @@ async def create_next_version(
         document_version = orm.DocumentVersion(
             id=document_version_id or uuid.uuid4(),
             document_id=doc.id,
-            number=len(doc.versions) + 1,
+            number=await next_version_number(db_session, doc.id),
             lang=doc.lang,
             created_by=created_by,
             updated_by=created_by,
@@ -824,13 +1015,7 @@ async def save_upload_metadata(
     owner = await get_node_owner(db_session, node_id=doc.id)
     doc.owner_name = owner.name
 
-    stmt = select(orm.Document).options(
-        selectinload(orm.Document.tags),
-        selectinload(orm.Document.versions).selectinload(orm.DocumentVersion.pages)
-    ).where(orm.Document.id == doc.id)
-
-    result = await db_session.execute(stmt)
-    doc_with_relations = result.scalar_one()
+    doc_with_relations = await load_doc(db_session, doc.id)
 
     validated_model = schema.Document.model_validate(doc_with_relations)
 
@@ -1011,27 +1196,47 @@ async def get_doc_ver_pages(db_session: AsyncSession, doc_ver_id: uuid.UUID) ->
     return models
 
 
-async def get_last_doc_ver(
-        db_session: AsyncSession,
-        doc_id: uuid.UUID,  # noqa
-) -> orm.DocumentVersion:
-    """
-    Returns last version of the document
-    identified by doc_id
-    """
+@functools.cache
+def last_doc_ver_stmt() -> Select:
+    """Last version (with its pages) of `:doc_id` document
 
-    stmt = (
+    Built once and reused, like the hot statements of `db.common`.
+    """
+    return (
         select(orm.DocumentVersion).options(
             selectinload(orm.DocumentVersion.pages)
         )
         .join(orm.Document)
         .where(
-            orm.DocumentVersion.document_id == doc_id,
+            orm.DocumentVersion.document_id == bindparam("doc_id"),
             )
         .order_by(orm.DocumentVersion.number.desc())
         .limit(1)
     )
-    return (await db_session.scalars(stmt)).one()
+
+
+@functools.cache
+def first_page_stmt() -> Select:
+    """First page of `:doc_ver_id` document version"""
+    return (
+        select(orm.Page)
+        .where(
+            orm.Page.document_version_id == bindparam("doc_ver_id"),
+            )
+        .order_by(orm.Page.number.asc())
+        .limit(1)
+    )
+
+
+async def get_last_doc_ver(
+        db_session: AsyncSession,
+        doc_id: uuid.UUID,  # noqa
+) -> orm.DocumentVersion:
+    """
+    Returns last version of the document
+    identified by doc_id
+    """
+    return (await db_session.scalars(last_doc_ver_stmt(), {"doc_id": doc_id})).one()
 
 
 async def get_first_page(
@@ -1043,18 +1248,80 @@ async def get_first_page(
     identified by doc_ver_id
     """
     async with db_session as session:  # noqa
-        stmt = (
-            select(orm.Page)
-            .where(
-                orm.Page.document_version_id == doc_ver_id,
-                )
-            .order_by(orm.Page.number.asc())
-            .limit(1)
+        db_page = (
+            await session.scalars(first_page_stmt(), {"doc_ver_id": doc_ver_id})
+        ).one()
+
+    return db_page
+
+
+async def get_thumbnail_pages(
+        db_session: AsyncSession,
+        doc_ids: list[uuid.UUID],
+) -> dict[uuid.UUID, Row]:
+    """First pages of the last versions of `doc_ids` documents
+
+    One query for all documents. Returned dictionary maps document ID to a
+    row with `page_id`, `page_number`, `doc_ver_id` and `file_name`;
+    documents whose last version has no pages yet (e.g. still being
+    uploaded) are not in the dictionary.
+    """
+    if not doc_ids:
+        return {}
+
+    other_ver = aliased(orm.DocumentVersion)
+    last_number = (
+        select(func.max(other_ver.number))
+        .where(other_ver.document_id == orm.DocumentVersion.document_id)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            orm.DocumentVersion.document_id.label("doc_id"),
+            orm.DocumentVersion.id.label("doc_ver_id"),
+            orm.DocumentVersion.file_name,
+            orm.Page.id.label("page_id"),
+            orm.Page.number.label("page_number"),
+        )
+        .join(orm.Page, orm.Page.document_version_id == orm.DocumentVersion.id)
+        .where(
+            orm.DocumentVersion.document_id.in_(doc_ids),
+            orm.DocumentVersion.number == last_number,
         )
+        .distinct(orm.DocumentVersion.document_id)
+        .order_by(orm.DocumentVersion.document_id, orm.Page.number.asc())
+    )
 
-        db_page = (await session.scalars(stmt)).one()
+    return {row.doc_id: row for row in await db_session.execute(stmt)}
 
-    return db_page
+
+@functools.cache
+def page_thumbnail_stmt() -> Select:
+    """Document, version and file name of `:page_id` page"""
+    return (
+        select(
+            orm.DocumentVersion.document_id.label("doc_id"),
+            orm.DocumentVersion.id.label("doc_ver_id"),
+            orm.DocumentVersion.file_name,
+            orm.Page.id.label("page_id"),
+            orm.Page.number.label("page_number"),
+        )
+        .join(orm.Page, orm.Page.document_version_id == orm.DocumentVersion.id)
+        .where(orm.Page.id == bindparam("page_id"))
+    )
+
+
+async def get_page_thumbnail_source(
+        db_session: AsyncSession,
+        page_id: uuid.UUID,
+) -> Row:
+    """Row with `doc_id`, `doc_ver_id`, `file_name` and `page_number` of the page
+
+    Raises ``NoResultFound`` if there is no such page.
+    """
+    result = await db_session.execute(page_thumbnail_stmt(), {"page_id": page_id})
+
+    return result.one()
 
 
 async def get_doc_ver(
@@ -1128,6 +1395,65 @@ async def get_last_ver_pages(
     return (await db_session.execute(stmt)).scalars().all()
 
 
+async def get_docs_status(
+    db_session: AsyncSession, doc_ids: list[uuid.UUID]
+) -> list[schema.DocumentStatusEvent]:
+    """Current processing, preview and OCR statuses of given documents"""
+    stmt = select(
+        orm.Document.id,
+        orm.Document.processing_status,
+        orm.Document.preview_status,
+        orm.Document.ocr_status,
+    ).where(orm.Document.id.in_(doc_ids))
+
+    return [
+        schema.DocumentStatusEvent.model_validate(row)
+        for row in await db_session.execute(stmt)
+    ]
+
+
+async def get_ocr_candidates(
+    db_session: AsyncSession, node_ids: list[uuid.UUID]
+) -> list[tuple[uuid.UUID, str, bool]]:
+    """Returns documents among `node_ids` and their descendants
+
+    For each document: its ID, lang and whether its last version
+    already has text. Whole selection is resolved with one query.
+    """
+    if len(node_ids) < 1:
+        raise ValueError("len(node_ids) must be >= 1 ")
+
+    nodes_anchor = (
+        select(orm.Node.id)
+        .where(orm.Node.id.in_(node_ids))
+        .cte(recursive=True, name="tree")
+    )
+    # UNION (not UNION ALL): selection may contain both a folder and
+    # some of its descendants
+    tree = nodes_anchor.union(
+        select(orm.Node.id).where(nodes_anchor.c.id == orm.Node.parent_id)
+    )
+    last_version_text = (
+        select(orm.DocumentVersion.text)
+        .where(orm.DocumentVersion.document_id == orm.Document.id)
+        .order_by(orm.DocumentVersion.number.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            orm.Document.id,
+            orm.Document.lang,
+            (func.coalesce(last_version_text, "") != "").label("has_text"),
+        )
+        .join(tree, tree.c.id == orm.Document.id)
+        .order_by(orm.Document.id)
+    )
+    result = await db_session.execute(stmt)
+
+    return [(row.id, row.lang, row.has_text) for row in result]
+
+
 async def get_docs_thumbnail_img_status(
         db_session: AsyncSession,
         doc_ids: list[uuid.UUID]
@@ -1172,12 +1498,19 @@ async def get_docs_thumbnail_img_status(
             )
             items.append(item)
     else:
-        # Non-CDN setup
+        # Non-CDN setup: thumbnails keyed by page ID where the page is
+        # known already (cheaper to serve and cacheable forever)
+        pages = await get_thumbnail_pages(db_session, doc_ids)
         for row in await db_session.execute(stmt):
+            page = pages.get(row.doc_id)
+            if page is None:
+                url = f"/api/thumbnails/{row.doc_id}"
+            else:
+                url = f"/api/thumbnails/pages/{page.page_id}"
             item = schema.DocumentPreviewImageStatus(
                 doc_id=row.doc_id,
                 status=ImagePreviewStatus.ready,
-                preview_image_url=f"/api/thumbnails/{row.doc_id}"
+                preview_image_url=url
             )
             items.append(item)
 
@@ -2,7 +2,7 @@ import uuid
 from uuid import UUID
 from pathlib import Path
 
-from sqlalchemy import ForeignKey, Enum
+from sqlalchemy import ForeignKey, Enum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from papermerge.core.db.audit_cols import AuditColumns
@@ -59,6 +59,10 @@ class Document(Node):
         back_populates="document", lazy="selectin"
     )
 
+    __table_args__ = (
+        Index('idx_documents_document_type_id', 'document_type_id'),
+    )
+
     __mapper_args__ = {
         "polymorphic_identity": "document",
     }
@@ -118,6 +122,10 @@ class DocumentVersion(Base, AuditColumns):
         back_populates="document_version", lazy="select"
     )
 
+    __table_args__ = (
+        Index('idx_document_versions_document_id', 'document_id'),
+    )
+
     @property
     def file_path(self) -> Path:
         return abs_docver_path(self.id, self.file_name)
@@ -138,5 +146,10 @@ class Page(Base):
         ForeignKey("document_versions.id", ondelete="CASCADE")
     )
     document_version: Mapped[DocumentVersion] = relationship(back_populates="pages")
+
+    __table_args__ = (
+        Index('idx_pages_document_version_id', 'document_version_id'),
+    )
+
     def __repr__(self):
         return f"Page(id={self.id}, number={self.number})"
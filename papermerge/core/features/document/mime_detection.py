@@ -11,8 +11,6 @@ import io
 import logging
 from typing import Optional
 
-import pikepdf
-from PIL import Image
 
 from papermerge.core.types import MimeType
 
@@ -123,6 +121,9 @@ def validate_file_structure(content: bytes, mime_type: MimeType) -> None:
     Raises:
         InvalidFileError: If file is corrupted or cannot be processed
     """
+    from PIL import Image
+    import pikepdf
+
     try:
         if mime_type == MimeType.application_pdf:
             # Validate PDF structure using pikepdf
@@ -271,6 +272,9 @@ def get_file_info(content: bytes, filename: str) -> dict:
         UnsupportedFileTypeError: If file type is not supported
         InvalidFileError: If file is corrupted
     """
+    from PIL import Image
+    import pikepdf
+
     mime_type = detect_and_validate_mime_type(content, filename)
 
     info = {
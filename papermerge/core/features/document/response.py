@@ -1,8 +1,19 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from pathlib import Path
 import mimetypes
+import uuid
 from urllib.parse import quote
 
-from fastapi.responses import FileResponse
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+# Document version files are never changed once written: clients may keep
+# them as long as they like (still "private" as they are user data)
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+# Content behind the URL may change (e.g. document thumbnail after new
+# version was created): clients need to revalidate, which is cheap via ETag
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
 
 
 class DocumentFileResponse(FileResponse):
@@ -45,3 +56,93 @@ class DocumentFileResponse(FileResponse):
             media_type=content_type,
             **kwargs
         )
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag built from our own (immutable) identifiers"""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(
+    request: Request,
+    etag: str,
+    last_modified: datetime | None = None,
+) -> bool:
+    """Evaluates `If-None-Match` and `If-Modified-Since` request headers
+
+    As per RFC 9110, `If-Modified-Since` is considered only when
+    `If-None-Match` is absent.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+    # HTTP dates have one second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def cache_headers(
+    etag: str,
+    cache_control: str,
+    last_modified: datetime | None = None,
+) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+class NotModifiedResponse(Response):
+    def __init__(self, headers: dict[str, str]):
+        super().__init__(status_code=304, headers=headers)
+
+
+class MultipartResponse(Response):
+    """`multipart/mixed` response; `parts` are `(headers, body)` tuples"""
+
+    def __init__(
+        self,
+        parts: list[tuple[dict[str, str], bytes]],
+        headers: dict[str, str] | None = None,
+        status_code: int = 200,
+    ):
+        boundary = uuid.uuid4().hex
+        chunks = []
+        for part_headers, body in parts:
+            chunks.append(f"--{boundary}\r\n".encode())
+            for name, value in part_headers.items():
+                chunks.append(f"{name}: {value}\r\n".encode())
+            chunks.append(b"\r\n")
+            chunks.append(body)
+            chunks.append(b"\r\n")
+        chunks.append(f"--{boundary}--\r\n".encode())
+
+        super().__init__(
+            content=b"".join(chunks),
+            status_code=status_code,
+            headers=headers,
+            media_type=f"multipart/mixed; boundary={boundary}",
+        )
@@ -9,8 +9,10 @@ from fastapi import (
     status,
     Query,
     Depends,
-    Form
+    Form,
+    Request,
 )
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -22,15 +24,16 @@ from papermerge.core.features.auth import scopes
 from papermerge.core.features.document.schema import (
     DocumentTypeArg,
 )
-from papermerge.core import schema, pathlib, types
+from papermerge.core import schema, pathlib, types, metrics
 from papermerge.core.config import get_settings
-from papermerge.core.tasks import send_task
+from papermerge.core.tasks import enqueue_task
 from papermerge.core.features.document.db import api as doc_dbapi
 from papermerge.core.db import common as dbapi_common
 from papermerge.core.routers.common import OPEN_API_GENERIC_JSON_DETAIL
-from papermerge.core.db.engine import get_db
+from papermerge.core.db.engine import get_db, get_db_readonly
 from papermerge.core.features.audit.db.audit_context import AsyncAuditContext
 from .schema import DocumentParams
+from .status_events import get_broker, format_sse
 from .mime_detection import (
     UnsupportedFileTypeError,
     InvalidFileError,
@@ -50,7 +53,7 @@ config = get_settings()
 async def get_documents(
         user: require_scopes(scopes.NODE_VIEW),
         params: DocumentParams = Depends(),
-        db_session: AsyncSession = Depends(get_db)
+        db_session: AsyncSession = Depends(get_db_readonly)
 ) -> schema.PaginatedResponse[schema.FlatDocument]:
     """Gets paginated list of documents"""
     try:
@@ -112,11 +115,14 @@ async def bulk_set_document_custom_field_values(
     except NoResultFound:
         raise exc.HTTP404NotFound()
 
-    send_task(
+    await enqueue_task(
+        db_session,
         const.PATH_TMPL_MOVE_DOCUMENT,
         kwargs={"document_id": str(document_id)},
         route_name="path_tmpl",
+        dedup_key=f"{const.PATH_TMPL_MOVE_DOCUMENT}:{document_id}",
     )
+    await db_session.commit()
 
     return updated_entries
 
@@ -134,7 +140,7 @@ async def bulk_set_document_custom_field_values(
 async def get_document_custom_field_values(
         document_id: uuid.UUID,
         user: require_scopes(scopes.NODE_VIEW),
-        db_session: AsyncSession = Depends(get_db),
+        db_session: AsyncSession = Depends(get_db_readonly),
 ) -> list[schema.CustomFieldWithValue]:
     """Get document custom field values"""
     if not await dbapi_common.has_node_perm(
@@ -285,6 +291,9 @@ async def upload_document(
         logger.error(f"Storage upload failed for document {doc_id}: {e}")
         raise HTTPException(status_code=500, detail="File upload failed")
 
+    metrics.UPLOADED_FILES.inc()
+    metrics.UPLOADED_BYTES.inc(file.size)
+
     async with AsyncAuditContext(
         db_session,
         user_id=user.id,
@@ -305,6 +314,19 @@ async def upload_document(
             updated_by=user.id
         )
 
+        # committed together with the document
+        await enqueue_task(
+            db_session,
+            "process_upload",
+            kwargs={
+                "document_id": str(doc_id),
+                "document_version_id": str(document_version_id),
+                "lang": str(lang),
+                "user_id": str(user.id),
+            },
+            route_name="s3"
+        )
+
         try:
             doc = await doc_dbapi.create_document(
                 db_session,
@@ -319,17 +341,6 @@ async def upload_document(
                 logger.warning(f"Failed to cleanup uploaded file {object_key}: {clean_ex}")
             raise HTTPException(status_code=400, detail=str(e))
 
-    send_task(
-        "process_upload",
-        kwargs={
-            "document_id": str(doc.id),
-            "document_version_id": str(document_version_id),
-            "lang": str(lang),
-            "user_id": str(user.id),
-        },
-        route_name="s3"
-    )
-
     logger.info(f"Document {doc.id} uploaded, queued for processing")
 
     return doc
@@ -347,7 +358,7 @@ async def upload_document(
 async def get_document_last_version(
         doc_id: uuid.UUID,
         user: require_scopes(scopes.NODE_VIEW),
-        db_session: AsyncSession = Depends(get_db),
+        db_session: AsyncSession = Depends(get_db_readonly),
 ) -> schema.DocumentVersion:
     """Returns document's last version"""
     try:
@@ -381,7 +392,7 @@ async def get_document_last_version(
 async def get_doc_versions_list(
         doc_id: uuid.UUID,
         user: require_scopes(scopes.NODE_VIEW),
-        db_session: AsyncSession = Depends(get_db),
+        db_session: AsyncSession = Depends(get_db_readonly),
 ) -> list[schema.DocVerListItem]:
     """
     Returns versions list for given document ID
@@ -419,7 +430,7 @@ async def get_doc_versions_list(
 async def get_document_details(
         document_id: uuid.UUID,
         user: require_scopes(scopes.NODE_VIEW),
-        db_session: AsyncSession = Depends(get_db),
+        db_session: AsyncSession = Depends(get_db_readonly),
 ) -> schema.DocumentWithoutVersions:
     """Get document details"""
     try:
@@ -467,6 +478,14 @@ async def update_document_type(
                 user_id=user.id,
                 username=user.username
         ):
+            # committed by `update_doc_type`
+            await enqueue_task(
+                db_session,
+                const.PATH_TMPL_MOVE_DOCUMENT,
+                kwargs={"document_id": str(document_id)},
+                route_name="path_tmpl",
+                dedup_key=f"{const.PATH_TMPL_MOVE_DOCUMENT}:{document_id}",
+            )
             await dbapi.update_doc_type(
                 db_session,
                 document_id=document_id,
@@ -475,12 +494,6 @@ async def update_document_type(
     except NoResultFound:
         raise exc.HTTP404NotFound()
 
-    send_task(
-        const.PATH_TMPL_MOVE_DOCUMENT,
-        kwargs={"document_id": str(document_id)},
-        route_name="path_tmpl",
-    )
-
 
 @router.get(
     "/type/{document_type_id}/",
@@ -490,7 +503,7 @@ async def get_documents_by_type(
         document_type_id: uuid.UUID,
         user: require_scopes(scopes.NODE_VIEW),
         params: schema.DocumentsByTypeParams = Depends(),
-        db_session: AsyncSession = Depends(get_db),
+        db_session: AsyncSession = Depends(get_db_readonly),
 ) -> schema.PaginatedResponse[schema.DocumentCFV]:
     """
     Get all documents of specific type with all custom field values
@@ -544,14 +557,13 @@ async def get_document_doc_thumbnail_status(
     document thumbnail.
     """
 
-    for doc_id in doc_ids:
-        if not await dbapi_common.has_node_perm(
-                db_session,
-                node_id=doc_id,
-                codename=scopes.NODE_VIEW,
-                user_id=user.id,
-        ):
-            raise exc.HTTP403Forbidden()
+    if not await dbapi_common.has_nodes_perm(
+            db_session,
+            node_ids=doc_ids,
+            codename=scopes.NODE_VIEW,
+            user_id=user.id,
+    ):
+        raise exc.HTTP403Forbidden()
 
     response, doc_ids_not_yet_considered = await dbapi.get_docs_thumbnail_img_status(
         db_session, doc_ids=doc_ids
@@ -560,11 +572,96 @@ async def get_document_doc_thumbnail_status(
     storage_backend = config.storage_backend
     if storage_backend in (types.StorageBackend.S3, types.StorageBackend.R2):
         if len(doc_ids_not_yet_considered) > 0:
+            # clients poll this endpoint: coalesce repeated requests
             for doc_id in doc_ids_not_yet_considered:
-                send_task(
+                await enqueue_task(
+                    db_session,
                     const.S3_WORKER_GENERATE_DOC_THUMBNAIL,
                     kwargs={"doc_id": str(doc_id)},
                     route_name="s3preview",
+                    dedup_key=f"{const.S3_WORKER_GENERATE_DOC_THUMBNAIL}:{doc_id}",
                 )
+            await db_session.commit()
 
     return response
+
+
+@router.get(
+    "/status/events",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Stream of server-sent events",
+            "content": {"text/event-stream": {}},
+        },
+        status.HTTP_403_FORBIDDEN: {
+            "description": f"No `{scopes.NODE_VIEW}` permission on one of the documents",
+            "content": OPEN_API_GENERIC_JSON_DETAIL,
+        }
+    },
+)
+async def stream_documents_status(
+        request: Request,
+        user: require_scopes(scopes.NODE_VIEW),
+        doc_ids: list[uuid.UUID] = Query(),
+        db_session: AsyncSession = Depends(get_db),
+):
+    """
+    Streams status transitions of given documents as server-sent events
+
+    Replaces polling of `thumbnail-img-status` and document details.
+    Right after subscribing, current status of each document is sent;
+    afterwards an event is sent whenever `processing_status`,
+    `preview_status` or `ocr_status` of one of the documents changes.
+    Each event is of type `status` with JSON encoded `DocumentStatusEvent`
+    as data.
+
+    Permissions are checked once, when subscribing. The DB session is
+    closed before streaming starts: long lived subscribers don't hold
+    pooled connections (events come from the shared listening connection).
+    """
+    doc_ids = set(doc_ids)
+    permitted = await dbapi_common.get_nodes_with_perm(
+        db_session,
+        node_ids=list(doc_ids),
+        codename=scopes.NODE_VIEW,
+        user_id=user.id,
+    )
+    if permitted != doc_ids:
+        raise exc.HTTP403Forbidden()
+
+    broker = get_broker()
+    # subscribe before reading current statuses so that no transition
+    # happening in between is lost
+    subscription = await broker.subscribe(doc_ids)
+    try:
+        current = await dbapi.get_docs_status(db_session, doc_ids=list(doc_ids))
+    except Exception:
+        subscription.close()
+        raise
+    finally:
+        # ends the transaction and releases the connection
+        await db_session.close()
+    keepalive = config.status_events_keepalive
+
+    async def event_stream():
+        try:
+            for event in current:
+                yield format_sse(event)
+
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=keepalive)
+                if event is None:
+                    # re-establishes listening if DB connection was lost
+                    await broker.ensure_listening()
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
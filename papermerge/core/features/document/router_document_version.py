@@ -3,14 +3,21 @@ import uuid
 
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, status
 
 from papermerge.core import schema, dbapi, orm, scopes, db
 from papermerge.core.features.auth.scopes import Scopes
 from papermerge.core.routers.common import OPEN_API_GENERIC_JSON_DETAIL
 from papermerge.core import exceptions as exc
 from papermerge.core.db.engine import get_db
-from papermerge.core.features.document.response import DocumentFileResponse
+from papermerge.core.features.document.response import (
+    DocumentFileResponse,
+    NotModifiedResponse,
+    REVALIDATE_CACHE_CONTROL,
+    cache_headers,
+    is_not_modified,
+    make_etag,
+)
 from papermerge.core.features.audit.db.audit_context import AsyncAuditContext
 
 logger = logging.getLogger(__name__)
@@ -18,6 +25,15 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/document-versions", tags=["document-versions"])
 
 
+def doc_ver_etag(doc_ver: orm.DocumentVersion) -> str:
+    return make_etag(
+        "dv",
+        doc_ver.id,
+        doc_ver.size,
+        int(doc_ver.updated_at.timestamp() * 1_000_000),
+    )
+
+
 @router.api_route(
     "/{document_version_id}/download",
     methods=["GET", "HEAD"],
@@ -34,6 +50,12 @@ router = APIRouter(prefix="/document-versions", tags=["document-versions"])
                 "image/tiff": {}
             }
         },
+        206: {
+            "description": "Requested byte range(s) of the file"
+        },
+        304: {
+            "description": "Client's cached copy is still valid"
+        },
         404: {
             "description": "Document version not found"
         }
@@ -41,29 +63,35 @@ router = APIRouter(prefix="/document-versions", tags=["document-versions"])
 )
 async def download_document_version(
     document_version_id: uuid.UUID,
+    request: Request,
     user: scopes.DownloadDocument,
     db_session: AsyncSession = Depends(get_db),
 ):
-    """Downloads given document version"""
-    try:
-        doc_id = await dbapi.get_doc_id_from_doc_ver_id(
-            db_session, doc_ver_id=document_version_id
-        )
-        if not await db.has_node_perm(
-                db_session,
-                node_id=doc_id,
-                codename=Scopes.NODE_VIEW,
-                user_id=user.id,
-        ):
-            raise exc.HTTP403Forbidden()
+    """Downloads given document version
 
-        doc_ver: orm.DocumentVersion = await dbapi.get_doc_ver(
+    ETag is derived from document version ID, file size and modification
+    time: files of document versions are rewritten only by maintenance
+    commands (e.g. `pm document relinearize`), which update both.
+    Clients revalidate cached copies; conditional requests
+    (`If-None-Match`, `If-Modified-Since`) are answered with 304 right
+    after the permission check, `Range` requests with 206.
+    """
+    doc_ver = await db_session.get(orm.DocumentVersion, document_version_id)
+    if doc_ver is None or not await db.has_node_perm(
             db_session,
-            document_version_id=document_version_id,
-        )
-    except NoResultFound:
-        error = schema.Error(messages=["Document version not found"])
-        raise HTTPException(status_code=404, detail=error.model_dump())
+            node_id=doc_ver.document_id,
+            codename=Scopes.NODE_VIEW,
+            user_id=user.id,
+    ):
+        raise exc.HTTP403Forbidden()
+
+    headers = cache_headers(
+        doc_ver_etag(doc_ver),
+        REVALIDATE_CACHE_CONTROL,
+        last_modified=doc_ver.updated_at,
+    )
+    if is_not_modified(request, headers["ETag"], last_modified=doc_ver.updated_at):
+        return NotModifiedResponse(headers=headers)
 
     if not doc_ver.file_path.exists():
         error = schema.Error(messages=["Document version file not found"])
@@ -72,7 +100,8 @@ async def download_document_version(
     return DocumentFileResponse(
         doc_ver.file_path,
         filename=doc_ver.file_name,  # Will be in Content-Disposition header
-        content_disposition_type="attachment"
+        content_disposition_type="attachment",
+        headers=headers,
     )
 
 @router.get(
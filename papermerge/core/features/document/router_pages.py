@@ -1,7 +1,7 @@
 import logging
 from typing import Annotated, List
 
-from fastapi import APIRouter, Security, Depends
+from fastapi import APIRouter, Security, Depends, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -21,6 +21,10 @@ from papermerge.core.features.audit.db.audit_context import AsyncAuditContext
 logger = logging.getLogger(__name__)
 config = get_settings()
 MAX_PAGES = 10
+# Responses hold only the last version of each document unless requested
+ALL_VERSIONS_QUERY = Query(
+    False, description="Include all versions (with their pages) of documents"
+)
 
 router = APIRouter(
     prefix="/pages",
@@ -35,6 +39,7 @@ async def apply_page_operations(
         schema.User, Security(get_current_user, scopes=[scopes.NODE_UPDATE])
     ],
     db_session: AsyncSession = Depends(get_db),
+    all_versions: bool = ALL_VERSIONS_QUERY,
 ) -> schema.Document:
     """Applies reorder, delete and/or rotate operation(s) on a set of pages.
 
@@ -54,13 +59,17 @@ async def apply_page_operations(
 
     When `angle` > 0 -> the rotation is clockwise.
     When `angle` < 0 -> the rotation is counterclockwise.
+
+    Returned document holds only its new version unless `all_versions`.
     """
     async with AsyncAuditContext(
         db_session,
         user_id=user.id,
         username=user.username
     ):
-        new_doc = await apply_pages_op(db_session, items, user_id=user.id)
+        new_doc = await apply_pages_op(
+            db_session, items, user_id=user.id, all_versions=all_versions
+        )
 
     return schema.Document.model_validate(new_doc)
 
@@ -71,6 +80,7 @@ async def move_pages(
     user: Annotated[schema.User, Security(get_current_user, scopes=[scopes.NODE_UPDATE])],
     arg: schema.MovePagesIn,
     db_session: AsyncSession = Depends(get_db),
+    all_versions: bool = ALL_VERSIONS_QUERY,
 ) -> schema.MovePagesOut:
     """Moves pages between documents.
 
@@ -82,7 +92,7 @@ async def move_pages(
     Returns updated, with newly added versions, source and target documents.
     In case source document is deleted, which may happen when user
     moves all it's pages into the target, the returned source will
-    be None.
+    be None. Documents hold only their last version unless `all_versions`.
     """
     async with AsyncAuditContext(
         db_session,
@@ -97,8 +107,12 @@ async def move_pages(
             user_id=user.id,
         )
     if source is not None:
-        source = await doc_dbapi.load_doc(db_session, doc_id=source.id)
-    target = await doc_dbapi.load_doc(db_session, doc_id=target.id)
+        source = await doc_dbapi.load_doc(
+            db_session, doc_id=source.id, all_versions=all_versions
+        )
+    target = await doc_dbapi.load_doc(
+        db_session, doc_id=target.id, all_versions=all_versions
+    )
 
     model = schema.MovePagesOut(source=source, target=target)
 
@@ -113,6 +127,7 @@ async def extract_pages(
     ],
     arg: schema.ExtractPagesIn,
     db_session: AsyncSession = Depends(get_db),
+    all_versions: bool = ALL_VERSIONS_QUERY,
 ) -> schema.ExtractPagesOut:
     """Extract pages from one document into a folder.
 
@@ -120,6 +135,7 @@ async def extract_pages(
 
     Source IDs are IDs of the pages to move.
     Target is the ID of the folder where to extract pages into.
+    Source document holds only its last version unless `all_versions`.
     """
     async with AsyncAuditContext(
         db_session,
@@ -140,7 +156,9 @@ async def extract_pages(
     target_nodes = (await db_session.execute(stmt)).scalars()
 
     if source is not None:
-        source = await doc_dbapi.load_doc(db_session, source.id)
+        source = await doc_dbapi.load_doc(
+            db_session, source.id, all_versions=all_versions
+        )
 
     model = schema.ExtractPagesOut(source=source, target=target_nodes)
 
@@ -270,6 +270,27 @@ def thumbnail_url(value, info):
 ThumbnailUrl = Annotated[str | None, Field(validate_default=True)]
 
 
+def document_thumbnail_url(document_id: UUID, preview_status: str | None) -> str:
+    """Thumbnail URL of the document
+
+    Signed CDN URL for S3/R2 storage once the preview is ready, API
+    endpoint otherwise. Used by `DocumentBase` validator and by listings
+    which build models with `model_construct` (no validators run).
+    """
+    storage_backend = settings.storage_backend
+    if storage_backend == StorageBackend.LOCAL:
+        return f"/api/thumbnails/{document_id}"
+
+    # Handle both S3/CloudFront and R2
+    if preview_status == ImagePreviewStatus.ready:
+        if storage_backend in (StorageBackend.S3, StorageBackend.R2):
+            from papermerge.storage import get_storage_backend
+            backend = get_storage_backend()
+            return backend.doc_thumbnail_signed_url(document_id)
+
+    return f"/api/thumbnails/{document_id}"
+
+
 class DocumentBase(BaseModel):
     id: UUID
     title: str
@@ -282,21 +303,9 @@ class DocumentBase(BaseModel):
 
     @field_validator("thumbnail_url", mode="before")
     def thumbnail_url_validator(cls, value, info):
-        from papermerge.storage import get_storage_backend
-        backend = get_storage_backend()
-        storage_backend = settings.storage_backend
-        if storage_backend == StorageBackend.LOCAL:
-            return f"/api/thumbnails/{info.data['id']}"
-
-        # Handle both S3/CloudFront and R2
-        if (
-                "preview_status" in info.data
-                and info.data["preview_status"] == ImagePreviewStatus.ready
-        ):
-            if storage_backend in (settings.storage_backend.S3, settings.storage_backend.R2):
-                return backend.doc_thumbnail_signed_url(info.data['id'])
-
-        return f"/api/thumbnails/{info.data['id']}"
+        return document_thumbnail_url(
+            info.data['id'], info.data.get("preview_status")
+        )
 
     # Config
     model_config = ConfigDict(from_attributes=True)
@@ -323,6 +332,12 @@ class DocumentNode(DocumentBase):
 
 
 class Document(DocumentNode):
+    """Document with versions
+
+    `versions` are the versions loaded with the document; unless history
+    was explicitly asked for, that is the last version only (see
+    `load_doc`). Use `/documents/{id}/versions` for the list of all versions.
+    """
     versions: list[DocumentVersion] = Field(default_factory=list)
 
 
@@ -353,6 +368,16 @@ class DocumentPreviewImageStatus(BaseModel):
     preview_image_url: str | None = None
 
 
+class DocumentStatusEvent(BaseModel):
+    """Document status transition pushed to subscribed clients"""
+    id: UUID
+    processing_status: DocumentProcessingStatus
+    preview_status: ImagePreviewStatus | None = None
+    ocr_status: OCRStatusEnum = OCRStatusEnum.unknown
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class StatusForSize(BaseModel):
     status: ImagePreviewStatus | None
     url: str | None = None
@@ -0,0 +1,127 @@
+"""Document status push notifications
+
+Document status transitions (processing, preview, OCR) are published by
+the `trg_documents_status_notify` trigger on the `document_status`
+channel (Postgres LISTEN/NOTIFY). Each web process keeps exactly one
+listening connection and fans out notifications to in-process
+subscriptions, so the number of database connections does not grow with
+the number of connected clients.
+"""
+import asyncio
+import json
+import logging
+from uuid import UUID
+
+import asyncpg
+from pydantic import ValidationError
+
+from papermerge.core import config
+from papermerge.core.features.document.schema import DocumentStatusEvent
+
+settings = config.get_settings()
+logger = logging.getLogger(__name__)
+
+CHANNEL = "document_status"
+# Max number of not yet consumed events per subscription; slow clients
+# lose oldest events rather than making the process memory grow
+SUBSCRIPTION_QUEUE_SIZE = 100
+
+
+class Subscription:
+    def __init__(self, broker: "DocumentStatusBroker", doc_ids: set[UUID]):
+        self.broker = broker
+        self.doc_ids = doc_ids
+        self.queue: asyncio.Queue[DocumentStatusEvent] = asyncio.Queue(
+            maxsize=SUBSCRIPTION_QUEUE_SIZE
+        )
+
+    def put(self, event: DocumentStatusEvent):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float | None = None) -> DocumentStatusEvent | None:
+        """Returns next event or None if there was none within timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class DocumentStatusBroker:
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self._conn: asyncpg.Connection | None = None
+        self._lock = asyncio.Lock()
+        # document ID -> subscriptions interested in that document
+        self._subscriptions: dict[UUID, set[Subscription]] = {}
+
+    async def subscribe(self, doc_ids: set[UUID]) -> Subscription:
+        await self.ensure_listening()
+        subscription = Subscription(self, doc_ids)
+        for doc_id in doc_ids:
+            self._subscriptions.setdefault(doc_id, set()).add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        for doc_id in subscription.doc_ids:
+            subscriptions = self._subscriptions.get(doc_id)
+            if subscriptions is None:
+                continue
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[doc_id]
+
+    def dispatch(self, payload: str):
+        try:
+            event = DocumentStatusEvent.model_validate(json.loads(payload))
+        except (ValueError, ValidationError) as e:
+            logger.warning(f"Invalid {CHANNEL} payload {payload!r}: {e}")
+            return
+
+        for subscription in self._subscriptions.get(event.id, ()):
+            subscription.put(event)
+
+    async def close(self):
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+        self._conn = None
+
+    async def ensure_listening(self):
+        async with self._lock:
+            if self._conn is not None and not self._conn.is_closed():
+                return
+
+            connect_args = {"ssl": "require"} if settings.db_ssl else {}
+            self._conn = await asyncpg.connect(self.dsn, **connect_args)
+            self._conn.add_termination_listener(self._on_termination)
+            await self._conn.add_listener(CHANNEL, self._on_notification)
+            logger.debug(f"Listening on {CHANNEL} channel")
+
+    def _on_notification(self, connection, pid, channel, payload):
+        self.dispatch(payload)
+
+    def _on_termination(self, connection):
+        # next subscription will re-establish listening connection
+        logger.warning(f"Connection listening on {CHANNEL} was closed")
+        self._conn = None
+
+
+_broker: DocumentStatusBroker | None = None
+
+
+def get_broker() -> DocumentStatusBroker:
+    global _broker
+
+    if _broker is None:
+        _broker = DocumentStatusBroker(str(settings.db_url))
+
+    return _broker
+
+
+def format_sse(event: DocumentStatusEvent) -> str:
+    return f"event: status\ndata: {event.model_dump_json()}\n\n"
@@ -39,6 +39,58 @@ async def test_get_doc_last_ver(db_session: AsyncSession, make_document, user):
     assert last_ver.number == 5
 
 
+async def test_update_text_field_updates_only_pages_without_text(
+    db_session: AsyncSession, make_document_version, user
+):
+    doc_ver = await make_document_version(
+        page_count=3, pages_text=[None, "already there"], user=user
+    )
+
+    await dbapi.update_text_field(
+        db_session,
+        document_version_id=doc_ver.id,
+        streams=["first page", "second page", "third page"],
+    )
+
+    stmt = (
+        select(docs_orm.Page.number, docs_orm.Page.text)
+        .where(docs_orm.Page.document_version_id == doc_ver.id)
+        .order_by(docs_orm.Page.number)
+    )
+    pages = (await db_session.execute(stmt)).all()
+
+    assert [page.text for page in pages] == [
+        "first page", "already there", "third page"
+    ]
+    doc_ver_text = (await db_session.execute(
+        select(docs_orm.DocumentVersion.text).where(
+            docs_orm.DocumentVersion.id == doc_ver.id
+        )
+    )).scalar()
+    assert doc_ver_text == "first page third page"
+
+
+async def test_version_bump_copies_page_text_from_source_version(
+    db_session: AsyncSession, make_document_version, user
+):
+    src_ver = await make_document_version(
+        page_count=3, pages_text=["one", "two", "three"], user=user
+    )
+
+    new_ver = await dbapi.version_bump(
+        db_session,
+        doc_id=src_ver.document_id,
+        user_id=user.id,
+        page_count=2,
+        src_version_id=src_ver.id,
+        src_page_numbers=[3, 1],
+    )
+
+    pages = sorted(new_ver.pages, key=lambda p: p.number)
+    assert [(p.number, p.text) for p in pages] == [(1, "three"), (2, "one")]
+    assert new_ver.text == "three one"
+
+
 async def test_get_doc_cfv_only_empty_values(
     db_session: AsyncSession, make_document_receipt, user
 ):
@@ -763,3 +815,66 @@ async def test_get_doc_cfv_when_multiple_documents_present(
         ("Shop", None),
         ("Total", None),
     } == result3
+
+
+async def test_get_thumbnail_pages(
+    db_session: AsyncSession, make_document, make_document_with_pages, user
+):
+    doc = await make_document_with_pages(
+        title="with pages", user=user, parent=user.home_folder
+    )
+    doc_without_pages = await make_document(
+        title="without pages", user=user, parent=user.home_folder
+    )
+    doc_ver = await dbapi.get_last_doc_ver(db_session, doc_id=doc.id)
+    first_page = await dbapi.get_first_page(db_session, doc_ver_id=doc_ver.id)
+
+    pages = await dbapi.get_thumbnail_pages(
+        db_session, doc_ids=[doc.id, doc_without_pages.id]
+    )
+
+    assert set(pages.keys()) == {doc.id}
+    assert pages[doc.id].page_id == first_page.id
+    assert pages[doc.id].doc_ver_id == doc_ver.id
+    assert pages[doc.id].page_number == 1
+
+
+async def test_load_doc_last_version_only(
+    db_session: AsyncSession, make_document, user
+):
+    doc = await make_document(title="some doc", user=user, parent=user.home_folder)
+    await dbapi.version_bump(db_session, doc_id=doc.id, user_id=user.id)
+    await dbapi.version_bump(db_session, doc_id=doc.id, user_id=user.id)
+
+    lean_doc = await dbapi.load_doc(db_session, doc.id)
+
+    assert [ver.number for ver in lean_doc.versions] == [3]
+
+    full_doc = await dbapi.load_doc(db_session, doc.id, all_versions=True)
+
+    assert sorted(ver.number for ver in full_doc.versions) == [1, 2, 3]
+    lean_doc = await dbapi.load_doc(db_session, doc.id)
+
+    assert [ver.number for ver in lean_doc.versions] == [3]
+
+
+async def test_create_next_version_after_lean_load_doc(
+    db_session: AsyncSession, make_document, user
+):
+    doc = await make_document(title="some doc", user=user, parent=user.home_folder)
+    await dbapi.version_bump(db_session, doc_id=doc.id, user_id=user.id)
+    await dbapi.version_bump(db_session, doc_id=doc.id, user_id=user.id)
+    # keeps mapped `Document.versions` collection of the session intact
+    await dbapi.load_doc(db_session, doc.id)
+    db_doc = await db_session.get(docs_orm.Document, doc.id)
+
+    doc_ver = await dbapi.create_next_version(
+        db_session,
+        doc=db_doc,
+        file_name="some doc.pdf",
+        file_size=1024,
+        content_type=MimeType.application_pdf,
+        created_by=user.id,
+    )
+
+    assert doc_ver.number == 4
\ No newline at end of file
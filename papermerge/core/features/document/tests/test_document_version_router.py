@@ -30,6 +30,35 @@ async def test_download_document_version(
     assert response.status_code == 200
 
 
+async def test_download_document_version_conditional_and_range_requests(
+    auth_api_client,
+    db_session: AsyncSession,
+    pdf_file: DocumentTestFileType
+):
+    resp = await auth_api_client.post(
+        "/documents/upload",
+        files={"file": pdf_file.as_upload_tuple()}
+    )
+    assert resp.status_code == 201, resp.json()
+    data = resp.json()
+    last_ver = await dbapi.get_last_doc_ver(db_session, doc_id=data['id'])
+    url = f"/document-versions/{last_ver.id}/download"
+
+    response = await auth_api_client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert str(last_ver.id) in etag
+    assert "no-cache" in response.headers["cache-control"]
+
+    response = await auth_api_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    response = await auth_api_client.get(url, headers={"Range": "bytes=0-9"})
+    assert response.status_code == 206
+    assert len(response.content) == 10
+
+
 async def test_document_version_download_request_non_existing_resource(auth_api_client):
     non_existing_resource_id = uuid.uuid4().hex
     response = await auth_api_client.get(
@@ -0,0 +1,53 @@
+import json
+import uuid
+
+from papermerge.core.features.document.status_events import (
+    DocumentStatusBroker,
+    Subscription,
+    format_sse,
+)
+
+
+def make_payload(doc_id, processing_status="ready"):
+    return json.dumps({
+        "id": str(doc_id),
+        "processing_status": processing_status,
+        "preview_status": None,
+        "ocr_status": "UNKNOWN",
+    })
+
+
+def subscribe(broker, doc_ids) -> Subscription:
+    # registers subscription without opening listening connection
+    subscription = Subscription(broker, set(doc_ids))
+    for doc_id in doc_ids:
+        broker._subscriptions.setdefault(doc_id, set()).add(subscription)
+    return subscription
+
+
+async def test_dispatch_delivers_events_only_to_interested_subscriptions():
+    broker = DocumentStatusBroker(dsn="postgresql://unused")
+    doc_a, doc_b = uuid.uuid4(), uuid.uuid4()
+    sub_a = subscribe(broker, [doc_a])
+    sub_ab = subscribe(broker, [doc_a, doc_b])
+
+    broker.dispatch(make_payload(doc_b, "processing_pages"))
+    broker.dispatch("not a json")
+
+    assert sub_a.queue.empty()
+    event = await sub_ab.get(timeout=1)
+    assert event.id == doc_b
+    assert event.processing_status == "processing_pages"
+    assert 'event: status\ndata: {"id":"' in format_sse(event)
+
+
+async def test_closed_subscription_is_removed():
+    broker = DocumentStatusBroker(dsn="postgresql://unused")
+    doc_id = uuid.uuid4()
+    subscription = subscribe(broker, [doc_id])
+
+    subscription.close()
+    broker.dispatch(make_payload(doc_id))
+
+    assert subscription.queue.empty()
+    assert broker._subscriptions == {}
@@ -1,5 +1,4 @@
 from fastapi import UploadFile
-from botocore.exceptions import ClientError
 
 from papermerge.core.config import get_settings
 
@@ -31,6 +30,8 @@ async def stream_file_to_r2(
         FileTooLargeError: If file exceeds max_file_size
         R2UploadError: If upload fails
     """
+    from botocore.exceptions import ClientError
+
     s3_client = get_r2_client()  # Your existing client
     bucket_name = config.bucket_name
     max_file_size = config.max_file_size_mb * 1024 * 1024
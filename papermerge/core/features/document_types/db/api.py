@@ -16,7 +16,7 @@ from papermerge.core.db.exceptions import DependenciesExist
 from papermerge.core import schema, orm, types
 from papermerge.core import constants as const
 from papermerge.core.const import SYSTEM_USER_ID
-from papermerge.core.tasks import send_task
+from papermerge.core.tasks import enqueue_task
 from papermerge.core.features.ownership.db import api as ownership_api
 from papermerge.core.utils.tz import utc_now
 from papermerge.core.features.document_types import schema as dt_schema
@@ -878,21 +878,23 @@ async def update_document_type(
         doc_type.path_template = attrs.path_template
         notify_path_tmpl_worker = True
 
-    # Commit changes
-    session.add(doc_type)
-    await session.commit()
-    await session.refresh(doc_type)
-
     # Send background task if path template changed
     if notify_path_tmpl_worker:
         # background task to move all doc_type documents
         # to new target path based on path template evaluation
-        send_task(
+        await enqueue_task(
+            session,
             const.PATH_TMPL_MOVE_DOCUMENTS,
             kwargs={"document_type_id": str(document_type_id)},
             route_name="path_tmpl",
+            dedup_key=f"{const.PATH_TMPL_MOVE_DOCUMENTS}:{document_type_id}",
         )
 
+    # Commit changes
+    session.add(doc_type)
+    await session.commit()
+    await session.refresh(doc_type)
+
     return doc_type
 
 
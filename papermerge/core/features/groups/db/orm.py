@@ -28,6 +28,10 @@ class UserGroup(Base, AuditColumns):
         foreign_keys=[user_id]
     )
 
+    __table_args__ = (
+        Index('idx_users_groups_user_id', 'user_id'),
+    )
+
     def __repr__(self):
         return f"UserGroup({self.id=}, {self.group=}, {self.user=})"
 
@@ -1,7 +1,7 @@
 import logging
 import uuid
 import math
-from typing import Union, Tuple, Iterable
+from typing import Union, Tuple, Iterable, Callable
 from uuid import UUID
 
 from sqlalchemy import (
@@ -13,21 +13,29 @@ from sqlalchemy import (
     and_,
     asc,
     desc,
-    or_
+    or_,
+    insert,
+    tuple_,
 )
 from sqlalchemy.orm import selectin_polymorphic, selectinload, aliased
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from papermerge.core import schema, orm
+from papermerge.core import schema, orm, config
 from papermerge.core.db.exceptions import ResourceHasNoOwner
 from papermerge.core.exceptions import EntityNotFound
-from papermerge.core.db.common import get_descendants
+from papermerge.core.db.common import (
+    get_descendants_deepest_first,
+)
 from papermerge.core.types import PaginatedResponse, ResourceType, OwnerType, \
-    NodeResource, TagResource, Owner
+    NodeResource, TagResource, Owner, OCRStatusEnum
 from papermerge.core.features.ownership.db import api as ownership_api
 from papermerge.core.features.nodes import events
-from papermerge.core.features.nodes.schema import DeleteDocumentsData
+from papermerge.core.features.nodes.schema import DeleteDocumentsData, \
+    Tag as FolderTag
+from papermerge.core.features.document.schema import document_thumbnail_url
+from papermerge.core.features.document.db import api as doc_dbapi
+from papermerge.core.schemas.common import Tag as DocumentTag
 from papermerge.core.features.ownership.db.orm import Ownership
 from papermerge.core.db.common import (
     get_ancestors,
@@ -39,14 +47,11 @@ from papermerge.core.schemas.common import Breadcrumb
 from .orm import Folder
 
 logger = logging.getLogger(__name__)
+settings = config.get_settings()
 
-async def load_node(db_session: AsyncSession, node: orm.Node) -> orm.Document | orm.Folder:
+async def load_node(db_session: AsyncSession, node: orm.Node) -> schema.Document | orm.Folder:
     if node.ctype == 'document':
-        stmt = select(orm.Document).options(
-            selectinload(orm.Document.versions).selectinload(orm.DocumentVersion.pages)
-        ).where(orm.Document.id == node.id)
-        result =  await db_session.execute(stmt)
-        return result.scalar_one()
+        return await doc_dbapi.load_doc(db_session, node.id)
 
     stmt = select(orm.Folder).where(orm.Folder.id == node.id)
     result = await db_session.execute(stmt)
@@ -294,73 +299,84 @@ async def get_paginated_nodes(
     # Execute query
     results = (await db_session.execute(paginated_query)).all()
 
-    # Convert to schema models with complete audit trail
+    # Convert to schema models with complete audit trail.
+    # Rows come from the database and are already of the right types:
+    # models are built with `model_construct` (no validation); nested
+    # models too, as serialization expects model instances
     items = []
     num_pages = math.ceil(total_nodes / page_size) if total_nodes > 0 else 1
 
     for row in results:
         node = row[0]
-        is_shared = row.is_shared
 
         # Build audit user objects
         created_by = None
         if row.created_by_id:
-            created_by = schema.ByUser(
+            created_by = schema.ByUser.model_construct(
                 id=row.created_by_id,
                 username=row.created_by_username
             )
 
         updated_by = None
         if row.updated_by_id:
-            updated_by = schema.ByUser(
+            updated_by = schema.ByUser.model_construct(
                 id=row.updated_by_id,
                 username=row.updated_by_username
             )
 
         # Build owned_by from ownership data
         if row.owner_type == OwnerType.USER.value:
-            owned_by = schema.OwnedBy(
+            owned_by = schema.OwnedBy.model_construct(
                 id=row.owner_user_id,
                 name=row.owner_username,
                 type=OwnerType.USER
             )
         else:
-            owned_by = schema.OwnedBy(
+            owned_by = schema.OwnedBy.model_construct(
                 id=row.owner_group_id,
                 name=row.owner_group_name,
                 type=OwnerType.GROUP
             )
 
+        attrs = dict(
+            id=node.id,
+            title=node.title,
+            ctype=node.ctype,
+            parent_id=node.parent_id,
+            is_shared=row.is_shared,
+            owned_by=owned_by,
+            created_at=node.created_at,
+            updated_at=node.updated_at,
+            created_by=created_by,
+            updated_by=updated_by,
+        )
+
         if node.ctype == "folder":
-            items.append(schema.FolderEx(
-                id=node.id,
-                title=node.title,
-                ctype=node.ctype,
-                tags=node.tags,
-                parent_id=node.parent_id,
-                is_shared=is_shared,
-                owned_by=owned_by,
-                created_at=node.created_at,
-                updated_at=node.updated_at,
-                created_by=created_by,
-                updated_by=updated_by,
+            items.append(schema.FolderEx.model_construct(
+                tags=[
+                    FolderTag.model_construct(
+                        name=tag.name, bg_color=tag.bg_color, fg_color=tag.fg_color
+                    )
+                    for tag in node.tags
+                ],
+                **attrs,
             ))
         else:
-            items.append(schema.DocumentEx(
-                id=node.id,
-                title=node.title,
-                ctype=node.ctype,
-                tags=node.tags,
-                parent_id=node.parent_id,
-                is_shared=is_shared,
-                owned_by=owned_by,
-                created_at=node.created_at,
-                updated_at=node.updated_at,
-                created_by=created_by,
-                updated_by=updated_by,
+            items.append(schema.DocumentEx.model_construct(
+                tags=[
+                    DocumentTag.model_construct(
+                        id=tag.id,
+                        name=tag.name,
+                        bg_color=tag.bg_color,
+                        fg_color=tag.fg_color,
+                    )
+                    for tag in node.tags
+                ],
                 preview_status=node.preview_status,
+                thumbnail_url=document_thumbnail_url(node.id, node.preview_status),
                 ocr=node.ocr,
-                ocr_status=node.ocr_status,
+                ocr_status=OCRStatusEnum(node.ocr_status),
+                **attrs,
             ))
 
     return PaginatedResponse[Union[schema.DocumentEx, schema.FolderEx]](
@@ -548,6 +564,198 @@ async def update_node_tags(
     return node
 
 
+async def bulk_update_node_tags(
+    db_session: AsyncSession,
+    node_ids: list[uuid.UUID],
+    tags: list[str],
+    mode: schema.BulkTagsMode,
+    created_by: uuid.UUID,
+) -> list[uuid.UUID]:
+    """Adds, removes or replaces tags of many nodes at once
+
+    Ownership of all nodes is resolved with one query; missing tags are
+    created with one insert per distinct owner (same owner as the nodes
+    they will be associated with). `nodes_tags` rows are inserted/deleted
+    with set based statements, so that search index is refreshed by one
+    statement level trigger invocation for the whole batch.
+
+    Returns IDs of the updated nodes.
+    """
+    node_ids = list(set(node_ids))
+    tags = list(set(tags))
+
+    stmt = (
+        select(orm.Node.id, Ownership.owner_type, Ownership.owner_id)
+        .select_from(orm.Node)
+        .join(
+            Ownership,
+            and_(
+                Ownership.resource_type == ResourceType.NODE.value,
+                Ownership.resource_id == orm.Node.id
+            ),
+            isouter=True
+        )
+        .where(orm.Node.id.in_(node_ids))
+    )
+    rows = (await db_session.execute(stmt)).all()
+
+    found_ids = {row.id for row in rows}
+    if missing := set(node_ids) - found_ids:
+        raise EntityNotFound(f"Nodes {missing} not found")
+
+    owners = set()
+    for row in rows:
+        if row.owner_type is None:
+            raise ResourceHasNoOwner(f"Node {row.id} has no owner")
+        owners.add((OwnerType(row.owner_type), row.owner_id))
+
+    nta = orm.NodeTagsAssociation
+    node_owner = aliased(Ownership, name="node_owner")
+    tag_owner = aliased(Ownership, name="tag_owner")
+
+    # associations with same named tags of the node's owner
+    owner_tag = (
+        select(orm.Tag.id)
+        .join(
+            tag_owner,
+            and_(
+                tag_owner.resource_type == ResourceType.TAG.value,
+                tag_owner.resource_id == orm.Tag.id
+            )
+        )
+        .join(
+            node_owner,
+            and_(
+                node_owner.resource_type == ResourceType.NODE.value,
+                node_owner.owner_type == tag_owner.owner_type,
+                node_owner.owner_id == tag_owner.owner_id
+            )
+        )
+        .where(
+            orm.Tag.id == nta.tag_id,
+            node_owner.resource_id == nta.node_id,
+            orm.Tag.name.in_(tags),
+        )
+    )
+
+    if mode == schema.BulkTagsMode.remove:
+        await db_session.execute(
+            delete(nta).where(nta.node_id.in_(node_ids), exists(owner_tag))
+        )
+        try:
+            await db_session.commit()
+        except Exception:
+            await db_session.rollback()
+            raise
+
+        return node_ids
+
+    if tags:
+        await _create_missing_owner_tags(
+            db_session, tags=tags, owners=owners, created_by=created_by
+        )
+
+    if mode == schema.BulkTagsMode.replace:
+        # keep only associations with same named tags of the node's owner
+        await db_session.execute(
+            delete(nta).where(nta.node_id.in_(node_ids), ~exists(owner_tag))
+        )
+
+    if tags:
+        already_associated = exists().where(
+            nta.node_id == node_owner.resource_id,
+            nta.tag_id == orm.Tag.id,
+        )
+        new_associations = (
+            select(node_owner.resource_id, orm.Tag.id)
+            .select_from(node_owner)
+            .join(
+                tag_owner,
+                and_(
+                    tag_owner.resource_type == ResourceType.TAG.value,
+                    tag_owner.owner_type == node_owner.owner_type,
+                    tag_owner.owner_id == node_owner.owner_id
+                )
+            )
+            .join(orm.Tag, orm.Tag.id == tag_owner.resource_id)
+            .where(
+                node_owner.resource_type == ResourceType.NODE.value,
+                node_owner.resource_id.in_(node_ids),
+                orm.Tag.name.in_(tags),
+                ~already_associated,
+            )
+        )
+        await db_session.execute(
+            insert(nta).from_select(["node_id", "tag_id"], new_associations)
+        )
+
+    try:
+        await db_session.commit()
+    except Exception:
+        await db_session.rollback()
+        raise
+
+    return node_ids
+
+
+async def _create_missing_owner_tags(
+    db_session: AsyncSession,
+    tags: list[str],
+    owners: set[tuple[OwnerType, uuid.UUID]],
+    created_by: uuid.UUID,
+) -> None:
+    """Creates tags named `tags` which don't yet exist for given owners"""
+    stmt = (
+        select(orm.Tag.name, Ownership.owner_type, Ownership.owner_id)
+        .join(
+            Ownership,
+            and_(
+                Ownership.resource_type == ResourceType.TAG.value,
+                Ownership.resource_id == orm.Tag.id
+            )
+        )
+        .where(
+            orm.Tag.name.in_(tags),
+            tuple_(Ownership.owner_type, Ownership.owner_id).in_(
+                [(owner_type.value, owner_id) for owner_type, owner_id in owners]
+            )
+        )
+    )
+    existing = {
+        (row.name, OwnerType(row.owner_type), row.owner_id)
+        for row in await db_session.execute(stmt)
+    }
+
+    new_tags = []
+    new_tag_ids_per_owner = {}
+    for owner_type, owner_id in owners:
+        for name in tags:
+            if (name, owner_type, owner_id) in existing:
+                continue
+            tag_id = uuid.uuid4()
+            new_tags.append(
+                dict(
+                    id=tag_id,
+                    name=name,
+                    created_by=created_by,
+                    updated_by=created_by,
+                )
+            )
+            new_tag_ids_per_owner.setdefault((owner_type, owner_id), []).append(tag_id)
+
+    if not new_tags:
+        return
+
+    await db_session.execute(insert(orm.Tag), new_tags)
+    for (owner_type, owner_id), tag_ids in new_tag_ids_per_owner.items():
+        await ownership_api.set_owners(
+            db_session,
+            resource_type=ResourceType.TAG,
+            resource_ids=tag_ids,
+            owner=Owner(owner_type=owner_type, owner_id=owner_id),
+        )
+
+
 async def get_node_tags(
         db_session: AsyncSession, node_id: uuid.UUID, user_id: uuid.UUID
 ) -> Tuple[Iterable[schema.Tag] | None, schema.Error | None]:
@@ -756,35 +964,62 @@ async def get_folder(
 
 
 async def delete_nodes(
-    db_session: AsyncSession, node_ids: list[UUID], user_id: UUID
+    db_session: AsyncSession,
+    node_ids: list[UUID],
+    user_id: UUID,
+    batch_size: int | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
 ) -> schema.Error | None:
-    all_ids_to_be_deleted = [
-        item[0] for item in await get_descendants(db_session, node_ids=node_ids)
-    ]
+    """Deletes `node_ids` nodes with all their descendants
 
-    delete_details = await prepare_documents_s3_data_deletion(
-        db_session, all_ids_to_be_deleted
-    )
+    The subtree is walked once (IDs only, deepest nodes first) and then
+    deleted bottom-up in batches of `batch_size` nodes, so that after each
+    batch the remaining nodes still form a valid tree. Every batch is
+    committed separately, together with its S3 cleanup tasks (see
+    `tasks.enqueue_task`); thus the size of SQL statements and of
+    transactions does not depend on the size of the subtree.
+
+    `on_progress(deleted_count, total_count)` is called after each batch.
+    """
+    if batch_size is None:
+        batch_size = settings.subtree_delete_batch_size
 
-    stmt = delete(orm.Node).where(orm.Node.id.in_(all_ids_to_be_deleted))
+    subtree_ids = await get_descendants_deepest_first(db_session, node_ids=node_ids)
+    total = len(subtree_ids)
+    deleted = 0
 
-    # This second delete statement - is extra hack for Sqlite DB
-    # For some reason, the (Polymorphic?) cascading does not work
-    # in Sqlite, so here it is required to manually delete associated
-    # custom fields
-    sqlite_hack_stmt = delete(orm.CustomFieldValue).where(
-        orm.CustomFieldValue.document_id.in_(all_ids_to_be_deleted)
-    )
+    for start in range(0, total, batch_size):
+        batch_ids = subtree_ids[start:start + batch_size]
 
-    try:
-        await db_session.execute(stmt)
-        await db_session.execute(sqlite_hack_stmt)
-        await db_session.commit()
-    except Exception as e:
-        error = schema.Error(messages=[str(e)])
-        return error
+        delete_details = await prepare_documents_s3_data_deletion(
+            db_session, batch_ids
+        )
+
+        stmt = delete(orm.Node).where(orm.Node.id.in_(batch_ids))
+
+        # This second delete statement - is extra hack for Sqlite DB
+        # For some reason, the (Polymorphic?) cascading does not work
+        # in Sqlite, so here it is required to manually delete associated
+        # custom fields
+        sqlite_hack_stmt = delete(orm.CustomFieldValue).where(
+            orm.CustomFieldValue.document_id.in_(batch_ids)
+        )
+
+        try:
+            await db_session.execute(stmt)
+            await db_session.execute(sqlite_hack_stmt)
+            await events.delete_documents_s3_data(db_session, delete_details)
+            await db_session.commit()
+        except Exception as e:
+            await db_session.rollback()
+            error = schema.Error(messages=[str(e)])
+            return error
+
+        deleted += len(batch_ids)
+        logger.debug(f"Deleted {deleted} out of {total} nodes")
+        if on_progress:
+            on_progress(deleted, total)
 
-    events.delete_documents_s3_data(delete_details)
     return None
 
 
@@ -795,9 +1030,6 @@ async def move_nodes(
 ) -> int:
     stmt = select(orm.Node).where(orm.Node.id == target_id)
     target = (await db_session.execute(stmt)).scalar()
-    descendants_ids = [
-        item[0] for item in await get_descendants(db_session, node_ids=source_ids)
-    ]
     if target is None:
         raise EntityNotFound("Node target not found")
 
@@ -810,10 +1042,9 @@ async def move_nodes(
         resource_id=target_id
     )
     result = await db_session.execute(stmt)
-    await ownership_api.set_owners(
+    await ownership_api.set_subtree_owner(
         db_session,
-        resource_type=ResourceType.NODE,
-        resource_ids=descendants_ids,
+        node_ids=source_ids,
         owner=Owner(owner_type=owner_type, owner_id=owner_id),
     )
     await db_session.commit()
@@ -37,6 +37,7 @@ class Node(Base, AuditColumns, OwnedResourceMixin):
             unique=True,
             postgresql_where=text("ctype = 'folder'")
         ),
+        Index('idx_nodes_parent_id', 'parent_id'),
     )
 
     def __repr__(self):
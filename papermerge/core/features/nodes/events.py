@@ -1,9 +1,11 @@
 import logging
+from itertools import batched
+
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from papermerge.celery_app import app as celery_app
 from papermerge.core import constants as const
 from papermerge.core import types
-from papermerge.core.utils.decorators import if_redis_present
+from papermerge.core.tasks import enqueue_task
 from .schema import DeleteDocumentsData
 from papermerge.core.config import get_settings
 
@@ -11,24 +13,34 @@ settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
-@if_redis_present
-def delete_documents_s3_data(data: DeleteDocumentsData):
+async def delete_documents_s3_data(db_session: AsyncSession, data: DeleteDocumentsData):
+    """Enqueues S3 cleanup of deleted documents; does not commit"""
     if settings.storage_backend == types.StorageBackend.LOCAL.value:
         logger.debug("Nothing to do for local storage")
         return
 
-    celery_app.send_task(
-        const.S3_WORKER_REMOVE_DOC_VER,
-        kwargs={"doc_ver_ids": [str(i) for i in data.document_version_ids]},
-        route_name="s3",
-    )
-    celery_app.send_task(
-        const.S3_WORKER_REMOVE_DOCS_THUMBNAIL,
-        kwargs={"doc_ids": [str(i) for i in data.document_ids]},
-        route_name="s3",
-    )
-    celery_app.send_task(
-        const.S3_WORKER_REMOVE_PAGE_THUMBNAIL,
-        kwargs={"page_ids": [str(i) for i in data.page_ids]},
-        route_name="s3",
-    )
+    # Large deletions are split into several messages so that
+    # neither broker nor S3 worker deals with huge payloads
+    size = settings.s3_cleanup_batch_size
+
+    for ids in batched(data.document_version_ids, size):
+        await enqueue_task(
+            db_session,
+            const.S3_WORKER_REMOVE_DOC_VER,
+            kwargs={"doc_ver_ids": [str(i) for i in ids]},
+            route_name="s3",
+        )
+    for ids in batched(data.document_ids, size):
+        await enqueue_task(
+            db_session,
+            const.S3_WORKER_REMOVE_DOCS_THUMBNAIL,
+            kwargs={"doc_ids": [str(i) for i in ids]},
+            route_name="s3",
+        )
+    for ids in batched(data.page_ids, size):
+        await enqueue_task(
+            db_session,
+            const.S3_WORKER_REMOVE_PAGE_THUMBNAIL,
+            kwargs={"page_ids": [str(i) for i in ids]},
+            route_name="s3",
+        )
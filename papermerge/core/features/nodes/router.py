@@ -3,7 +3,8 @@ import uuid
 from typing import Iterable, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, \
+    Response, status
 from sqlalchemy.exc import NoResultFound, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -12,11 +13,12 @@ from papermerge.core import schema, config
 from papermerge.core.features.auth import scopes
 from papermerge.core.features.nodes.db import api as nodes_dbapi
 from papermerge.core.features.auth.dependencies import require_scopes
-from papermerge.core.routers.common import OPEN_API_GENERIC_JSON_DETAIL
+from papermerge.core.routers.common import OPEN_API_GENERIC_JSON_DETAIL, \
+    model_response
 from papermerge.core.types import PaginatedResponse
 from papermerge.core.db import common as dbapi_common
 from papermerge.core import exceptions as exc
-from papermerge.core.db.engine import get_db
+from papermerge.core.db.engine import get_db, get_db_readonly, AsyncSessionLocal
 from papermerge.core.features.audit.db.audit_context import AsyncAuditContext
 from .schema import NodeParams
 
@@ -40,8 +42,8 @@ async def get_node(
     parent_id: UUID,
     user: require_scopes(scopes.NODE_VIEW),
     params: NodeParams = Depends(),
-    db_session: AsyncSession = Depends(get_db),
-) -> PaginatedResponse[Union[schema.DocumentEx, schema.FolderEx]]:
+    db_session: AsyncSession = Depends(get_db_readonly),
+) -> Response:
     """Returns list of *paginated* direct descendants of `parent_id` node
 
     Required scope: `node.view`
@@ -74,7 +76,7 @@ async def get_node(
         )
         raise HTTPException(status_code=500, detail="Internal server error")
 
-    return result
+    return model_response(result)
 
 
 @router.post(
@@ -192,6 +194,8 @@ async def update_node(
 async def delete_nodes(
     list_of_uuids: list[UUID],
     user: require_scopes(scopes.NODE_DELETE),
+    background_tasks: BackgroundTasks,
+    response: Response,
     db_session: AsyncSession = Depends(get_db),
 ):
     """Deletes nodes with specified UUIDs
@@ -199,15 +203,29 @@ async def delete_nodes(
     Returns a list of UUIDs of actually deleted nodes.
     In case nothing was deleted (e.g. no nodes with specified UUIDs
     were found) - will return an empty list.
+
+    If nodes with all their descendants count more than
+    `subtree_delete_background_threshold` nodes, deletion will continue
+    in background after the response (with status code 202) is sent.
     """
-    for node_id in list_of_uuids:
-        if not await dbapi_common.has_node_perm(
-            db_session,
-            node_id=node_id,
-            codename=scopes.NODE_DELETE,
+    if not await dbapi_common.has_nodes_perm(
+        db_session,
+        node_ids=list_of_uuids,
+        codename=scopes.NODE_DELETE,
+        user_id=user.id,
+    ):
+        raise exc.HTTP403Forbidden()
+
+    total = await dbapi_common.count_descendants(db_session, node_ids=list_of_uuids)
+    if total > settings.subtree_delete_background_threshold:
+        background_tasks.add_task(
+            _delete_nodes_in_background,
+            node_ids=list_of_uuids,
             user_id=user.id,
-        ):
-            raise exc.HTTP403Forbidden()
+            username=user.username,
+        )
+        response.status_code = status.HTTP_202_ACCEPTED
+        return
 
     async with AsyncAuditContext(
         db_session,
@@ -222,6 +240,31 @@ async def delete_nodes(
         raise HTTPException(status_code=400, detail=error.model_dump())
 
 
+async def _delete_nodes_in_background(
+    node_ids: list[UUID],
+    user_id: UUID,
+    username: str,
+):
+    def log_progress(deleted: int, total: int):
+        logger.info(f"Deleting nodes {node_ids}: {deleted}/{total}")
+
+    async with AsyncSessionLocal() as db_session:
+        async with AsyncAuditContext(
+            db_session,
+            user_id=user_id,
+            username=username
+        ):
+            error = await nodes_dbapi.delete_nodes(
+                db_session,
+                node_ids=node_ids,
+                user_id=user_id,
+                on_progress=log_progress,
+            )
+
+    if error:
+        logger.error(f"Failed to delete nodes {node_ids}: {error.messages}")
+
+
 @router.post(
     "/move",
     responses={
@@ -328,6 +371,83 @@ async def move_nodes(
     return params.source_ids
 
 
+@router.post(
+    "/bulk/tags",
+    responses={
+        status.HTTP_403_FORBIDDEN: {
+            "description": f"User does not have `{scopes.NODE_UPDATE}` permission on "
+            "some of the nodes",
+            "content": OPEN_API_GENERIC_JSON_DETAIL,
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "Too many nodes or tags could not be updated",
+            "content": OPEN_API_GENERIC_JSON_DETAIL,
+        },
+    },
+)
+async def bulk_update_node_tags(
+    params: schema.BulkNodeTags,
+    user: require_scopes(scopes.NODE_UPDATE),
+    db_session: AsyncSession = Depends(get_db),
+) -> list[UUID]:
+    """
+    Adds, removes or replaces tags of multiple nodes in one request.
+
+    `mode` is one of:
+
+        * `add` - given tags are appended to the currently associated tags
+        * `remove` - given tags are dissociated from the nodes
+        * `replace` - upon successful completion nodes will have ONLY
+          the tags from the list
+
+    Missing tags are created with the same owner as the node they are
+    assigned to.
+
+    Returns UUIDs of updated nodes. At most `PM_BULK_TAGS_MAX_SIZE` nodes
+    per request.
+    """
+    if len(params.node_ids) > settings.bulk_tags_max_size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.bulk_tags_max_size} nodes per request",
+        )
+
+    try:
+        if not await dbapi_common.has_nodes_perm(
+            db_session,
+            node_ids=params.node_ids,
+            codename=scopes.NODE_UPDATE,
+            user_id=user.id,
+        ):
+            raise exc.HTTP403Forbidden()
+
+        async with AsyncAuditContext(
+            db_session,
+            user_id=user.id,
+            username=user.username
+        ):
+            node_ids = await nodes_dbapi.bulk_update_node_tags(
+                db_session,
+                node_ids=params.node_ids,
+                tags=params.tags,
+                mode=params.mode,
+                created_by=user.id,
+            )
+    except exc.HTTP403Forbidden:
+        raise
+    except EntityNotFound:
+        await db_session.rollback()
+        raise HTTP404NotFound
+    except Exception:
+        await db_session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to update tags"
+        )
+
+    return node_ids
+
+
 @router.post(
     "/{node_id}/tags",
     responses={
@@ -399,7 +519,7 @@ async def assign_node_tags(
 async def get_nodes_details(
     user: require_scopes(scopes.NODE_VIEW),
     node_ids: list[uuid.UUID] | None = Query(default=None),
-    db_session: AsyncSession = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db_readonly),
 ) -> list[schema.Folder | schema.Document]:
     """Returns detailed information about queried nodes
     (breadcrumb, tags)
@@ -508,7 +628,7 @@ async def update_node_tags(
 async def get_node_tags(
     node_id: UUID,
     user: require_scopes(scopes.NODE_VIEW),
-    db_session=Depends(get_db),
+    db_session=Depends(get_db_readonly),
 ) -> Iterable[schema.Tag]:
     """Retrieves nodes tags"""
     try:
@@ -11,7 +11,7 @@ from papermerge.core.features.auth import get_current_user
 from papermerge.core.features.auth import scopes
 from papermerge.core.db import common as dbapi_common
 from papermerge.core.exceptions import HTTP403Forbidden
-from papermerge.core.db.engine import get_db
+from papermerge.core.db.engine import get_db_readonly
 from .schema import Folder
 from .db import api as dbapi
 
@@ -25,7 +25,7 @@ async def get_node(
     user: Annotated[
         usr_schema.User, Security(get_current_user, scopes=[scopes.NODE_VIEW])
     ],
-    db_session: AsyncSession = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db_readonly),
 ) -> Folder:
     """
     Get folder details
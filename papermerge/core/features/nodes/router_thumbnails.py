@@ -1,25 +1,37 @@
+import asyncio
+import hashlib
+import json
 import logging
 import os
 import uuid
-from typing import Annotated
+from typing import Annotated, Literal
 
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, HTTPException, Security, Depends
+from fastapi import APIRouter, HTTPException, Security, Depends, Request, Query
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 
-from papermerge.core import utils
+from papermerge.core import utils, config
 from papermerge.core.features.users import schema as usr_schema
 from papermerge.core.features.auth import get_current_user
 from papermerge.core.features.auth import scopes
 from papermerge.core.features.document.db import api as dbapi
+from papermerge.core.features.document.response import (
+    IMMUTABLE_CACHE_CONTROL,
+    MultipartResponse,
+    NotModifiedResponse,
+    REVALIDATE_CACHE_CONTROL,
+    cache_headers,
+    is_not_modified,
+    make_etag,
+)
 from papermerge.core.pathlib import rel2abs, thumbnail_path
 from papermerge.core.utils import image
-from papermerge.core.db.common import has_node_perm
+from papermerge.core.db.common import has_node_perm, get_nodes_with_perm
 from papermerge.core.exceptions import HTTP403Forbidden, HTTP404NotFound
 from papermerge.core.routers.common import OPEN_API_GENERIC_JSON_DETAIL
-from papermerge.core.db.engine import get_db
+from papermerge.core.db.engine import get_db, get_db_readonly
 
 router = APIRouter(
     prefix="/thumbnails",
@@ -27,6 +39,7 @@ router = APIRouter(
 )
 
 logger = logging.getLogger(__name__)
+settings = config.get_settings()
 
 
 class Message(BaseModel):
@@ -37,6 +50,199 @@ class JPEGFileResponse(FileResponse):
     media_type = "application/jpeg"
 
 
+def thumbnail_file(source) -> str:
+    """Absolute path of the page thumbnail; generated if missing
+
+    `source` is a row with `page_id`, `page_number`, `doc_ver_id`
+    and `file_name`.
+    """
+    jpg_abs_path = rel2abs(thumbnail_path(source.page_id))
+
+    if not os.path.exists(jpg_abs_path):
+        image.gen_doc_thumbnail(
+            page_id=source.page_id,
+            doc_ver_id=source.doc_ver_id,
+            page_number=source.page_number,
+            file_name=source.file_name,
+        )
+
+    return str(jpg_abs_path)
+
+
+def read_thumbnails(sources: list) -> list[bytes]:
+    result = []
+    for source in sources:
+        with open(thumbnail_file(source), "rb") as f:
+            result.append(f.read())
+
+    return result
+
+
+def build_sprite(sources: list) -> tuple[bytes, list[tuple[int, int, int, int]]]:
+    paths = [thumbnail_file(source) for source in sources]
+
+    return image.make_sprite(paths)
+
+
+@router.get(
+    "/batch",
+    responses={
+        200: {
+            "description": """`multipart/mixed` response. With `format=multipart`
+            there is one `image/jpeg` part per document, identified by its
+            `Content-ID` header (the document ID). With `format=sprite` first
+            part is a JSON map of document IDs to boxes (`x`, `y`, `width`,
+            `height`) within the sprite sheet, second part is the sheet
+            (`image/jpeg`). Documents which are not ready for preview yet
+            are left out (listed in `missing` of the sprite map).""",
+            "content": {"multipart/mixed": {}},
+        },
+        304: {
+            "description": "Client's cached thumbnails are still valid",
+        },
+        400: {
+            "description": "Too many documents requested at once",
+            "content": OPEN_API_GENERIC_JSON_DETAIL,
+        },
+        403: {
+            "description": f"No `{scopes.NODE_VIEW}` permission on one of the documents",
+            "content": OPEN_API_GENERIC_JSON_DETAIL,
+        },
+    },
+)
+@utils.docstring_parameter(scope=scopes.NODE_VIEW)
+async def get_documents_thumbnails(
+    request: Request,
+    user: Annotated[
+        usr_schema.User, Security(get_current_user, scopes=[scopes.NODE_VIEW])
+    ],
+    doc_ids: list[uuid.UUID] = Query(),
+    fmt: Literal["multipart", "sprite"] = Query("multipart", alias="format"),
+    db_session: AsyncSession = Depends(get_db_readonly),
+):
+    """Retrieves thumbnails of many documents in one response
+
+    Permissions of all documents are checked at once and thumbnails are
+    located with one query, instead of one request (and several queries)
+    per document. ETag changes only when one of the documents gets a new
+    version.
+
+    Required scope: `{scope}`
+    """
+    doc_ids = list(dict.fromkeys(doc_ids))
+    if len(doc_ids) > settings.thumbnails_batch_max_size:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.thumbnails_batch_max_size} documents per request",
+        )
+
+    allowed = await get_nodes_with_perm(
+        db_session, node_ids=doc_ids, codename=scopes.NODE_VIEW, user_id=user.id
+    )
+    if len(allowed) < len(doc_ids):
+        raise HTTP403Forbidden()
+
+    pages = await dbapi.get_thumbnail_pages(db_session, doc_ids=doc_ids)
+    ready = [doc_id for doc_id in doc_ids if doc_id in pages]
+    missing = [doc_id for doc_id in doc_ids if doc_id not in pages]
+    sources = [pages[doc_id] for doc_id in ready]
+
+    digest = hashlib.sha1(
+        ",".join(f"{doc_id}:{pages[doc_id].page_id}" for doc_id in ready).encode()
+    ).hexdigest()
+    headers = cache_headers(make_etag("thb", fmt, digest), REVALIDATE_CACHE_CONTROL)
+    if is_not_modified(request, headers["ETag"]):
+        return NotModifiedResponse(headers=headers)
+
+    if fmt == "sprite":
+        sheet, boxes = await asyncio.to_thread(build_sprite, sources)
+        sprite_map = {
+            "items": {
+                str(doc_id): {
+                    "page_id": str(pages[doc_id].page_id),
+                    "x": x,
+                    "y": y,
+                    "width": width,
+                    "height": height,
+                }
+                for doc_id, (x, y, width, height) in zip(ready, boxes)
+            },
+            "missing": [str(doc_id) for doc_id in missing],
+        }
+        parts = [
+            ({"Content-Type": "application/json"}, json.dumps(sprite_map).encode()),
+            ({"Content-Type": "image/jpeg"}, sheet),
+        ]
+        return MultipartResponse(parts, headers=headers)
+
+    contents = await asyncio.to_thread(read_thumbnails, sources)
+    parts = [
+        (
+            {
+                "Content-Type": "image/jpeg",
+                "Content-ID": f"<{doc_id}>",
+                "X-Page-ID": str(pages[doc_id].page_id),
+            },
+            content,
+        )
+        for doc_id, content in zip(ready, contents)
+    ]
+
+    return MultipartResponse(parts, headers=headers)
+
+
+@router.get(
+    "/pages/{page_id}",
+    response_class=JPEGFileResponse,
+    responses={
+        304: {
+            "description": "Client's cached thumbnail is still valid",
+        },
+        404: {
+            "description": """Page with specified UUID was not found""",
+            "content": OPEN_API_GENERIC_JSON_DETAIL,
+        },
+    },
+)
+@utils.docstring_parameter(scope=scopes.NODE_VIEW)
+async def get_page_thumbnail(
+    page_id: uuid.UUID,
+    request: Request,
+    user: Annotated[
+        usr_schema.User, Security(get_current_user, scopes=[scopes.NODE_VIEW])
+    ],
+    db_session: AsyncSession = Depends(get_db_readonly),
+):
+    """Retrieves thumbnail of the page
+
+    Cheap path for clients which already know the page (e.g. from
+    thumbnail image status): one query locates the page and one checks
+    permission on its document. Thumbnail of a page never changes, thus
+    clients may cache it for good.
+
+    Required scope: `{scope}`
+    """
+    try:
+        source = await dbapi.get_page_thumbnail_source(db_session, page_id=page_id)
+    except NoResultFound:
+        raise HTTP404NotFound
+
+    ok = await has_node_perm(
+        db_session, user_id=user.id, codename=scopes.NODE_VIEW, node_id=source.doc_id
+    )
+    if not ok:
+        raise HTTP403Forbidden()
+
+    headers = cache_headers(make_etag("th", page_id), IMMUTABLE_CACHE_CONTROL)
+    if is_not_modified(request, headers["ETag"]):
+        return NotModifiedResponse(headers=headers)
+
+    jpg_abs_path = await asyncio.to_thread(thumbnail_file, source)
+
+    return JPEGFileResponse(jpg_abs_path, headers=headers)
+
+
+
 @router.get(
     "/{document_id}",
     response_class=JPEGFileResponse,
@@ -48,6 +254,9 @@ class JPEGFileResponse(FileResponse):
             code.""",
             "content": OPEN_API_GENERIC_JSON_DETAIL,
         },
+        304: {
+            "description": "Client's cached thumbnail is still valid",
+        },
         404: {
             "description": """Document with specified UUID was not found""",
             "content": OPEN_API_GENERIC_JSON_DETAIL,
@@ -57,6 +266,7 @@ class JPEGFileResponse(FileResponse):
 @utils.docstring_parameter(scope=scopes.NODE_VIEW)
 async def get_document_thumbnail(
     document_id: uuid.UUID,
+    request: Request,
     user: Annotated[
         usr_schema.User, Security(get_current_user, scopes=[scopes.NODE_VIEW])
     ],
@@ -64,6 +274,9 @@ async def get_document_thumbnail(
 ):
     """Retrieves thumbnail of the document last version's first page
 
+    Thumbnail's ETag is derived from the ID of the page it was generated
+    from, so it changes only when document gets a new version.
+
     Required scope: `{scope}`
     """
 
@@ -85,6 +298,12 @@ async def get_document_thumbnail(
             detail="Not ready for preview yet",
         )
 
+    headers = cache_headers(
+        make_etag("th", page.id), REVALIDATE_CACHE_CONTROL
+    )
+    if is_not_modified(request, headers["ETag"]):
+        return NotModifiedResponse(headers=headers)
+
     jpg_abs_path = rel2abs(thumbnail_path(page.id))
 
     if not os.path.exists(jpg_abs_path):
@@ -95,4 +314,4 @@ async def get_document_thumbnail(
             file_name=doc_ver.file_name,
         )
 
-    return JPEGFileResponse(jpg_abs_path)
+    return JPEGFileResponse(jpg_abs_path, headers=headers)
@@ -123,6 +123,18 @@ class MoveNode(BaseModel):
     target_id: UUID
 
 
+class BulkTagsMode(str, Enum):
+    add = "add"  # append tags, keep currently associated ones
+    remove = "remove"  # dissociate tags
+    replace = "replace"  # nodes end up with exactly given tags
+
+
+class BulkNodeTags(BaseModel):
+    node_ids: List[UUID] = Field(min_length=1)
+    tags: List[str]
+    mode: BulkTagsMode = BulkTagsMode.add
+
+
 class NewFolder(BaseModel):
     # UUID may be present to allow custom IDs
     # See https://github.com/papermerge/papermerge-core/issues/325
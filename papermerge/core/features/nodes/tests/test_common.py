@@ -1,6 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from papermerge.core.db.common import get_ancestors, has_node_perm
+from papermerge.core.db.common import (
+    get_ancestors,
+    get_descendants_deepest_first,
+    has_node_perm,
+)
 from papermerge.core.features.auth import scopes
 from papermerge.core import dbapi
 
@@ -39,6 +43,32 @@ async def test_get_ancestors_root_is_first(make_folder, make_document, user, db_
     assert actual_titles == expected_titles
 
 
+
+async def test_get_descendants_deepest_first(
+    make_folder, make_document, user, db_session: AsyncSession
+):
+    root = await make_folder("Root", user=user, parent=user.home_folder)
+    f1 = await make_folder("F1", user=user, parent=root)
+    doc = await make_document("doc.pdf", user=user, parent=f1)
+
+    ids = await get_descendants_deepest_first(db_session, node_ids=[root.id])
+
+    assert ids == [doc.id, f1.id, root.id]
+
+
+async def test_get_descendants_deepest_first_overlapping_node_ids(
+    make_folder, make_document, user, db_session: AsyncSession
+):
+    root = await make_folder("Root", user=user, parent=user.home_folder)
+    f1 = await make_folder("F1", user=user, parent=root)
+    doc = await make_document("doc.pdf", user=user, parent=f1)
+
+    # f1 is also a descendant of root: every node is returned once
+    ids = await get_descendants_deepest_first(db_session, node_ids=[f1.id, root.id])
+
+    assert ids == [doc.id, f1.id, root.id]
+
+
 async def test_has_node_perm_basic_negative(make_user, make_folder, db_session: AsyncSession):
     """
     John and David are two users that do not have anything in common.
@@ -9,7 +9,7 @@ from papermerge.core.features.nodes.db import api as dbapi
 from papermerge.core.features.ownership.db import api as ownership_api
 from papermerge.core.features.custom_fields.db import api as cf_dbapi
 from papermerge.core.db import common as common_dbapi
-from papermerge.core.types import ResourceType, OwnerType
+from papermerge.core.types import ResourceType, OwnerType, Owner
 
 
 async def test_get_descendants(make_folder, make_document, db_session: AsyncSession, user):
@@ -382,3 +382,173 @@ async def test_move_nodes(
         )
         assert owner_id == family.id
         assert owner_type == OwnerType.GROUP
+
+
+async def test_bulk_update_node_tags_add(
+    db_session: AsyncSession, make_folder, make_document, user
+):
+    folder = await make_folder(title="My Folder", user=user, parent=user.home_folder)
+    doc = await make_document(title="some.pdf", user=user, parent=user.home_folder)
+    await dbapi.assign_node_tags(
+        db_session, node_id=doc.id, tags=["important"], created_by=user.id
+    )
+
+    await dbapi.bulk_update_node_tags(
+        db_session,
+        node_ids=[folder.id, doc.id],
+        tags=["important", "paid"],
+        mode=schema.BulkTagsMode.add,
+        created_by=user.id,
+    )
+
+    for node_id in (folder.id, doc.id):
+        tags, error = await dbapi.get_node_tags(
+            db_session, node_id=node_id, user_id=user.id
+        )
+        assert error is None
+        assert {"important", "paid"} == {t.name for t in tags}
+
+    # tag 'important' was not created a second time
+    stmt = select(func.count(orm.Tag.id)).where(orm.Tag.name == "important")
+    assert (await db_session.execute(stmt)).scalar() == 1
+
+
+async def test_bulk_update_node_tags_replace_and_remove(
+    db_session: AsyncSession, make_folder, user
+):
+    f1 = await make_folder(title="F1", user=user, parent=user.home_folder)
+    f2 = await make_folder(title="F2", user=user, parent=user.home_folder)
+    for folder in (f1, f2):
+        await dbapi.assign_node_tags(
+            db_session, node_id=folder.id, tags=["a", "b"], created_by=user.id
+        )
+
+    await dbapi.bulk_update_node_tags(
+        db_session,
+        node_ids=[f1.id, f2.id],
+        tags=["b", "c"],
+        mode=schema.BulkTagsMode.replace,
+        created_by=user.id,
+    )
+    tags, _ = await dbapi.get_node_tags(db_session, node_id=f1.id, user_id=user.id)
+    assert {"b", "c"} == {t.name for t in tags}
+
+    await dbapi.bulk_update_node_tags(
+        db_session,
+        node_ids=[f1.id, f2.id],
+        tags=["b"],
+        mode=schema.BulkTagsMode.remove,
+        created_by=user.id,
+    )
+    tags, _ = await dbapi.get_node_tags(db_session, node_id=f2.id, user_id=user.id)
+    assert {"c"} == {t.name for t in tags}
+
+
+async def test_bulk_update_node_tags_remove_only_owner_tags(
+    db_session: AsyncSession, make_folder, make_user, make_tag_with_owner, user
+):
+    """Remove mode must not touch same named tags of other owners"""
+    user_b = await make_user("user_b", is_superuser=False)
+    folder = await make_folder(title="F", user=user, parent=user.home_folder)
+    await dbapi.assign_node_tags(
+        db_session, node_id=folder.id, tags=["x"], created_by=user.id
+    )
+    foreign_tag = await make_tag_with_owner(
+        "x", owner_type=OwnerType.USER, owner_id=user_b.id
+    )
+    db_session.add(
+        orm.NodeTagsAssociation(node_id=folder.id, tag_id=foreign_tag.id)
+    )
+    await db_session.commit()
+
+    await dbapi.bulk_update_node_tags(
+        db_session,
+        node_ids=[folder.id],
+        tags=["x"],
+        mode=schema.BulkTagsMode.remove,
+        created_by=user.id,
+    )
+
+    stmt = select(orm.NodeTagsAssociation.tag_id).where(
+        orm.NodeTagsAssociation.node_id == folder.id
+    )
+    assert (await db_session.scalars(stmt)).all() == [foreign_tag.id]
+
+
+async def test_delete_deep_subtree_in_small_batches(
+    db_session: AsyncSession, make_document, make_folder, user
+):
+    """
+    Subtree is deleted bottom-up in batches; batch size smaller than
+    the subtree must still delete all nodes (deepest first, so that
+    no remaining node references an already deleted parent)
+    """
+    root = await make_folder(title="Root", parent=user.home_folder, user=user)
+    parent = root
+    for level in range(3):
+        parent = await make_folder(title=f"Level {level}", parent=parent, user=user)
+        await make_document(title=f"doc-{level}.pdf", user=user, parent=parent)
+
+    assert await common_dbapi.count_descendants(db_session, node_ids=[root.id]) == 7
+
+    progress = []
+    error = await dbapi.delete_nodes(
+        db_session,
+        node_ids=[root.id],
+        user_id=user.id,
+        batch_size=2,
+        on_progress=lambda deleted, total: progress.append((deleted, total)),
+    )
+
+    assert error is None, error.model_dump()
+    assert progress[-1] == (7, 7)
+    assert len(progress) == 4
+    node_count = (await db_session.execute(
+        select(func.count(orm.Node.id)).where(orm.Node.id == root.id)
+    )).scalar()
+    assert node_count == 0
+
+
+async def test_set_subtree_owner_skips_when_owner_is_same(
+    db_session: AsyncSession, make_folder, make_document, make_group, user
+):
+    folder = await make_folder(title="My Documents", parent=user.home_folder, user=user)
+    await make_document(title="doc-1.pdf", user=user, parent=folder)
+    family = await make_group("Family", with_special_folders=True)
+
+    # folder and its descendants are already owned by the user
+    changed = await ownership_api.set_subtree_owner(
+        db_session,
+        node_ids=[folder.id],
+        owner=Owner(owner_type=OwnerType.USER, owner_id=user.id),
+    )
+    assert changed == 0
+
+    changed = await ownership_api.set_subtree_owner(
+        db_session,
+        node_ids=[folder.id],
+        owner=Owner(owner_type=OwnerType.GROUP, owner_id=family.id),
+    )
+    # folder itself + one document
+    assert changed == 2
+
+
+async def test_set_subtree_owner_creates_missing_ownerships(
+    db_session: AsyncSession, make_folder, make_document, make_group, user
+):
+    folder = await make_folder(title="My Documents", parent=user.home_folder, user=user)
+    doc = await make_document(title="doc-1.pdf", user=user, parent=folder)
+    family = await make_group("Family", with_special_folders=True)
+    await ownership_api.delete_ownership(db_session, ResourceType.NODE, doc.id)
+
+    # overlapping node IDs: document is also a descendant of the folder
+    changed = await ownership_api.set_subtree_owner(
+        db_session,
+        node_ids=[folder.id, doc.id],
+        owner=Owner(owner_type=OwnerType.GROUP, owner_id=family.id),
+    )
+
+    assert changed == 2
+    assert await ownership_api.get_owner_info(
+        db_session, ResourceType.NODE, doc.id
+    ) == (OwnerType.GROUP, family.id)
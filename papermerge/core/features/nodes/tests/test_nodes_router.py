@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
 from papermerge.core.features.document.db import api as doc_dbapi
+from papermerge.core.features.nodes import router as nodes_router
 from papermerge.core.features.nodes.db import api as nodes_dbapi
 from papermerge.core import orm, schema
 from papermerge.core.tests.types import AuthTestClient, DocumentTestFileType
@@ -635,3 +636,84 @@ async def test_get_node_tags_router_when_node_is_document(
     tag_names = {schema.Tag.model_validate(t).name for t in response.json()}
 
     assert tag_names == {"tag1", "tag2"}
+
+
+async def test_bulk_assign_tags_to_multiple_nodes(
+    auth_api_client: AuthTestClient, make_folder, db_session: AsyncSession
+):
+    """
+    url:
+        POST /api/nodes/bulk/tags
+    body content:
+        {"node_ids": [N1, N2], "tags": ["paid"], "mode": "add"}
+
+    Expected result:
+        both folders N1 and N2 will have tag 'paid' assigned
+    """
+    u = auth_api_client.user
+    receipts = await make_folder(title="Receipts", user=u, parent=u.inbox_folder)
+    invoices = await make_folder(title="Invoices", user=u, parent=u.inbox_folder)
+    payload = {
+        "node_ids": [str(receipts.id), str(invoices.id)],
+        "tags": ["paid"],
+        "mode": "add",
+    }
+
+    response = await auth_api_client.post("/nodes/bulk/tags", json=payload)
+
+    assert response.status_code == 200, response.json()
+
+    stmt = (
+        select(func.count(orm.NodeTagsAssociation.id))
+        .join(orm.Tag)
+        .where(
+            orm.NodeTagsAssociation.node_id.in_([receipts.id, invoices.id]),
+            orm.Tag.name == "paid",
+        )
+    )
+    assert (await db_session.execute(stmt)).scalar() == 2
+
+
+async def test_bulk_update_node_tags(
+    auth_api_client: AuthTestClient, make_folder, db_session: AsyncSession
+):
+    """
+    url:
+        POST /api/nodes/bulk/tags
+
+    Route must not be shadowed by `POST /api/nodes/{node_id}/tags`
+    """
+    user = auth_api_client.user
+    f1 = await make_folder(title="F1", user=user, parent=user.home_folder)
+    f2 = await make_folder(title="F2", user=user, parent=user.home_folder)
+    payload = {
+        "node_ids": [str(f1.id), str(f2.id)],
+        "tags": ["paid", "important"],
+        "mode": "add",
+    }
+
+    response = await auth_api_client.post("/nodes/bulk/tags", json=payload)
+
+    assert response.status_code == 200, response.json()
+    assert set(response.json()) == {str(f1.id), str(f2.id)}
+
+    stmt = (
+        select(func.count(orm.NodeTagsAssociation.tag_id))
+        .where(orm.NodeTagsAssociation.node_id.in_([f1.id, f2.id]))
+    )
+    assert (await db_session.execute(stmt)).scalar() == 4
+
+
+async def test_bulk_update_node_tags_rejects_too_many_nodes(
+    auth_api_client: AuthTestClient, monkeypatch
+):
+    monkeypatch.setattr(nodes_router.settings, "bulk_tags_max_size", 1)
+    payload = {
+        "node_ids": [str(uuid.uuid4()), str(uuid.uuid4())],
+        "tags": ["paid"],
+        "mode": "add",
+    }
+
+    response = await auth_api_client.post("/nodes/bulk/tags", json=payload)
+
+    assert response.status_code == 400, response.json()
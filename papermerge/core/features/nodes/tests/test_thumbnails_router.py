@@ -1,3 +1,5 @@
+import uuid
+
 import pytest
 
 from papermerge.core.tests.types import DocumentTestFileType
@@ -44,3 +46,58 @@ async def test_thumbnails_router_no_auth(
     response = await api_client.get(f"/thumbnails/{data['id']}")
 
     assert response.status_code == 401
+
+
+async def test_thumbnails_batch_no_auth(api_client, make_document, user):
+    doc = await make_document("doc", user=user, parent=user.home_folder)
+
+    response = await api_client.get(
+        "/thumbnails/batch", params={"doc_ids": [str(doc.id)]}
+    )
+
+    assert response.status_code == 401
+
+
+async def test_thumbnails_batch_forbidden(
+    auth_api_client: AuthTestClient, make_user, make_document
+):
+    user_b = await make_user("user_b", is_superuser=False)
+    doc = await make_document("doc_b", user=user_b, parent=user_b.home_folder)
+
+    response = await auth_api_client.get(
+        "/thumbnails/batch", params={"doc_ids": [str(doc.id)]}
+    )
+
+    assert response.status_code == 403
+
+
+async def test_thumbnails_batch_sprite_not_ready(
+    auth_api_client: AuthTestClient, make_document
+):
+    """Documents without pages are reported as missing in the sprite map"""
+    user = auth_api_client.user
+    doc = await make_document("doc", user=user, parent=user.home_folder)
+
+    response = await auth_api_client.get(
+        "/thumbnails/batch",
+        params={"doc_ids": [str(doc.id)], "format": "sprite"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("multipart/mixed")
+    assert f'"missing": ["{doc.id}"]' in response.text
+
+    etag = response.headers["etag"]
+    response = await auth_api_client.get(
+        "/thumbnails/batch",
+        params={"doc_ids": [str(doc.id)], "format": "sprite"},
+        headers={"If-None-Match": etag},
+    )
+
+    assert response.status_code == 304
+
+
+async def test_page_thumbnail_not_found(auth_api_client: AuthTestClient):
+    response = await auth_api_client.get(f"/thumbnails/pages/{uuid.uuid4()}")
+
+    assert response.status_code == 404
@@ -0,0 +1,77 @@
+import typer
+from rich.console import Console
+
+from papermerge.core import config
+from papermerge.core.db.engine import AsyncSessionLocal
+from papermerge.core.features.outbox import relay
+from papermerge.core.features.outbox.db import api as dbapi
+from papermerge.core.utils.cli import async_command
+
+app = typer.Typer(help="Outbox of Celery tasks")
+console = Console()
+settings = config.get_settings()
+
+
+@app.command("relay")
+@async_command
+async def relay_cmd(
+    batch_size: int = typer.Option(
+        settings.outbox_batch_size, min=1, help="Messages published per transaction"
+    ),
+    poll_interval: float = typer.Option(
+        settings.outbox_poll_interval, min=0.1, help="Seconds between polls"
+    ),
+):
+    """Publish outbox messages to the broker until interrupted
+
+    Use it with PM_OUTBOX_RELAY_EMBEDDED=false; any number of relays
+    may run in parallel.
+    """
+    outbox_relay = relay.OutboxRelay(
+        AsyncSessionLocal,
+        str(settings.db_url),
+        batch_size=batch_size,
+        poll_interval=poll_interval,
+    )
+    console.print("Outbox relay started")
+    try:
+        await outbox_relay.run()
+    finally:
+        await outbox_relay.close()
+
+
+@app.command("publish")
+@async_command
+async def publish_cmd(
+    batch_size: int = typer.Option(
+        settings.outbox_batch_size, min=1, help="Messages published per transaction"
+    ),
+):
+    """Publish all due outbox messages once"""
+    async with AsyncSessionLocal() as db_session:
+        result = await relay.publish_pending(db_session, batch_size)
+
+    console.print(f"Published {result.sent} messages, {result.failed} failed")
+
+
+@app.command("status")
+@async_command
+async def status_cmd():
+    """Show number of pending messages"""
+    async with AsyncSessionLocal() as db_session:
+        stats = await dbapi.get_stats(db_session)
+
+    console.print(f"Pending: {stats.pending}")
+    console.print(f"Failing: [red]{stats.failing}[/red]")
+    if stats.oldest:
+        console.print(f"Oldest: {stats.oldest:%Y-%m-%d %H:%M:%S %Z}")
+
+
+@app.command("retry")
+@async_command
+async def retry_cmd():
+    """Retry failing messages now instead of waiting for their backoff"""
+    async with AsyncSessionLocal() as db_session:
+        count = await dbapi.retry_now(db_session)
+
+    console.print(f"{count} messages are due now")
@@ -0,0 +1,169 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from papermerge.core.features.outbox.db.orm import OutboxMessage
+
+# Notified (on commit) whenever messages are added to the outbox
+CHANNEL = "outbox"
+
+
+@dataclass
+class OutboxStats:
+    pending: int
+    # pending messages which failed to publish at least once
+    failing: int
+    oldest: datetime | None
+
+
+def _upsert(rows: list[dict[str, Any]]):
+    stmt = insert(OutboxMessage).values(rows)
+    # DO UPDATE (rather than DO NOTHING) waits for the relay if it is
+    # just publishing the pending message; once that one is deleted
+    # the new message is inserted, so the task is never lost
+    return stmt.on_conflict_do_update(
+        index_elements=[OutboxMessage.dedup_key],
+        set_={
+            "name": stmt.excluded.name,
+            "kwargs": stmt.excluded.kwargs,
+            "route_name": stmt.excluded.route_name,
+            "priority": stmt.excluded.priority,
+            "batch_id": stmt.excluded.batch_id,
+            # new payload starts afresh, without backoff of the old one
+            "available_at": stmt.excluded.available_at,
+            "attempts": 0,
+            "last_error": None,
+        },
+    )
+
+
+async def _notify(db_session: AsyncSession) -> None:
+    # Delivered on commit; Postgres folds identical notifications of
+    # one transaction into one
+    await db_session.execute(select(func.pg_notify(CHANNEL, "")))
+
+
+async def enqueue(
+    db_session: AsyncSession,
+    name: str,
+    kwargs: dict[str, Any] | None = None,
+    route_name: str | None = None,
+    dedup_key: str | None = None,
+    priority: int | None = None,
+) -> None:
+    """Adds task `name` to the outbox; does not commit
+
+    The task is published only if, and after, the current transaction
+    commits. A pending message with the same `dedup_key` is updated
+    instead of adding a new one, thus e.g. repeated moves of the same
+    document result in one message.
+    """
+    row = dict(
+        name=name,
+        kwargs=kwargs or {},
+        route_name=route_name,
+        dedup_key=dedup_key,
+        priority=priority,
+    )
+    if dedup_key is None:
+        stmt = insert(OutboxMessage).values(row)
+    else:
+        stmt = _upsert([row])
+    await db_session.execute(stmt)
+    await _notify(db_session)
+
+
+async def enqueue_many(
+    db_session: AsyncSession,
+    messages: list[dict[str, Any]],
+) -> None:
+    """Adds `messages` to the outbox with one statement; does not commit
+
+    Each message is a dict of `OutboxMessage` columns, all with the same
+    keys, including `dedup_key` (pending messages with the same
+    `dedup_key` are updated, as in `enqueue`). `available_at` may be a
+    SQL expression, e.g. ``func.now() + timedelta(...)``.
+    """
+    if not messages:
+        return
+
+    await db_session.execute(_upsert(messages))
+    await _notify(db_session)
+
+
+async def claim_batch(db_session: AsyncSession, limit: int) -> list[OutboxMessage]:
+    """Locks up to `limit` messages which are due for publishing
+
+    Messages locked by another relay are skipped.
+    """
+    stmt = (
+        select(OutboxMessage)
+        .where(OutboxMessage.available_at <= func.now())
+        .order_by(OutboxMessage.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+
+    return list((await db_session.scalars(stmt)).all())
+
+
+async def delete_messages(db_session: AsyncSession, ids: list[int]) -> None:
+    if not ids:
+        return
+
+    await db_session.execute(delete(OutboxMessage).where(OutboxMessage.id.in_(ids)))
+
+
+def retry_delay(attempts: int, max_delay: int) -> int:
+    """Seconds to wait before next attempt: 2, 4, 8, ... up to `max_delay`"""
+    return min(2 ** min(attempts, 30), max_delay)
+
+
+def retry_later(
+    messages: list[OutboxMessage],
+    errors: dict[int, str],
+    max_delay: int,
+) -> None:
+    """Postpones `messages` which failed to publish with `errors`"""
+    now = datetime.now(timezone.utc)
+    for message in messages:
+        message.attempts += 1
+        message.last_error = errors.get(message.id)
+        message.available_at = now + timedelta(
+            seconds=retry_delay(message.attempts, max_delay)
+        )
+
+
+async def get_stats(
+    db_session: AsyncSession, batch_id: UUID | None = None
+) -> OutboxStats:
+    """Stats of all pending messages, or only of those of `batch_id`"""
+    stmt = select(
+        func.count(),
+        func.count().filter(OutboxMessage.attempts > 0),
+        func.min(OutboxMessage.created_at),
+    ).select_from(OutboxMessage)
+    if batch_id is not None:
+        stmt = stmt.where(OutboxMessage.batch_id == batch_id)
+    pending, failing, oldest = (await db_session.execute(stmt)).one()
+
+    return OutboxStats(pending=pending, failing=failing, oldest=oldest)
+
+
+async def retry_now(db_session: AsyncSession) -> int:
+    """Makes all postponed messages due immediately; returns their count"""
+    stmt = (
+        update(OutboxMessage)
+        .where(OutboxMessage.available_at > func.now())
+        .values(available_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    result = await db_session.execute(stmt)
+    await db_session.commit()
+
+    return result.rowcount
@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import BigInteger, Identity, Index, SmallInteger, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from papermerge.core.db.base import Base
+
+
+class OutboxMessage(Base):
+    """
+    Celery task waiting to be published to the broker.
+
+    Written in the same transaction as the change which requires the task
+    and published by the outbox relay (see `outbox.relay`) after commit;
+    published messages are deleted.
+
+    Pending messages with the same `dedup_key` are coalesced into one.
+    """
+    __tablename__ = "outbox"
+
+    # insertion order, which is also the publishing order
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    kwargs: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False, default=dict)
+    route_name: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    dedup_key: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, unique=True)
+    # broker message priority
+    priority: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
+    # messages enqueued together (e.g. by bulk OCR), to follow their progress
+    batch_id: Mapped[Optional[UUID]] = mapped_column(nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now(), nullable=False
+    )
+    # not published before this time (retry backoff)
+    available_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now(), nullable=False
+    )
+    # number of failed publishing attempts
+    attempts: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (
+        Index('idx_outbox_available_at', 'available_at', 'id'),
+        Index('idx_outbox_batch_id', 'batch_id'),
+    )
+
+    def __str__(self):
+        return f"OutboxMessage(id={self.id}, name={self.name})"
@@ -0,0 +1,212 @@
+"""Outbox relay
+
+Publishes outbox messages to the Celery broker in batches. Each batch is
+one transaction: up to `batch_size` due messages are locked (``FOR
+UPDATE SKIP LOCKED``, so several relays may run side by side), published
+over one broker connection and deleted. Messages which failed to publish
+stay in the outbox and are retried with exponential backoff.
+
+Delivery is at least once: if the relay dies after publishing but
+before commit, the batch is published again.
+
+The relay is woken up by `outbox` channel notifications (sent by
+`enqueue`, delivered on commit) and additionally polls every
+`poll_interval` seconds.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager, contextmanager, suppress
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, ContextManager, Iterator
+
+import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from papermerge.celery_app import app as celery_app
+from papermerge.core import config, metrics
+from papermerge.core.features.outbox.db import api as dbapi
+from papermerge.core.features.outbox.db.orm import OutboxMessage
+
+settings = config.get_settings()
+logger = logging.getLogger(__name__)
+
+Publish = Callable[[OutboxMessage], None]
+Publisher = Callable[[], ContextManager[Publish]]
+
+
+@dataclass
+class PublishResult:
+    sent: int = 0
+    failed: int = 0
+
+
+@contextmanager
+def celery_publisher() -> Iterator[Publish]:
+    """Publishes messages over one broker connection"""
+    with celery_app.producer_or_acquire() as producer:
+
+        def publish(message: OutboxMessage):
+            celery_app.send_task(
+                message.name,
+                kwargs=message.kwargs,
+                route_name=message.route_name,
+                priority=message.priority,
+                producer=producer,
+            )
+            metrics.TASKS_SENT.labels(
+                name=message.name, route=message.route_name or ""
+            ).inc()
+
+        yield publish
+
+
+def publish_messages(
+    publisher: Publisher, messages: list[OutboxMessage]
+) -> tuple[list[int], dict[int, str]]:
+    """Returns IDs of sent messages and errors of failed ones"""
+    sent, errors = [], {}
+    try:
+        with publisher() as publish:
+            for message in messages:
+                try:
+                    publish(message)
+                except Exception as e:
+                    errors[message.id] = str(e)
+                else:
+                    sent.append(message.id)
+    except Exception as e:
+        # broker connection could not be established (or was lost)
+        for message in messages:
+            if message.id not in sent:
+                errors.setdefault(message.id, str(e))
+
+    return sent, errors
+
+
+async def publish_batch(
+    db_session: AsyncSession,
+    batch_size: int,
+    publisher: Publisher = celery_publisher,
+) -> PublishResult:
+    messages = await dbapi.claim_batch(db_session, limit=batch_size)
+    if not messages:
+        await db_session.commit()
+        return PublishResult()
+
+    # broker client is blocking; keep event loop of the web process free
+    sent, errors = await asyncio.to_thread(publish_messages, publisher, messages)
+
+    await dbapi.delete_messages(db_session, sent)
+    dbapi.retry_later(
+        [message for message in messages if message.id in errors],
+        errors,
+        max_delay=settings.outbox_max_retry_delay,
+    )
+    await db_session.commit()
+
+    if errors:
+        logger.warning(
+            f"Failed to publish {len(errors)} outbox messages, "
+            f"first error: {next(iter(errors.values()))}"
+        )
+
+    return PublishResult(sent=len(sent), failed=len(errors))
+
+
+async def publish_pending(
+    db_session: AsyncSession,
+    batch_size: int | None = None,
+    publisher: Publisher = celery_publisher,
+) -> PublishResult:
+    """Publishes batches until there are no due messages left"""
+    batch_size = batch_size or settings.outbox_batch_size
+    total = PublishResult()
+    while True:
+        result = await publish_batch(db_session, batch_size, publisher=publisher)
+        total.sent += result.sent
+        total.failed += result.failed
+        if result.sent + result.failed < batch_size:
+            return total
+
+
+class OutboxRelay:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        dsn: str,
+        batch_size: int | None = None,
+        poll_interval: float | None = None,
+        publisher: Publisher = celery_publisher,
+    ):
+        self.session_factory = session_factory
+        self.dsn = dsn
+        self.batch_size = batch_size or settings.outbox_batch_size
+        self.poll_interval = poll_interval or settings.outbox_poll_interval
+        self.publisher = publisher
+        self._wakeup = asyncio.Event()
+        self._conn: asyncpg.Connection | None = None
+
+    async def run(self):
+        while True:
+            await self._ensure_listening()
+            # notifications arriving while publishing trigger next round
+            self._wakeup.clear()
+            try:
+                async with self.session_factory() as db_session:
+                    result = await publish_pending(
+                        db_session, self.batch_size, publisher=self.publisher
+                    )
+                if result.sent:
+                    logger.debug(f"Published {result.sent} outbox messages")
+            except Exception:
+                logger.exception("Outbox relay failed to publish messages")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def close(self):
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+        self._conn = None
+
+    async def _ensure_listening(self):
+        if self._conn is not None and not self._conn.is_closed():
+            return
+
+        # without notifications the relay still works, by polling
+        try:
+            connect_args = {"ssl": "require"} if settings.db_ssl else {}
+            self._conn = await asyncpg.connect(self.dsn, **connect_args)
+            await self._conn.add_listener(dbapi.CHANNEL, self._on_notification)
+        except Exception as e:
+            logger.warning(f"Could not listen on {dbapi.CHANNEL} channel: {e}")
+            self._conn = None
+
+    def _on_notification(self, connection, pid, channel, payload):
+        self._wakeup.set()
+
+
+@asynccontextmanager
+async def embedded_relay() -> AsyncIterator[None]:
+    """Runs outbox relay in background of the current (web) process
+
+    Does nothing if `outbox_relay_embedded` is off (relay runs as
+    separate `pm outbox relay` process) or if there is no Redis.
+    """
+    if not settings.outbox_relay_embedded or settings.redis_url is None:
+        yield
+        return
+
+    from papermerge.core.db.engine import AsyncSessionLocal
+
+    relay = OutboxRelay(AsyncSessionLocal, str(settings.db_url))
+    task = asyncio.create_task(relay.run())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        await relay.close()
@@ -0,0 +1,136 @@
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from papermerge.core import orm
+from papermerge.core.features.outbox import relay
+from papermerge.core.features.outbox.db import api as outbox_dbapi
+
+
+def make_publisher(published: list, fail_names: set[str] = frozenset()):
+    @contextmanager
+    def publisher():
+        def publish(message):
+            if message.name in fail_names:
+                raise ConnectionError("broker unavailable")
+            published.append((message.name, message.kwargs, message.route_name))
+
+        yield publish
+
+    return publisher
+
+
+@contextmanager
+def broken_publisher():
+    raise ConnectionError("broker unavailable")
+    yield
+
+
+async def get_messages(db_session: AsyncSession) -> list[orm.OutboxMessage]:
+    stmt = select(orm.OutboxMessage).order_by(orm.OutboxMessage.id)
+    return list((await db_session.scalars(stmt)).all())
+
+
+async def test_enqueue_coalesces_messages_with_same_dedup_key(db_session: AsyncSession):
+    for folder in ("a", "b"):
+        await outbox_dbapi.enqueue(
+            db_session,
+            "move_document",
+            kwargs={"document_id": "1", "folder": folder},
+            route_name="path_tmpl",
+            dedup_key="move_document:1",
+        )
+    await outbox_dbapi.enqueue(
+        db_session, "move_document", kwargs={"document_id": "2"}, dedup_key="move_document:2"
+    )
+    # messages without dedup key are never coalesced
+    await outbox_dbapi.enqueue(db_session, "cleanup", kwargs={"ids": ["1"]})
+    await outbox_dbapi.enqueue(db_session, "cleanup", kwargs={"ids": ["1"]})
+
+    messages = await get_messages(db_session)
+
+    assert [(m.name, m.kwargs) for m in messages] == [
+        ("move_document", {"document_id": "1", "folder": "b"}),
+        ("move_document", {"document_id": "2"}),
+        ("cleanup", {"ids": ["1"]}),
+        ("cleanup", {"ids": ["1"]}),
+    ]
+
+
+async def test_publish_pending_publishes_in_batches_and_deletes_messages(
+    db_session: AsyncSession,
+):
+    for i in range(5):
+        await outbox_dbapi.enqueue(db_session, f"task_{i}", kwargs={"i": i}, route_name="s3")
+    published = []
+
+    result = await relay.publish_pending(
+        db_session, batch_size=2, publisher=make_publisher(published)
+    )
+
+    assert result == relay.PublishResult(sent=5, failed=0)
+    assert published == [(f"task_{i}", {"i": i}, "s3") for i in range(5)]
+    assert await get_messages(db_session) == []
+
+
+async def test_failed_messages_are_retried_later(db_session: AsyncSession):
+    await outbox_dbapi.enqueue(db_session, "ok")
+    await outbox_dbapi.enqueue(db_session, "fails")
+    published = []
+
+    result = await relay.publish_batch(
+        db_session, batch_size=10, publisher=make_publisher(published, {"fails"})
+    )
+
+    assert result == relay.PublishResult(sent=1, failed=1)
+    [message] = await get_messages(db_session)
+    assert message.name == "fails"
+    assert message.attempts == 1
+    assert message.last_error == "broker unavailable"
+    assert message.available_at > datetime.now(timezone.utc)
+    # backoff not yet elapsed
+    assert await outbox_dbapi.claim_batch(db_session, limit=10) == []
+
+    assert await outbox_dbapi.retry_now(db_session) == 1
+    result = await relay.publish_batch(
+        db_session, batch_size=10, publisher=make_publisher(published)
+    )
+    assert result == relay.PublishResult(sent=1, failed=0)
+
+
+async def test_reenqueued_message_is_due_at_once(db_session: AsyncSession):
+    await outbox_dbapi.enqueue(db_session, "fails", dedup_key="fails:1")
+    await relay.publish_batch(
+        db_session, batch_size=10, publisher=make_publisher([], {"fails"})
+    )
+
+    # new payload replaces the failed one together with its backoff
+    await outbox_dbapi.enqueue(
+        db_session, "fails", kwargs={"retry": True}, dedup_key="fails:1"
+    )
+    db_session.expire_all()
+
+    [message] = await get_messages(db_session)
+    assert message.kwargs == {"retry": True}
+    assert message.attempts == 0
+    assert message.last_error is None
+    assert await outbox_dbapi.claim_batch(db_session, limit=10) == [message]
+
+
+async def test_broker_connection_failure_keeps_all_messages(db_session: AsyncSession):
+    await outbox_dbapi.enqueue(db_session, "a")
+    await outbox_dbapi.enqueue(db_session, "b")
+
+    result = await relay.publish_batch(db_session, batch_size=10, publisher=broken_publisher)
+
+    assert result == relay.PublishResult(sent=0, failed=2)
+    stats = await outbox_dbapi.get_stats(db_session)
+    assert (stats.pending, stats.failing) == (2, 2)
+
+
+def test_retry_delay_is_exponential_and_capped():
+    assert [outbox_dbapi.retry_delay(n, max_delay=60) for n in range(1, 8)] == [
+        2, 4, 8, 16, 32, 60, 60
+    ]
@@ -1,9 +1,9 @@
 from uuid import UUID
 from typing import Literal, Tuple
 
-from sqlalchemy import select, func, delete
+from sqlalchemy import select, func, delete, or_, literal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, insert
 
 from papermerge.core import orm, types
 from papermerge.core.features.ownership.db.orm import Ownership
@@ -363,6 +363,77 @@ async def get_resources_by_owner(
     return [row[0] for row in result]
 
 
+async def set_subtree_owner(
+    session: AsyncSession,
+    node_ids: list[UUID],
+    owner: types.Owner,
+) -> int:
+    """
+    Set the owner of `node_ids` nodes and all their descendants.
+
+    Ownership is propagated with one upsert (INSERT ... ON CONFLICT DO
+    UPDATE, like `set_owners`) driven by a recursive CTE i.e.
+    descendants' IDs are never transferred to Python; nodes without
+    ownership record get one. If all `node_ids` nodes are already owned
+    by `owner`, nothing is updated (descendants are assumed to share
+    owner with their ancestor).
+
+    Returns:
+        Number of ownership records created or changed
+    """
+    from papermerge.core.features.nodes.db import orm as node_orm
+
+    if not node_ids:
+        return 0
+
+    stmt = select(func.count()).where(
+        Ownership.resource_type == types.ResourceType.NODE.value,
+        Ownership.resource_id.in_(node_ids),
+        Ownership.owner_type == owner.owner_type.value,
+        Ownership.owner_id == owner.owner_id,
+    )
+    if (await session.execute(stmt)).scalar() == len(set(node_ids)):
+        return 0
+
+    nodes_anchor = (
+        select(node_orm.Node.id)
+        .where(node_orm.Node.id.in_(node_ids))
+        .cte(recursive=True, name="tree")
+    )
+    # UNION (not UNION ALL): overlapping `node_ids` must not yield the
+    # same node twice, upsert cannot affect one row twice
+    tree = nodes_anchor.union(
+        select(node_orm.Node.id).where(
+            nodes_anchor.c.id == node_orm.Node.parent_id
+        )
+    )
+
+    stmt = insert(Ownership).from_select(
+        ["resource_type", "resource_id", "owner_type", "owner_id"],
+        select(
+            literal(types.ResourceType.NODE.value),
+            tree.c.id,
+            literal(owner.owner_type.value),
+            literal(owner.owner_id, PGUUID(as_uuid=True)),
+        ),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["resource_type", "resource_id"],
+        set_={
+            "owner_type": stmt.excluded.owner_type,
+            "owner_id": stmt.excluded.owner_id,
+        },
+        # leave records which already have the owner untouched
+        where=or_(
+            Ownership.owner_type != stmt.excluded.owner_type,
+            Ownership.owner_id != stmt.excluded.owner_id,
+        ),
+    )
+    result = await session.execute(stmt)
+
+    return result.rowcount
+
+
 async def transfer_all_resources(
     session: AsyncSession,
     from_owner_type: types.OwnerType,
@@ -1,13 +1,15 @@
 """Page Management"""
 
-import io
 import logging
 import uuid
 from pathlib import Path
 from typing import List, Tuple
 
-from pikepdf import Pdf
-from sqlalchemy import select, delete, ScalarResult
+from sqlalchemy import (
+    select,
+    delete,
+    ScalarResult,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -18,6 +20,7 @@ from papermerge.core.features.document.schema import DocumentVersion
 from papermerge.core.pathlib import abs_page_path
 from papermerge.core.storage import get_storage_instance
 from papermerge.core.utils.decorators import if_redis_present
+from papermerge.core.utils.pdf import save_pdf
 from papermerge.core import orm, schema, types
 from papermerge.core.features.document.db import api as doc_dbapi
 
@@ -34,38 +37,11 @@ async def load_doc_ver(db_session: AsyncSession, doc_ver: DocumentVersion) -> Do
     return result.scalar_one()
 
 
-async def copy_text_field(
-    db_session: AsyncSession,
-    src: schema.DocumentVersion,
-    dst: schema.DocumentVersion,
-    page_numbers: list[int],
-) -> None:
-    streams = collect_text_streams(
-        version=src,
-        # list of old_version page numbers
-        page_numbers=page_numbers,
-    )
-    # updates page.text fields and document_version.text field
-    await doc_dbapi.update_text_field(db_session, dst.id, streams)
-
-
-def collect_text_streams(
-    version: schema.DocumentVersion, page_numbers: list[int]
-) -> list[io.StringIO]:
-    """
-    Returns list of texts of given page numbers from specified document version
-
-    Each page's text is wrapped as io.StringIO instance.
-    """
-    pages_map = {page.number: page for page in version.pages}
-
-    result = [io.StringIO(pages_map[number].text) for number in sorted(page_numbers)]
-
-    return result
-
-
 async def apply_pages_op(
-    db_session: AsyncSession, items: List[schema.PageAndRotOp], user_id: uuid.UUID
+    db_session: AsyncSession,
+    items: List[schema.PageAndRotOp],
+    user_id: uuid.UUID,
+    all_versions: bool = False,
 ) -> List[schema.Document]:
     """Apply operations (operation = transformation) on the document
 
@@ -80,6 +56,8 @@ async def apply_pages_op(
     Note that "copy to new document version" has to parts:
         - recreate the 'page' models (and copy text from old one to new ones)
         - recreate pdf file (and copy its pages from old one to new ones)
+
+    Returned document holds only its new version unless `all_versions`.
     """
     pages = (await db_session.execute(
         select(orm.Page).where(orm.Page.id.in_(item.page.id for item in items))
@@ -97,26 +75,26 @@ async def apply_pages_op(
 
     doc = old_version.document
     new_version = await doc_dbapi.version_bump(
-        db_session, doc_id=doc.id, user_id=user_id, page_count=len(items)
+        db_session,
+        doc_id=doc.id,
+        user_id=user_id,
+        page_count=len(items),
+        src_version_id=old_version.id,
+        src_page_numbers=[item.page.number for item in items],
     )
 
     copy_pdf_pages(src=old_version.file_path, dst=new_version.file_path, items=items)
 
-    await copy_text_field(
-        db_session,
-        src=old_version,
-        dst=new_version,
-        page_numbers=[p.number for p in pages],
-    )
-
     notify_version_update(
         remove_ver_id=str(old_version.id), add_ver_id=str(new_version.id)
     )
-    doc = await doc_dbapi.load_doc(db_session, doc.id)
+    doc = await doc_dbapi.load_doc(db_session, doc.id, all_versions=all_versions)
     return doc
 
 
 def copy_pdf_pages(src: Path, dst: Path, items: List[schema.PageAndRotOp]):
+    from pikepdf import Pdf
+
     src_pdf = Pdf.open(src)
 
     dst_pdf = Pdf.new()
@@ -129,7 +107,7 @@ def copy_pdf_pages(src: Path, dst: Path, items: List[schema.PageAndRotOp]):
         dst_pdf.pages.append(page)
 
     dst.parent.mkdir(parents=True, exist_ok=True)
-    dst_pdf.save(dst)
+    save_pdf(dst_pdf, dst)
 
 
 def copy_pdf(src: Path, dst: Path, page_numbers: list[int]):
@@ -139,6 +117,8 @@ def copy_pdf(src: Path, dst: Path, page_numbers: list[int]):
     Notice that page numbering starts with 1 i.e. page_numbers=[1, 2] -
     will remove first and second pages.
     """
+    from pikepdf import Pdf
+
     if len(page_numbers) < 1:
         raise ValueError("Empty page_numbers")
 
@@ -154,7 +134,7 @@ def copy_pdf(src: Path, dst: Path, page_numbers: list[int]):
         _deleted_count += 1
 
     dst.parent.mkdir(parents=True, exist_ok=True)
-    pdf.save(dst)
+    save_pdf(pdf, dst)
 
 
 def insert_pdf_pages(
@@ -183,6 +163,8 @@ def insert_pdf_pages(
     when `src_page_numbers=[1, 2]` means insert first and second pages from
     source.
     """
+    from pikepdf import Pdf
+
     src_old_pdf = Pdf.open(src_old)
 
     if dst_old is None:
@@ -200,7 +182,7 @@ def insert_pdf_pages(
         _inserted_count += 1
 
     dst_new.parent.mkdir(parents=True, exist_ok=True)
-    dst_old_pdf.save(dst_new)
+    save_pdf(dst_old_pdf, dst_new)
 
 
 def reuse_ocr_data(
@@ -555,13 +537,6 @@ async def extract_to_single_paged_docs(
             source_ids=[page.id], target_ids=[dst_doc.versions[0].pages[0].id]
         )
 
-        await copy_text_field(
-            db_session=db_session,
-            src=pages[0].document_version,
-            dst=dst_doc.versions[0],
-            page_numbers=[page.number],
-        )
-
     return result
 
 
@@ -620,13 +595,6 @@ async def extract_to_multi_paged_doc(
         target_ids=[page.id for page in dst_pages],
     )
 
-    await copy_text_field(
-        db_session,
-        src=pages[0].document_version,
-        dst=dst_version,
-        page_numbers=[p.number for p in pages],
-    )
-
     return new_doc
 
 
@@ -658,12 +626,20 @@ async def copy_without_pages(
     src_old_doc = src_old_version.document
     moved_pages_count = len(moved_pages)
 
+    page_numbers = sorted(
+        p.number
+        for p in src_old_version.pages
+        if not (p.id in moved_page_ids)  # Notice the negation
+    )
+
     src_new_version = await doc_dbapi.version_bump(
         db_session,
         doc_id=src_old_doc.id,
         page_count=len(src_old_version.pages) - moved_pages_count,
         short_description=f"{moved_pages_count} page(s) moved out",
         user_id=user_id,
+        src_version_id=src_old_version.id,
+        src_page_numbers=page_numbers,
     )
 
     copy_pdf(
@@ -693,16 +669,6 @@ async def copy_without_pages(
     if not_copied_ids := reuse_ocr_data(src_keys, dst_values):
         logger.info(f"Pages with IDs {not_copied_ids} do not have OCR data")
 
-    page_numbers = [
-        p.number
-        for p in src_old_version.pages
-        if not (p.id in moved_page_ids)  # Notice the negation
-    ]
-
-    await copy_text_field(
-        db_session, src=src_old_version, dst=src_new_version, page_numbers=page_numbers
-    )
-
     notify_version_update(
         remove_ver_id=str(src_old_version.id), add_ver_id=str(src_new_version.id)
     )
@@ -19,22 +19,6 @@ DIR_ABS_PATH = os.path.abspath(Path(__file__).parent.parent)
 RESOURCES = Path(DIR_ABS_PATH) / "document" / "tests" / "resources"
 
 
-@pytest.mark.skip(reason="Will be moved to worker")
-async def test_copy_text_field(db_session: AsyncSession, make_document_version, user):
-    doc_ver_x = await make_document_version(
-        page_count=2, pages_text=["some", "body"], user=user
-    )
-    doc_ver_y = await make_document_version(page_count=1, user=user)
-
-    await page_mngm_dbapi.copy_text_field(
-        db_session, src=doc_ver_x, dst=doc_ver_y, page_numbers=[2]
-    )
-
-    doc_ver = await doc_dbapi.get_doc_ver(db_session, document_version_id=doc_ver_y.id)
-
-    assert doc_ver.pages[0].text == "body"
-
-
 @pytest.mark.skip(reason="Will be moved to worker")
 async def test_apply_pages_op(three_pages_pdf: schema.Document, db_session: AsyncSession):
     doc = (await db_session.execute(
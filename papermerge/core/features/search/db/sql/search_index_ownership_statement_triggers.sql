@@ -0,0 +1,83 @@
+-- ============================================================================
+-- TRIGGER: Update search index when ownership changes (statement level)
+--
+-- Replaces row level `trg_ownership_search_update`. Moving a subtree
+-- changes ownership of all its nodes with one UPDATE statement; owner
+-- columns of the search index are then updated with one set based
+-- statement instead of re-indexing every document separately.
+-- ============================================================================
+
+DROP TRIGGER IF EXISTS trg_ownership_search_update ON ownerships;
+DROP FUNCTION IF EXISTS trigger_update_search_on_ownership();
+
+CREATE OR REPLACE FUNCTION trigger_update_search_on_ownership_insert()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM upsert_document_search_index(n.resource_id)
+    FROM new_rows n
+    WHERE n.resource_type = 'node';
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trigger_update_search_on_ownership_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Owner is not part of search vector, thus already indexed
+    -- documents need only their owner columns updated
+    UPDATE document_search_index dsi
+    SET owner_type = n.owner_type,
+        owner_id = n.owner_id,
+        last_updated = NOW()
+    FROM new_rows n
+    WHERE n.resource_type = 'node'
+        AND dsi.document_id = n.resource_id
+        AND (
+            dsi.owner_type IS DISTINCT FROM n.owner_type
+            OR dsi.owner_id IS DISTINCT FROM n.owner_id
+        );
+
+    -- Documents missing from the index are indexed from scratch
+    PERFORM upsert_document_search_index(n.resource_id)
+    FROM new_rows n
+    INNER JOIN documents d ON d.node_id = n.resource_id
+    WHERE n.resource_type = 'node'
+        AND NOT EXISTS (
+            SELECT 1 FROM document_search_index dsi
+            WHERE dsi.document_id = n.resource_id
+        );
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trigger_update_search_on_ownership_delete()
+RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM document_search_index dsi
+    USING old_rows o
+    WHERE o.resource_type = 'node'
+        AND dsi.document_id = o.resource_id;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_ownership_search_insert
+AFTER INSERT ON ownerships
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION trigger_update_search_on_ownership_insert();
+
+CREATE TRIGGER trg_ownership_search_update
+AFTER UPDATE ON ownerships
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION trigger_update_search_on_ownership_update();
+
+CREATE TRIGGER trg_ownership_search_delete
+AFTER DELETE ON ownerships
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION trigger_update_search_on_ownership_delete();
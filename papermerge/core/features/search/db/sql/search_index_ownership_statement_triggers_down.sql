@@ -0,0 +1,32 @@
+DROP TRIGGER IF EXISTS trg_ownership_search_delete ON ownerships;
+DROP TRIGGER IF EXISTS trg_ownership_search_update ON ownerships;
+DROP TRIGGER IF EXISTS trg_ownership_search_insert ON ownerships;
+
+DROP FUNCTION IF EXISTS trigger_update_search_on_ownership_delete();
+DROP FUNCTION IF EXISTS trigger_update_search_on_ownership_update();
+DROP FUNCTION IF EXISTS trigger_update_search_on_ownership_insert();
+
+CREATE OR REPLACE FUNCTION trigger_update_search_on_ownership()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND (
+        OLD.owner_type IS DISTINCT FROM NEW.owner_type
+        OR OLD.owner_id IS DISTINCT FROM NEW.owner_id
+    ) THEN
+        IF NEW.resource_type = 'node' THEN
+            PERFORM upsert_document_search_index(NEW.resource_id);
+        END IF;
+    ELSIF TG_OP = 'DELETE' AND OLD.resource_type = 'node' THEN
+        DELETE FROM document_search_index WHERE document_id = OLD.resource_id;
+    ELSIF TG_OP = 'INSERT' AND NEW.resource_type = 'node' THEN
+        PERFORM upsert_document_search_index(NEW.resource_id);
+    END IF;
+
+    RETURN COALESCE(NEW, OLD);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_ownership_search_update
+AFTER INSERT OR UPDATE OR DELETE ON ownerships
+FOR EACH ROW
+EXECUTE FUNCTION trigger_update_search_on_ownership();
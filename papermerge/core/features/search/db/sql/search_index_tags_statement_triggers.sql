@@ -0,0 +1,42 @@
+-- ============================================================================
+-- TRIGGER: Update search index when tags change (statement level)
+--
+-- Replaces row level `trg_tags_search_update`. Bulk tag operations insert or
+-- delete many `nodes_tags` rows with a single statement; with transition
+-- tables each affected document is re-indexed exactly once per statement.
+-- ============================================================================
+
+DROP TRIGGER IF EXISTS trg_tags_search_update ON nodes_tags;
+DROP FUNCTION IF EXISTS trigger_update_search_on_tags();
+
+CREATE OR REPLACE FUNCTION trigger_update_search_on_tags_insert()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM upsert_document_search_index(changed.node_id)
+    FROM (SELECT DISTINCT node_id FROM new_rows) AS changed;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trigger_update_search_on_tags_delete()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM upsert_document_search_index(changed.node_id)
+    FROM (SELECT DISTINCT node_id FROM old_rows) AS changed;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_tags_search_insert
+AFTER INSERT ON nodes_tags
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION trigger_update_search_on_tags_insert();
+
+CREATE TRIGGER trg_tags_search_delete
+AFTER DELETE ON nodes_tags
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION trigger_update_search_on_tags_delete();
@@ -0,0 +1,23 @@
+DROP TRIGGER IF EXISTS trg_tags_search_delete ON nodes_tags;
+DROP TRIGGER IF EXISTS trg_tags_search_insert ON nodes_tags;
+
+DROP FUNCTION IF EXISTS trigger_update_search_on_tags_delete();
+DROP FUNCTION IF EXISTS trigger_update_search_on_tags_insert();
+
+CREATE OR REPLACE FUNCTION trigger_update_search_on_tags()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM upsert_document_search_index(OLD.node_id);
+    ELSE
+        PERFORM upsert_document_search_index(NEW.node_id);
+    END IF;
+
+    RETURN COALESCE(NEW, OLD);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_tags_search_update
+AFTER INSERT OR DELETE ON nodes_tags
+FOR EACH ROW
+EXECUTE FUNCTION trigger_update_search_on_tags();
@@ -35,7 +35,7 @@ logger = logging.getLogger(__name__)
 async def documents_search(
     user: scopes.ViewNode,
     params: SearchQueryParams,
-    db_session: AsyncSession = Depends(db.get_db)
+    db_session: AsyncSession = Depends(db.get_db_readonly)
 ):
     """
     Advanced document search and filtering.
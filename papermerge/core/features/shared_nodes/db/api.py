@@ -562,7 +562,8 @@ async def get_shared_doc(
     user_id: uuid.UUID,
     shared_root_id: uuid.UUID | None = None,
 ) -> schema.Document:
-    db_doc = await dbapi.load_doc(db_session, document_id)
+    # document viewer builds its version list from the response
+    db_doc = await dbapi.load_doc(db_session, document_id, all_versions=True)
     breadcrumb = await dbapi_common.get_ancestors(db_session, document_id)
     root_shared_node_ids = await get_shared_node_ids(db_session, user_id=user_id)
     shorted_breadcrumb = []
@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from papermerge.core.features.document.db import api as doc_dbapi
 from papermerge.core.features.roles.db import api as dbapi
 from papermerge.core.scopes import Scopes
 from papermerge.core.features.shared_nodes.db import api as sn_dbapi
@@ -28,3 +29,18 @@ async def test_basic_create_shared_node(db_session: AsyncSession, make_user, mak
     assert len(shared_nodes) == 1
 
     await dbapi.delete_role(db_session, role.id, deleted_by_user_id=john.id)
+
+
+async def test_get_shared_doc_returns_all_versions(
+    db_session: AsyncSession, make_user, make_document
+):
+    john = await make_user("john", is_superuser=False)
+    david = await make_user("david", is_superuser=False)
+    doc = await make_document("invoice.pdf", user=john, parent=john.home_folder)
+    await doc_dbapi.version_bump(db_session, doc_id=doc.id, user_id=john.id)
+
+    shared_doc = await sn_dbapi.get_shared_doc(
+        db_session, document_id=doc.id, user_id=david.id
+    )
+
+    assert sorted(ver.number for ver in shared_doc.versions) == [1, 2]
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from papermerge.core.features.ownership.db.orm import OwnedResourceMixin
@@ -18,6 +18,11 @@ class NodeTagsAssociation(Base):
         ForeignKey("tags.id", ondelete="CASCADE"),
     )
 
+    __table_args__ = (
+        Index('idx_nodes_tags_node_id', 'node_id'),
+        Index('idx_nodes_tags_tag_id', 'tag_id'),
+    )
+
 
 class Tag(Base, AuditColumns, OwnedResourceMixin):
     __tablename__ = "tags"
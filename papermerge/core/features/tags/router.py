@@ -11,7 +11,7 @@ from papermerge.core import utils, schema
 from papermerge.core.features.users import schema as usr_schema
 from papermerge.core.features.auth import get_current_user
 from papermerge.core.features.auth import scopes
-from papermerge.core.db.engine import get_db
+from papermerge.core.db.engine import get_db, get_db_readonly
 from papermerge.core.features.users.db import api as users_dbapi
 from papermerge.core.features.tags.db import api as tags_dbapi
 from papermerge.core.features.tags import schema as tags_schema
@@ -43,7 +43,7 @@ logger = logging.getLogger(__name__)
 async def retrieve_tags_without_pagination(
     user: require_scopes(scopes.TAG_SELECT),
     group_id: UUID | None = None,
-    db_session: AsyncSession = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db_readonly),
 ):
     """Get all tags without pagination
 
@@ -76,7 +76,7 @@ async def retrieve_tags_without_pagination(
 async def get_tags(
     user: require_scopes(scopes.TAG_VIEW),
     params: TagParams = Depends(),
-    db_session=Depends(get_db),
+    db_session=Depends(get_db_readonly),
 ) -> schema.PaginatedResponse[schema.TagEx]:
     """Retrieves (paginated) list of tags"""
     try:
@@ -106,7 +106,7 @@ async def get_tags(
 async def get_tag_details(
     tag_id: UUID,
     user: require_scopes(scopes.TAG_VIEW),
-    db_session: AsyncSession=Depends(get_db),
+    db_session: AsyncSession=Depends(get_db_readonly),
 ):
     """Get tag details"""
     has_access = await ownership_api.user_can_access_resource(
@@ -0,0 +1,185 @@
+"""Bulk OCR scheduling
+
+Resolves all documents of a selection of folders/documents (with one
+query) and sends their OCR tasks to the `ocr` queue in batches,
+optionally at most `rate` documents per second so that OCR workers (and
+the broker) are not flooded when a whole archive is re-OCRed.
+
+The REST API writes the tasks to the outbox (`enqueue_ocr_tasks`): they
+survive restarts of the web process and the outbox relay publishes each
+batch once it is due. The CLI publishes them directly
+(`publish_ocr_tasks`).
+"""
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import timedelta
+from itertools import batched
+from typing import Callable, ContextManager, Iterator
+from uuid import UUID, uuid4
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from papermerge.celery_app import app as celery_app
+from papermerge.core import config, constants, metrics
+from papermerge.core.features.document.db import api as doc_dbapi
+from papermerge.core.features.outbox.db import api as outbox_dbapi
+
+settings = config.get_settings()
+logger = logging.getLogger(__name__)
+
+# publish(document_id, lang)
+Publish = Callable[[UUID, str], None]
+Publisher = Callable[[int | None], ContextManager[Publish]]
+
+
+@dataclass
+class OCRSchedule:
+    # (document ID, lang) of documents to OCR
+    documents: list[tuple[UUID, str]] = field(default_factory=list)
+    # documents skipped because their last version already has text
+    skipped: int = 0
+
+
+async def plan(
+    db_session: AsyncSession,
+    node_ids: list[UUID],
+    force: bool = False,
+    lang: str | None = None,
+) -> OCRSchedule:
+    """Documents of `node_ids` (and their descendants) to OCR
+
+    Documents which already have text are skipped unless `force`.
+    `lang` overrides the language of the documents.
+    """
+    schedule = OCRSchedule()
+    for doc_id, doc_lang, has_text in await doc_dbapi.get_ocr_candidates(
+        db_session, node_ids
+    ):
+        if has_text and not force:
+            schedule.skipped += 1
+            continue
+        schedule.documents.append((doc_id, lang or doc_lang))
+
+    return schedule
+
+
+def dedup_key(document_id: UUID) -> str:
+    return f"{constants.WORKER_OCR_DOCUMENT}:{document_id}"
+
+
+async def enqueue_ocr_tasks(
+    db_session: AsyncSession,
+    documents: list[tuple[UUID, str]],
+    priority: int | None = None,
+    batch_size: int | None = None,
+    rate: float | None = None,
+) -> UUID | None:
+    """Writes OCR tasks of `documents` to the outbox; does not commit
+
+    Returns ID of the outbox batch (to follow its progress with
+    `outbox.db.api.get_stats`) or None if there is no Redis (nothing is
+    enqueued). With `rate` (max number of documents per second, None/0 =
+    no limit) each batch of tasks becomes due `batch_size / rate`
+    seconds after the previous one. A pending OCR task of the same
+    document is replaced.
+    """
+    if settings.redis_url is None:
+        logger.warning("No Redis configured: OCR tasks are not enqueued")
+        return None
+
+    batch_size = batch_size or settings.ocr_schedule_batch_size
+    rate = settings.ocr_schedule_rate if rate is None else rate
+    batch_id = uuid4()
+
+    for index, batch in enumerate(batched(documents, batch_size)):
+        delay = timedelta(seconds=index * batch_size / rate if rate else 0)
+        await outbox_dbapi.enqueue_many(
+            db_session,
+            [
+                dict(
+                    name=constants.WORKER_OCR_DOCUMENT,
+                    kwargs={"document_id": str(document_id), "lang": lang},
+                    route_name="ocr",
+                    dedup_key=dedup_key(document_id),
+                    priority=priority,
+                    batch_id=batch_id,
+                    available_at=func.now() + delay,
+                )
+                for document_id, lang in batch
+            ],
+        )
+
+    return batch_id
+
+
+@contextmanager
+def celery_publisher(priority: int | None = None) -> Iterator[Publish]:
+    """Publishes OCR tasks over one broker connection"""
+    with celery_app.producer_or_acquire() as producer:
+
+        def publish(document_id: UUID, lang: str):
+            celery_app.send_task(
+                constants.WORKER_OCR_DOCUMENT,
+                kwargs={"document_id": str(document_id), "lang": lang},
+                route_name="ocr",
+                priority=priority,
+                producer=producer,
+            )
+
+        yield publish
+
+
+def _publish_batch(
+    publisher: Publisher, priority: int | None, batch: tuple[tuple[UUID, str], ...]
+):
+    with publisher(priority) as publish:
+        for document_id, lang in batch:
+            publish(document_id, lang)
+
+
+async def publish_ocr_tasks(
+    documents: list[tuple[UUID, str]],
+    priority: int | None = None,
+    batch_size: int | None = None,
+    rate: float | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    publisher: Publisher = celery_publisher,
+) -> int:
+    """Publishes OCR tasks of `documents`; returns number of published tasks
+
+    `rate` is max number of documents per second (None/0 = no limit).
+    `on_progress(published_count, total_count)` is called after each batch.
+    Nothing is published if there is no Redis.
+    """
+    if settings.redis_url is None:
+        logger.warning("No Redis configured: OCR tasks are not published")
+        return 0
+
+    batch_size = batch_size or settings.ocr_schedule_batch_size
+    rate = settings.ocr_schedule_rate if rate is None else rate
+    total = len(documents)
+    published = 0
+
+    for batch in batched(documents, batch_size):
+        started = time.monotonic()
+        # broker client is blocking
+        await asyncio.to_thread(_publish_batch, publisher, priority, batch)
+        published += len(batch)
+        metrics.TASKS_SENT.labels(
+            name=constants.WORKER_OCR_DOCUMENT, route="ocr"
+        ).inc(len(batch))
+        if on_progress:
+            on_progress(published, total)
+
+        if rate and published < total:
+            delay = len(batch) / rate - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    logger.info(f"Published {published} OCR tasks")
+
+    return published
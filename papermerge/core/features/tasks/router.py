@@ -1,12 +1,21 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Security
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Security, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from papermerge.core import constants, schema, utils
+from papermerge.core import exceptions as exc
+from papermerge.core.db import common as dbapi_common
+from papermerge.core.db.engine import get_db
 from papermerge.core.features.auth import get_current_user, scopes
+from papermerge.core.features.outbox.db import api as outbox_dbapi
+from papermerge.core.routers.common import OPEN_API_GENERIC_JSON_DETAIL
 from papermerge.core import tasks
 
-from .schema import OCRTaskIn
+from . import ocr
+from .schema import OCRBulkProgressOut, OCRBulkTaskIn, OCRBulkTaskOut, OCRTaskIn
 
 router = APIRouter(
     prefix="/tasks",
@@ -33,3 +42,76 @@ def start_ocr(
         },
         route_name="ocr",
     )
+
+
+@router.post(
+    "/ocr/bulk",
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        status.HTTP_403_FORBIDDEN: {
+            "description": f"No `{scopes.NODE_VIEW}` permission on one of the nodes",
+            "content": OPEN_API_GENERIC_JSON_DETAIL,
+        }
+    },
+)
+@utils.docstring_parameter(scope=scopes.TASK_OCR)
+async def start_bulk_ocr(
+    ocr_task: OCRBulkTaskIn,
+    user: Annotated[schema.User, Security(get_current_user, scopes=[scopes.TASK_OCR])],
+    db_session: AsyncSession = Depends(get_db),
+) -> OCRBulkTaskOut:
+    """Triggers OCR for all documents of given folders and documents
+
+    Folders include all their descendants. Documents which already have
+    text are skipped unless `force` is set. OCR tasks are written to the
+    outbox and published by the outbox relay in batches, at most
+    `PM_OCR_SCHEDULE_RATE` documents per second; follow their progress
+    with `GET /tasks/ocr/bulk/{{batch_id}}`.
+
+    Required scope: `{scope}`
+    """
+    if not await dbapi_common.has_nodes_perm(
+        db_session,
+        node_ids=ocr_task.node_ids,
+        codename=scopes.NODE_VIEW,
+        user_id=user.id,
+    ):
+        raise exc.HTTP403Forbidden()
+
+    schedule = await ocr.plan(
+        db_session,
+        ocr_task.node_ids,
+        force=ocr_task.force,
+        lang=ocr_task.lang,
+    )
+    batch_id = None
+    if schedule.documents:
+        batch_id = await ocr.enqueue_ocr_tasks(
+            db_session, schedule.documents, priority=ocr_task.priority
+        )
+        await db_session.commit()
+
+    return OCRBulkTaskOut(
+        batch_id=batch_id,
+        scheduled=len(schedule.documents) if batch_id else 0,
+        skipped=schedule.skipped,
+    )
+
+
+@router.get("/ocr/bulk/{batch_id}")
+@utils.docstring_parameter(scope=scopes.TASK_OCR)
+async def get_bulk_ocr_progress(
+    batch_id: UUID,
+    user: Annotated[schema.User, Security(get_current_user, scopes=[scopes.TASK_OCR])],
+    db_session: AsyncSession = Depends(get_db),
+) -> OCRBulkProgressOut:
+    """Progress of OCR tasks scheduled by `POST /tasks/ocr/bulk`
+
+    Tasks are removed from the outbox once published; the batch is
+    done when no task is pending.
+
+    Required scope: `{scope}`
+    """
+    stats = await outbox_dbapi.get_stats(db_session, batch_id=batch_id)
+
+    return OCRBulkProgressOut(pending=stats.pending, failing=stats.failing)
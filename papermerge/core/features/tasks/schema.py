@@ -1,7 +1,7 @@
 from typing import Literal
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 LangCode = Literal[
     "ces",
@@ -34,3 +34,30 @@ LangCode = Literal[
 class OCRTaskIn(BaseModel):
     document_id: UUID  # document model ID
     lang: LangCode
+
+
+class OCRBulkTaskIn(BaseModel):
+    # folders and/or documents; folders include all their descendants
+    node_ids: list[UUID] = Field(min_length=1)
+    # defaults to language of each document
+    lang: LangCode | None = None
+    # OCR also documents which already have text
+    force: bool = False
+    # broker message priority
+    priority: int | None = Field(default=None, ge=0, le=9)
+
+
+class OCRBulkTaskOut(BaseModel):
+    # outbox batch of the OCR tasks, see `OCRBulkProgressOut`
+    # (None if nothing was scheduled)
+    batch_id: UUID | None = None
+    scheduled: int
+    # documents which already have text (only if not `force`)
+    skipped: int
+
+
+class OCRBulkProgressOut(BaseModel):
+    # OCR tasks of the batch not yet published to the broker
+    pending: int
+    # pending tasks which failed to publish at least once
+    failing: int
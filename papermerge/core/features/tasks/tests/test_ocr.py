@@ -0,0 +1,113 @@
+from contextlib import contextmanager
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from papermerge.core import orm
+from papermerge.core.features.outbox.db import api as outbox_dbapi
+from papermerge.core.features.tasks import ocr
+
+
+async def set_text(db_session: AsyncSession, doc, text: str):
+    await db_session.execute(
+        update(orm.DocumentVersion)
+        .where(orm.DocumentVersion.document_id == doc.id)
+        .values(text=text)
+    )
+
+
+async def test_plan_resolves_whole_subtree(
+    db_session: AsyncSession, make_folder, make_document, user
+):
+    folder = await make_folder("archive", parent=user.home_folder, user=user)
+    subfolder = await make_folder("2024", parent=folder, user=user)
+    doc1 = await make_document("doc1.pdf", parent=folder, user=user, lang="eng")
+    doc2 = await make_document("doc2.pdf", parent=subfolder, user=user)
+    ocred = await make_document("ocred.pdf", parent=subfolder, user=user)
+    await make_document("outside.pdf", parent=user.home_folder, user=user)
+    await set_text(db_session, ocred, "some text")
+
+    # subfolder is also part of the selection: documents are not duplicated
+    schedule = await ocr.plan(db_session, [folder.id, subfolder.id])
+
+    assert sorted(schedule.documents) == sorted([(doc1.id, "eng"), (doc2.id, "deu")])
+    assert schedule.skipped == 1
+
+
+async def test_plan_force_and_lang(
+    db_session: AsyncSession, make_folder, make_document, user
+):
+    folder = await make_folder("archive", parent=user.home_folder, user=user)
+    doc = await make_document("doc.pdf", parent=folder, user=user)
+    ocred = await make_document("ocred.pdf", parent=folder, user=user)
+    await set_text(db_session, ocred, "some text")
+
+    schedule = await ocr.plan(db_session, [folder.id], force=True, lang="fra")
+
+    assert sorted(schedule.documents) == sorted([(doc.id, "fra"), (ocred.id, "fra")])
+    assert schedule.skipped == 0
+
+
+async def test_publish_ocr_tasks_in_batches(monkeypatch):
+    monkeypatch.setattr(ocr.settings, "redis_url", "redis://localhost:6379/0")
+    connections = []
+
+    @contextmanager
+    def publisher(priority):
+        published = []
+        connections.append((priority, published))
+        yield lambda document_id, lang: published.append((document_id, lang))
+
+    documents = [(f"doc-{i}", "deu") for i in range(5)]
+    progress = []
+
+    count = await ocr.publish_ocr_tasks(
+        documents,
+        priority=3,
+        batch_size=2,
+        rate=0,
+        on_progress=lambda done, total: progress.append((done, total)),
+        publisher=publisher,
+    )
+
+    assert count == 5
+    assert [len(published) for _, published in connections] == [2, 2, 1]
+    assert {priority for priority, _ in connections} == {3}
+    assert progress == [(2, 5), (4, 5), (5, 5)]
+
+
+async def test_enqueue_ocr_tasks_spreads_batches_over_time(
+    db_session: AsyncSession, make_document, user, monkeypatch
+):
+    monkeypatch.setattr(ocr.settings, "redis_url", "redis://localhost:6379/0")
+    docs = [
+        await make_document(f"doc{i}.pdf", parent=user.home_folder, user=user)
+        for i in range(3)
+    ]
+
+    batch_id = await ocr.enqueue_ocr_tasks(
+        db_session,
+        [(doc.id, "deu") for doc in docs],
+        priority=5,
+        batch_size=2,
+        rate=1,
+    )
+
+    stmt = (
+        select(
+            orm.OutboxMessage.priority,
+            func.extract(
+                "epoch", orm.OutboxMessage.available_at - func.now()
+            ).label("delay"),
+        )
+        .where(orm.OutboxMessage.batch_id == batch_id)
+        .order_by(orm.OutboxMessage.id)
+    )
+    rows = (await db_session.execute(stmt)).all()
+
+    assert [row.priority for row in rows] == [5, 5, 5]
+    # second batch is due batch_size / rate seconds later
+    assert [round(row.delay) for row in rows] == [0, 0, 2]
+
+    stats = await outbox_dbapi.get_stats(db_session, batch_id=batch_id)
+    assert stats.pending == 3
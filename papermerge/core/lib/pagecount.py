@@ -2,9 +2,7 @@ import os
 import re
 import subprocess
 import logging
-from magic import from_file
 
-import pikepdf
 
 from ..app_settings import settings
 from ..exceptions import FileTypeNotSupported
@@ -76,6 +74,9 @@ def get_pagecount(filepath: str) -> int:
 
     filepath - is filesystem path to a PDF/JPEG/PNG/TIFF document
     """
+    from magic import from_file
+    import pikepdf
+
     if not os.path.isfile(filepath):
         raise ValueError("Filepath %s is not a file" % filepath)
 
@@ -0,0 +1,205 @@
+"""Prometheus metrics
+
+Metrics are always collected (prometheus_client counters/histograms are
+cheap: a lock and an addition); they are exposed on ``/metrics`` only if
+``PM_METRICS_ENABLED=true``. Cache metrics are read from the async cache's
+own counters at scrape time.
+
+With several worker processes, set ``PROMETHEUS_MULTIPROC_DIR`` (see
+prometheus_client's multiprocess mode) so that ``/metrics`` aggregates
+all processes.
+"""
+import functools
+import inspect
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily
+from sqlalchemy import event
+
+HTTP_REQUESTS = Counter(
+    "pm_http_requests_total",
+    "HTTP requests",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "pm_http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "pm_http_requests_in_progress",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_CONNECTIONS_IN_USE = Gauge(
+    "pm_db_connections_in_use",
+    "DB connections currently checked out",
+    multiprocess_mode="livesum",
+)
+DB_CONNECTIONS_OPENED = Counter(
+    "pm_db_connections_opened_total",
+    "DB connections opened",
+)
+STORAGE_OPERATION_DURATION = Histogram(
+    "pm_storage_operation_duration_seconds",
+    "Storage backend operation latency",
+    ["backend", "operation", "outcome"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+TASKS_SENT = Counter(
+    "pm_tasks_sent_total",
+    "Celery tasks sent",
+    ["name", "route"],
+)
+UPLOADED_BYTES = Counter(
+    "pm_uploaded_bytes_total",
+    "Bytes of uploaded document files",
+)
+UPLOADED_FILES = Counter(
+    "pm_uploaded_files_total",
+    "Uploaded document files",
+)
+
+
+class CacheCollector:
+    """Exposes async cache counters (read at scrape time)"""
+
+    def collect(self):
+        from papermerge.core.cache import get_async_cache
+
+        stats = get_async_cache().get_stats()
+        family = CounterMetricFamily(
+            "pm_cache_operations",
+            "Async cache operations",
+            labels=["result"],
+        )
+        for result in ("local_hits", "hits", "misses", "sets", "deletes", "errors"):
+            family.add_metric([result], stats[result])
+
+        yield family
+
+
+REGISTRY.register(CacheCollector())
+
+
+def instrument_engine(engine) -> None:
+    """Tracks DB connection usage of (async or sync) engine"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        DB_CONNECTIONS_OPENED.inc()
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_CONNECTIONS_IN_USE.inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        DB_CONNECTIONS_IN_USE.dec()
+
+
+def storage_operation(operation: str):
+    """Decorator measuring latency of storage backend methods"""
+
+    def decorator(func):
+        def observe(self, started, outcome):
+            STORAGE_OPERATION_DURATION.labels(
+                backend=type(self).__name__,
+                operation=operation,
+                outcome=outcome,
+            ).observe(time.perf_counter() - started)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    result = await func(self, *args, **kwargs)
+                except Exception:
+                    observe(self, started, "error")
+                    raise
+                observe(self, started, "ok")
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = func(self, *args, **kwargs)
+            except Exception:
+                observe(self, started, "error")
+                raise
+            observe(self, started, "ok")
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+class PrometheusMiddleware:
+    """Request count, latency and in-flight requests (pure ASGI middleware)
+
+    Requests are labeled by route template (e.g.
+    ``/documents/{document_id}``), never by raw path, to keep label
+    cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method=method)
+        in_progress.inc()
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_DURATION.labels(method=method, route=route).observe(
+                time.perf_counter() - started
+            )
+            HTTP_REQUESTS.labels(
+                method=method, route=route, status=str(status_code)
+            ).inc()
+
+
+def render_latest() -> tuple[bytes, str]:
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        # per process collector, not covered by multiprocess mode
+        registry.register(CacheCollector())
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
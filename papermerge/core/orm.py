@@ -10,6 +10,7 @@ from .features.shared_nodes.db.orm import SharedNode
 from .features.audit.db.orm import AuditLog
 from .features.special_folders.db.orm import SpecialFolder
 from .features.ownership.db.orm import Ownership
+from .features.outbox.db.orm import OutboxMessage
 
 __all__ = [
     'User',
@@ -34,5 +35,6 @@ __all__ = [
     'SharedNode',
     'AuditLog',
     'SpecialFolder',
-    'Ownership'
+    'Ownership',
+    'OutboxMessage',
 ]
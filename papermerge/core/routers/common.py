@@ -1,3 +1,9 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
 OPEN_API_GENERIC_JSON_DETAIL = {
     "application/json": {
         "schema": {
@@ -13,3 +19,31 @@ OPEN_API_GENERIC_JSON_DETAIL = {
         }
     }
 }
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson
+
+    Default response class of the app; content is already converted to
+    JSON compatible data by FastAPI, orjson only makes the final dump
+    (several times faster than stdlib `json` on large lists).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> Response:
+    """Response with `model` dumped to JSON directly by pydantic
+
+    FastAPI dumps a returned model to dict, validates it again against
+    `response_model` and only then serializes it. Endpoints returning
+    big lists built from database rows (see `model_construct` in
+    dbapi listings) return this response instead; `response_model`
+    stays in the route decorator for the OpenAPI schema.
+    """
+    return Response(
+        content=model.model_dump_json(by_alias=True),
+        status_code=status_code,
+        media_type="application/json",
+    )
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+
+from papermerge.core import metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics() -> Response:
+    """Prometheus metrics in text exposition format"""
+    content, media_type = metrics.render_latest()
+
+    return Response(content=content, media_type=media_type)
@@ -1,5 +1,6 @@
 from .features.nodes.schema import (
-    Folder, NewFolder, Node, NodeShort, UpdateNode, MoveNode, FolderShort, FolderEx
+    Folder, NewFolder, Node, NodeShort, UpdateNode, MoveNode, FolderShort, FolderEx,
+    BulkNodeTags, BulkTagsMode
 )
 from .features.shared_nodes.schema import (
     CreateSharedNode,
@@ -32,6 +33,7 @@ from .features.document.schema import (
     ExtractStrategy,
     MoveStrategy,
     DocumentPreviewImageStatus,
+    DocumentStatusEvent,
     StatusForSize,
     Pagination,
     DocVerListItem,
@@ -76,6 +78,8 @@ __all__ = [
     'NodeShort',
     'UpdateNode',
     'MoveNode',
+    'BulkNodeTags',
+    'BulkTagsMode',
     'Document',
     'FlatDocument',
     'DocumentShort',
@@ -85,6 +89,7 @@ __all__ = [
     'DocumentVersion',
     'DocumentWithoutVersions',
     'DocumentPreviewImageStatus',
+    'DocumentStatusEvent',
     'StatusForSize',
     'BasicPage',
     'Page',
@@ -2,10 +2,15 @@ import logging
 
 from celery import shared_task
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from papermerge.celery_app import app as celery_app
+from papermerge.core import config, metrics
+from papermerge.core.features.outbox.db import api as outbox_dbapi
 from papermerge.core.utils.decorators import if_redis_present
 
 logger = logging.getLogger(__name__)
+settings = config.get_settings()
 
 
 @shared_task
@@ -24,3 +29,33 @@ def delete_user_data(user_id):
 def send_task(*args, **kwargs):
     logger.debug(f"Send task {args} {kwargs}")
     celery_app.send_task(*args, **kwargs)
+    metrics.TASKS_SENT.labels(
+        name=args[0] if args else kwargs.get("name", ""),
+        route=kwargs.get("route_name", ""),
+    ).inc()
+
+
+async def enqueue_task(
+    db_session: AsyncSession,
+    name: str,
+    kwargs: dict | None = None,
+    route_name: str | None = None,
+    dedup_key: str | None = None,
+):
+    """Sends task once the current transaction commits
+
+    Unlike `send_task`, does not talk to the broker: the task is written
+    to the outbox and published by the outbox relay. Pending tasks with
+    same `dedup_key` are coalesced.
+    """
+    if settings.redis_url is None:
+        return
+
+    logger.debug(f"Enqueue task {name} {kwargs}")
+    await outbox_dbapi.enqueue(
+        db_session,
+        name,
+        kwargs=kwargs,
+        route_name=route_name,
+        dedup_key=dedup_key,
+    )
@@ -0,0 +1,61 @@
+import asyncio
+
+from papermerge.core.cache import AsyncCache
+
+
+async def test_local_tier_get_set_and_stats():
+    cache = AsyncCache(redis=None, local_maxsize=10)
+
+    assert await cache.get("key") is None
+    await cache.set("key", {"a": 1})
+
+    assert await cache.get("key") == {"a": 1}
+    stats = cache.get_stats()
+    assert stats["misses"] == 1
+    assert stats["local_hits"] == 1
+    assert stats["sets"] == 1
+
+
+async def test_local_tier_is_lru():
+    cache = AsyncCache(redis=None, local_maxsize=2)
+
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.get("a")  # "b" becomes least recently used
+    await cache.set("c", 3)
+
+    assert await cache.get("a") == 1
+    assert await cache.get("b") is None
+    assert await cache.get("c") == 3
+
+
+async def test_delete_by_tag():
+    cache = AsyncCache(redis=None)
+
+    await cache.set("user-prefs:1", "x", tags=["user:1"])
+    await cache.set("breadcrumb:1", "y", tags=["user:1", "node:1"])
+    await cache.set("breadcrumb:2", "z", tags=["node:2"])
+
+    await cache.delete_by_tag("user:1")
+
+    assert await cache.get("user-prefs:1") is None
+    assert await cache.get("breadcrumb:1") is None
+    assert await cache.get("breadcrumb:2") == "z"
+
+
+async def test_get_or_set_computes_once_for_concurrent_callers():
+    cache = AsyncCache(redis=None, local_maxsize=0)  # nothing is stored
+    calls = 0
+
+    async def factory():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(
+        *[cache.get_or_set("key", factory) for _ in range(10)]
+    )
+
+    assert results == ["value"] * 10
+    assert calls == 1
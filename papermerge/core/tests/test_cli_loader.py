@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from papermerge.core.cli_loader import LazyCliGroup, find_cli_modules, _read_app_help
+
+CORE_PATH = Path(__file__).parent.parent
+
+
+def test_find_cli_modules_does_not_import():
+    lazy_apps = {item.name: item for item in find_cli_modules(CORE_PATH)}
+
+    assert lazy_apps["db"].module_name == "papermerge.core.cli.db"
+    assert lazy_apps["db"].help == "Database schema checks"
+    assert lazy_apps["benchmark"].module_name == (
+        "papermerge.core.features.benchmark.cli.cli"
+    )
+    assert "papermerge.core.features.benchmark.cli.cli" not in sys.modules
+
+
+def test_read_app_help(tmp_path: Path):
+    file_path = tmp_path / "cli.py"
+    file_path.write_text(
+        "import typer\n"
+        "console = object()\n"
+        'app = typer.Typer(help="Manage things")\n'
+    )
+
+    assert _read_app_help(file_path) == "Manage things"
+
+    file_path.write_text("import typer\napp = typer.Typer()\n")
+    assert _read_app_help(file_path) is None
+
+
+def test_lazy_group_loads_invoked_command_only():
+    lazy_apps = find_cli_modules(CORE_PATH)
+    cli = LazyCliGroup(name="pm", lazy_apps=lazy_apps)
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["--help"])
+    assert result.exit_code == 0
+    assert "Database schema checks" in result.output
+    assert cli.commands == {}
+
+    result = runner.invoke(cli, ["db", "--help"])
+    assert result.exit_code == 0
+    assert "missing-indexes" in result.output
+    assert list(cli.commands) == ["db"]
@@ -0,0 +1,77 @@
+import gzip
+
+from papermerge.core.compression import JSONGZipMiddleware
+
+
+def make_app(status, headers, chunks):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        for index, chunk in enumerate(chunks):
+            await send({
+                "type": "http.response.body",
+                "body": chunk,
+                "more_body": index < len(chunks) - 1,
+            })
+
+    return app
+
+
+async def call(app):
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", b"gzip, deflate")],
+    }
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await JSONGZipMiddleware(app, minimum_size=10)(scope, None, send)
+
+    headers = {k.decode().lower(): v.decode() for k, v in messages[0]["headers"]}
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return messages[0]["status"], headers, body
+
+
+async def test_json_response_is_compressed():
+    body = b'{"items": [' + b'"abc", ' * 100 + b'"abc"]}'
+    app = make_app(
+        200,
+        [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        [body],
+    )
+
+    status, headers, content = await call(app)
+
+    assert headers["content-encoding"] == "gzip"
+    assert int(headers["content-length"]) == len(content)
+    assert gzip.decompress(content) == body
+
+
+async def test_streamed_json_response_is_compressed():
+    chunks = [b'{"a": "' + b"x" * 50, b"y" * 50 + b'"}']
+    app = make_app(200, [(b"content-type", b"application/json")], chunks)
+
+    status, headers, content = await call(app)
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert gzip.decompress(content) == b"".join(chunks)
+
+
+async def test_range_and_binary_responses_are_not_compressed():
+    body = b"%PDF-" + b"x" * 100
+    range_app = make_app(
+        206,
+        [(b"content-type", b"application/pdf"), (b"content-range", b"bytes 0-104/1000")],
+        [body],
+    )
+    jpeg_app = make_app(200, [(b"content-type", b"image/jpeg")], [body])
+
+    for app in (range_app, jpeg_app):
+        status, headers, content = await call(app)
+
+        assert "content-encoding" not in headers
+        assert content == body
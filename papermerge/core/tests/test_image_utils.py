@@ -0,0 +1,41 @@
+import io
+
+from PIL import Image
+
+from papermerge.core.utils import image
+
+
+def make_images(tmp_path, count: int, size=(20, 30)):
+    paths = []
+    for index in range(count):
+        path = tmp_path / f"{index}.jpg"
+        Image.new("RGB", size, "black").save(path)
+        paths.append(path)
+
+    return paths
+
+
+def test_make_sprite_lays_images_out_in_grid(tmp_path):
+    paths = make_images(tmp_path, 5)
+
+    data, boxes = image.make_sprite(paths, columns=2)
+
+    assert boxes == [
+        (0, 0, 20, 30),
+        (20, 0, 20, 30),
+        (0, 30, 20, 30),
+        (20, 30, 20, 30),
+        (0, 60, 20, 30),
+    ]
+    with Image.open(io.BytesIO(data)) as sheet:
+        assert sheet.size == (40, 90)
+
+
+def test_make_sprite_height_grows_with_rows_only(tmp_path):
+    paths = make_images(tmp_path, 200, size=(200, 283))
+
+    data, boxes = image.make_sprite(paths)
+
+    with Image.open(io.BytesIO(data)) as sheet:
+        # 20 rows instead of one strip of 200 images (56600 px)
+        assert sheet.size == (2000, 20 * 283)
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+from prometheus_client import REGISTRY
+
+from papermerge.core import metrics
+from papermerge.storage.backends.local import LocalBackend
+
+
+class FakeBackend:
+    @metrics.storage_operation("sign")
+    def sign_url(self, url):
+        return f"{url}?signed"
+
+
+def sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_storage_operation_is_observed():
+    labels = {"backend": "FakeBackend", "operation": "sign", "outcome": "ok"}
+    before = sample("pm_storage_operation_duration_seconds_count", labels)
+
+    assert FakeBackend().sign_url("/a") == "/a?signed"
+
+    after = sample("pm_storage_operation_duration_seconds_count", labels)
+    assert after == before + 1
+
+
+async def test_local_backend_delete_file_is_observed(tmp_path):
+    labels = {"backend": "LocalBackend", "operation": "delete", "outcome": "ok"}
+    before = sample("pm_storage_operation_duration_seconds_count", labels)
+    file_path = tmp_path / "docvers" / "document.pdf"
+    file_path.parent.mkdir()
+    file_path.write_bytes(b"%PDF")
+    backend = LocalBackend()
+    backend.settings = SimpleNamespace(media_root=tmp_path)
+
+    await backend.delete_file("docvers/document.pdf")
+
+    assert not file_path.exists()
+    after = sample("pm_storage_operation_duration_seconds_count", labels)
+    assert after == before + 1
+
+
+def test_render_latest_includes_cache_metrics():
+    content, media_type = metrics.render_latest()
+
+    assert media_type.startswith("text/plain")
+    assert b"pm_cache_operations_total" in content
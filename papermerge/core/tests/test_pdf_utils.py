@@ -0,0 +1,42 @@
+import pytest
+from pikepdf import Pdf
+
+from papermerge.core.utils.pdf import save_pdf, relinearize, is_linearized
+
+
+def make_pdf(path, page_count=3, linearize=False):
+    pdf = Pdf.new()
+    for _ in range(page_count):
+        pdf.add_blank_page()
+    save_pdf(pdf, path, linearize=linearize)
+
+
+def test_save_pdf_linearized(tmp_path):
+    path = tmp_path / "linearized.pdf"
+    make_pdf(path, linearize=True)
+
+    assert is_linearized(path)
+
+
+def test_relinearize(tmp_path):
+    path = tmp_path / "plain.pdf"
+    make_pdf(path, linearize=False)
+    assert not is_linearized(path)
+
+    assert relinearize(path) is True
+    assert is_linearized(path)
+    with Pdf.open(path) as pdf:
+        assert len(pdf.pages) == 3
+    # already linearized files are left untouched
+    assert relinearize(path) is False
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_relinearize_removes_temporary_file_on_error(tmp_path):
+    path = tmp_path / "broken.pdf"
+    path.write_bytes(b"this is not a PDF")
+
+    with pytest.raises(Exception):
+        relinearize(path)
+
+    assert list(tmp_path.iterdir()) == [path]
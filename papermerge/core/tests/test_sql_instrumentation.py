@@ -0,0 +1,29 @@
+from papermerge.core.db.instrumentation import QueryStats, statement_shape
+
+
+def test_statement_shape_collapses_parameters_and_literals():
+    stmt_1 = "SELECT nodes.id FROM nodes\n WHERE nodes.id IN ($1, $2, $3) AND depth < 10"
+    stmt_2 = "SELECT nodes.id  FROM nodes WHERE nodes.id IN ($1) AND depth < 5"
+
+    assert statement_shape(stmt_1) == statement_shape(stmt_2)
+    assert statement_shape(stmt_1) == (
+        "SELECT nodes.id FROM nodes WHERE nodes.id IN (?) AND depth < ?"
+    )
+
+
+def test_query_stats_keeps_slowest_and_detects_repeated_shapes():
+    stats = QueryStats(slowest_count=2)
+
+    for index in range(12):
+        stats.record(f"SELECT * FROM pages WHERE id = ${index + 1}", 0.001)
+    stats.record("SELECT * FROM documents", 0.5)
+    stats.record("SELECT * FROM nodes", 0.2)
+
+    assert stats.count == 14
+    assert [statement for _, statement in stats.slowest] == [
+        "SELECT * FROM documents",
+        "SELECT * FROM nodes",
+    ]
+    assert stats.repeated_shapes(threshold=10) == [
+        ("SELECT * FROM pages WHERE id = ?", 12)
+    ]
@@ -6,7 +6,6 @@ import time
 from collections import abc, namedtuple
 from typing import Optional
 
-from pikepdf import Pdf
 
 from papermerge.core.storage import abs_path, get_storage_instance
 from papermerge.core.types import DocumentVersion
@@ -318,6 +317,8 @@ def remove_pdf_pages(
     Notice that page numbering starts with 1 i.e. page_numbers=[1, 2] -
     will remove first and second pages.
     """
+    from pikepdf import Pdf
+
     # delete page from document's new version associated file
 
     if len(page_numbers) < 1:
@@ -364,6 +365,8 @@ def insert_pdf_pages(
     when `src_page_numbers=[1, 2]` means insert first and second pages from
     source document version.
     """
+    from pikepdf import Pdf
+
     src_old_pdf = Pdf.open(src_old_version.file_path)
 
     if dst_old_version is None:
@@ -425,6 +428,8 @@ def total_merge(
 
 
 def reorder_pdf_pages(old_version, new_version, pages_data, page_count):
+    from pikepdf import Pdf
+
     src = Pdf.open(abs_path(old_version.document_path.url))
 
     dst = Pdf.new()
@@ -446,6 +451,8 @@ def rotate_pdf_pages(old_version, new_version, pages_data):
         - number
         - angle
     """
+    from pikepdf import Pdf
+
     src = Pdf.open(abs_path(old_version.document_path.url))
 
     for page_data in pages_data:
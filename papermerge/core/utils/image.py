@@ -1,8 +1,8 @@
+import io
 import logging
 from pathlib import Path
 from uuid import UUID
 
-from pdf2image import convert_from_path
 
 from papermerge.core import constants as const
 from papermerge.core import pathlib as core_pathlib
@@ -59,6 +59,8 @@ def generate_preview(
     page_number: int = 1,
 ):
     """Generate jpg thumbnail/preview images of PDF document"""
+    from pdf2image import convert_from_path
+
     kwargs = {
         "pdf_path": str(pdf_path),
         "output_folder": str(output_folder),
@@ -74,3 +76,44 @@ def generate_preview(
 
     # generates jpeg previews of PDF file using pdftoppm (poppler-utils)
     convert_from_path(**kwargs)
+
+
+def make_sprite(
+    image_paths: list[Path],
+    quality: int = 85,
+    columns: int = 10,
+) -> tuple[bytes, list[tuple[int, int, int, int]]]:
+    """Lays images out in a grid of `columns` columns, as one JPEG sprite
+    sheet
+
+    Each image takes a cell of the size of the largest image, thus the
+    sheet stays well within JPEG dimension limit (65535 px) even for large
+    batches. Returns JPEG data of the sheet and, for each image (in the
+    given order), its `(x, y, width, height)` box within the sheet.
+    """
+    from PIL import Image
+
+    images = [Image.open(path) for path in image_paths]
+    try:
+        cell_width = max((img.width for img in images), default=1)
+        cell_height = max((img.height for img in images), default=1)
+        columns = max(min(columns, len(images)), 1)
+        rows = max(-(-len(images) // columns), 1)
+        sheet = Image.new(
+            "RGB", (columns * cell_width, rows * cell_height), "white"
+        )
+
+        boxes = []
+        for index, img in enumerate(images):
+            row, column = divmod(index, columns)
+            x, y = column * cell_width, row * cell_height
+            sheet.paste(img.convert("RGB"), (x, y))
+            boxes.append((x, y, img.width, img.height))
+
+        output = io.BytesIO()
+        sheet.save(output, format="JPEG", quality=quality)
+    finally:
+        for img in images:
+            img.close()
+
+    return output.getvalue(), boxes
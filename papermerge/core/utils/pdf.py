@@ -0,0 +1,75 @@
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from papermerge.core import config
+
+if TYPE_CHECKING:
+    from pikepdf import Pdf
+
+settings = config.get_settings()
+
+logger = logging.getLogger(__name__)
+
+
+def save_pdf(pdf: "Pdf", dst: Path, linearize: bool | None = None) -> None:
+    """Saves pdf to dst
+
+    When ``linearize`` is True (by default it is taken from
+    ``settings.pdf_linearize``) the file is saved linearized ("fast web
+    view") with compressed object streams, so that PDF viewers can
+    render first page(s) after fetching only the beginning of the file
+    via range requests.
+    """
+    from pikepdf import ObjectStreamMode
+
+    if linearize is None:
+        linearize = settings.pdf_linearize
+
+    if not linearize:
+        pdf.save(dst)
+        return
+
+    pdf.save(
+        dst,
+        linearize=True,
+        object_stream_mode=ObjectStreamMode.generate,
+        compress_streams=True,
+    )
+
+
+def is_linearized(path: Path) -> bool:
+    from pikepdf import Pdf
+
+    with Pdf.open(path) as pdf:
+        return pdf.is_linearized
+
+
+def relinearize(path: Path) -> bool:
+    """Rewrites PDF file at ``path`` linearized
+
+    Returns False if file was already linearized (and thus left
+    untouched), True otherwise. File is replaced atomically: linearized
+    content is written into temporary file in the same folder first,
+    which is removed if anything goes wrong.
+
+    Callers must update size (and checksum) of the document version
+    the file belongs to.
+    """
+    from pikepdf import Pdf
+
+    tmp_path = path.with_name(f".{path.name}.linearized")
+    try:
+        with Pdf.open(path) as pdf:
+            if pdf.is_linearized:
+                return False
+            save_pdf(pdf, tmp_path, linearize=True)
+
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    logger.debug(f"Linearized {path}")
+
+    return True
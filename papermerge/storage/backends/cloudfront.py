@@ -5,17 +5,23 @@ from urllib.parse import quote
 from uuid import UUID
 
 from fastapi import UploadFile
+import boto3
 from botocore.signers import CloudFrontSigner
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 
-from papermerge.storage.exc import StorageUploadError, FileTooLargeError
+from papermerge.storage.exc import (
+    StorageDeleteError,
+    StorageUploadError,
+    FileTooLargeError,
+)
 from papermerge.core.config import get_settings
 from papermerge.core.cache import client as cache
 from papermerge.core.utils.tz import utc_now
 from papermerge.core import pathlib as plib
 from papermerge.core.types import ImagePreviewSize
+from papermerge.core import metrics
 from papermerge.storage.base import StorageBackend
 
 PEM_PRIVATE_KEY_STRING = "pem-private-key-string"
@@ -39,7 +45,22 @@ class CloudFrontBackend(StorageBackend):
         if not self.settings.cf_domain:
             raise ValueError("CF_DOMAIN is not configured")
 
+    @property
+    def client(self):
+        """Lazy-loaded boto3 S3 client (default AWS credentials chain)."""
+        if self._client is None:
+            self._client = boto3.client('s3')
+        return self._client
 
+    def _object_key(self, object_key: str) -> str:
+        """S3 object key with optional prefix."""
+        prefix = self.settings.prefix
+
+        if prefix:
+            return f"{prefix}/{object_key}"
+        return object_key
+
+    @metrics.storage_operation("upload")
     async def upload_file(
         self,
         file: UploadFile,
@@ -47,7 +68,7 @@ class CloudFrontBackend(StorageBackend):
         content_type: str,
         max_file_size: int
     ) -> int:
-        """Stream file to R2"""
+        """Upload file to AWS S3"""
         content = await file.read()
 
         if len(content) > max_file_size:
@@ -55,12 +76,11 @@ class CloudFrontBackend(StorageBackend):
                 f"File size {len(content)} exceeds maximum {max_file_size}"
             )
 
-        # Add prefix if configured
-        full_key = str(self.prefix / object_key) if self.prefix else object_key
+        full_key = self._object_key(object_key)
 
         try:
             self.client.put_object(
-                Bucket=self.bucket_name,
+                Bucket=self.settings.bucket_name,
                 Key=full_key,
                 Body=content,
                 ContentType=content_type
@@ -71,6 +91,21 @@ class CloudFrontBackend(StorageBackend):
             logger.error(f"AWS S3 upload failed for {full_key}: {e}")
             raise StorageUploadError(f"Upload failed: {e}")
 
+    @metrics.storage_operation("delete")
+    async def delete_file(self, object_key: str) -> None:
+        """Delete object from AWS S3"""
+        full_key = self._object_key(object_key)
+
+        try:
+            self.client.delete_object(
+                Bucket=self.settings.bucket_name,
+                Key=full_key,
+            )
+            logger.info(f"Deleted file from AWS S3: {full_key}")
+        except Exception as e:
+            logger.error(f"AWS S3 delete failed for {full_key}: {e}")
+            raise StorageDeleteError(f"Delete failed: {e}")
+
     def _rsa_signer(self, message: bytes) -> bytes:
         """RSA signer for CloudFront URLs."""
         private_key_string = cache.get(PEM_PRIVATE_KEY_STRING)
@@ -102,6 +137,7 @@ class CloudFrontBackend(StorageBackend):
 
         return private_key.sign(message, padding.PKCS1v15(), hashes.SHA1())
 
+    @metrics.storage_operation("sign")
     def sign_url(self, url: str, valid_for: int = StorageBackend.DEFAULT_VALID_FOR_SECONDS) -> str:
         """Sign a CloudFront URL."""
         cf_signer = CloudFrontSigner(self.settings.cf_sign_url_key_id, self._rsa_signer)
@@ -6,6 +6,7 @@ from pathlib import Path
 from fastapi import UploadFile
 
 from papermerge.core.config import get_settings
+from papermerge.core import metrics
 from papermerge.storage.base import StorageBackend
 from papermerge.storage.exc import FileTooLargeError
 
@@ -20,6 +21,7 @@ class LocalBackend(StorageBackend):
     def client(self):
         return self._client
 
+    @metrics.storage_operation("upload")
     async def upload_file(
         self,
         file: UploadFile,
@@ -46,6 +48,14 @@ class LocalBackend(StorageBackend):
         logger.info(f"Saved file to local storage: {file_path}")
         return len(content), content
 
+    @metrics.storage_operation("delete")
+    async def delete_file(self, object_key: str) -> None:
+        """Remove file from local filesystem"""
+        file_path = self.settings.media_root / Path(object_key)
+        file_path.unlink(missing_ok=True)
+        logger.info(f"Removed file from local storage: {file_path}")
+
+    @metrics.storage_operation("sign")
     def sign_url(self, url: str, valid_for = 600):
         pass
 
@@ -10,8 +10,13 @@ from fastapi import UploadFile
 from papermerge.core.config import get_settings
 from papermerge.core import pathlib as plib
 from papermerge.core.types import ImagePreviewSize
+from papermerge.core import metrics
 from papermerge.storage.base import StorageBackend
-from papermerge.storage.exc import StorageUploadError, FileTooLargeError
+from papermerge.storage.exc import (
+    StorageDeleteError,
+    StorageUploadError,
+    FileTooLargeError,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +57,7 @@ class R2Backend(StorageBackend):
             )
         return self._client
 
+    @metrics.storage_operation("upload")
     async def upload_file(
         self,
         file: UploadFile,
@@ -84,6 +90,21 @@ class R2Backend(StorageBackend):
             logger.error(f"R2 upload failed for {full_key}: {e}")
             raise StorageUploadError(f"Upload failed: {e}")
 
+    @metrics.storage_operation("delete")
+    async def delete_file(self, object_key: str) -> None:
+        """Delete object from R2"""
+        full_key = self._build_object_key(object_key)
+
+        try:
+            self.client.delete_object(
+                Bucket=self.settings.bucket_name,
+                Key=full_key,
+            )
+            logger.info(f"Deleted file from R2: {full_key}")
+        except Exception as e:
+            logger.error(f"R2 delete failed for {full_key}: {e}")
+            raise StorageDeleteError(f"Delete failed: {e}")
+
     def _build_object_key(self, resource_path) -> str:
         """Build the S3 object key with optional prefix."""
         prefix = self.settings.prefix
@@ -93,6 +114,7 @@ class R2Backend(StorageBackend):
             return f"{prefix}/{path_str}"
         return path_str
 
+    @metrics.storage_operation("sign")
     def sign_url(self, url: str, valid_for: int = StorageBackend.DEFAULT_VALID_FOR_SECONDS) -> str:
         """
         Sign a URL for R2 access.
@@ -48,6 +48,11 @@ class StorageBackend(ABC):
         """Upload file and return actual size in bytes"""
         pass
 
+    @abstractmethod
+    async def delete_file(self, object_key: str) -> None:
+        """Delete file uploaded under `object_key` (missing file is not an error)"""
+        pass
+
 
 def get_storage_backend() -> StorageBackend:
     """
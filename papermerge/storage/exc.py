@@ -5,3 +5,7 @@ class FileTooLargeError(Exception):
 
 class StorageUploadError(Exception):
     pass
+
+
+class StorageDeleteError(Exception):
+    pass